@@ -0,0 +1,171 @@
+# asset_prefetch.py
+"""
+Defines the AssetPrefetcher, which decodes every image under assets/ at the
+sizes the windows show it at while the splash screen waits for the player,
+and warms the save index and the high score database.
+
+The decoding runs in a pool of worker threads and fills the shared image
+cache. PhotoImages can only be created on the Tk thread, so the decoded
+images are handed over through a queue that the Tk thread polls with
+after() and turns into PhotoImages a few at a time. The first game screen
+and boss fight then only take finished images from the cache.
+"""
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from game_data import CLASSES
+from highscore_manager import load_highscores, count_highscores, load_score_sketch
+from save_load_system import get_save_index
+from image_cache import (get_image_cache, IMAGES_AVAILABLE, ASSET_DIR, PORTRAIT_SIZE, QUEST_IMAGE_SIZE, CLASS_PREVIEW_SIZE,
+                         ARENA_IMAGE_SIZE, TOMBSTONE_SIZE, REBIRTH_IMAGE_SIZE, TOMBSTONE_IMAGE, REBIRTH_IMAGE,
+                         MINIGAME_BACKGROUND)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+PREFETCH_WORKERS = min(4, os.cpu_count() or 1)
+PREFETCH_POLL_MS = 30
+# The PhotoImages created per poll, so the splash screen stays responsive.
+PREFETCH_PHOTOS_PER_POLL = 4
+
+
+def get_asset_sizes(path):
+    """
+    Returns the sizes the windows show an image at.
+
+    Args:
+        path (str): The image path, relative to the game directory and with forward slashes.
+
+    Returns:
+        list: The (width, height) sizes, None for the original size. Empty for images no window shows.
+    """
+    if path in {class_data.get("image_path") for class_data in CLASSES.values()}:
+        # The main window, the class selection and the boss arena.
+        return [PORTRAIT_SIZE, CLASS_PREVIEW_SIZE, ARENA_IMAGE_SIZE]
+    if path == TOMBSTONE_IMAGE:
+        return [PORTRAIT_SIZE, TOMBSTONE_SIZE]
+    if path == REBIRTH_IMAGE:
+        return [REBIRTH_IMAGE_SIZE]
+    if path == MINIGAME_BACKGROUND:
+        return [None]
+    if path.startswith(f"{ASSET_DIR}/quests/"):
+        return [QUEST_IMAGE_SIZE]
+    if path.startswith(f"{ASSET_DIR}/bosses/"):
+        return [ARENA_IMAGE_SIZE]
+    return []
+
+
+def get_prefetch_jobs(asset_dir=ASSET_DIR):
+    """Returns the (path, size) pair of every image under asset_dir and every size it is shown at."""
+    jobs = []
+    for dirpath, dirnames, filenames in os.walk(asset_dir):
+        # Skips the generated variants and the on-disk cache.
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith("__"))
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            # The windows use forward slashes, and the cache is keyed by path.
+            path = os.path.join(dirpath, filename).replace(os.sep, "/")
+            jobs.extend((path, size) for size in get_asset_sizes(path))
+    return jobs
+
+
+def _warm_save_index():
+    """Scans the saves once, so the start menu lists them from the cached index."""
+    get_save_index()
+
+
+def _warm_highscores():
+    """Opens the high score database (importing or backfilling it if needed) and reads the first page."""
+    count_highscores()
+    load_highscores()
+    load_score_sketch()
+
+
+class AssetPrefetcher:
+    """Prefetches images and game data in worker threads and hands the images to the Tk thread."""
+
+    def __init__(self, asset_dir=ASSET_DIR, workers=PREFETCH_WORKERS):
+        """
+        Initializes the prefetcher.
+
+        Args:
+            asset_dir (str): The directory to decode images from.
+            workers (int): The number of worker threads.
+        """
+        self.asset_dir = asset_dir
+        self.workers = workers
+        self.cache = get_image_cache()
+        self._decoded = queue.Queue()
+        self._executor = None
+        self._widget = None
+        self._poll_id = None
+        self.pending = 0
+        self.errors = []
+
+    def start(self, widget):
+        """
+        Starts decoding and polls for decoded images on widget's Tk thread.
+
+        Args:
+            widget: Any Tk widget; its after() schedules the polling.
+        """
+        if self._executor is not None:
+            return
+        self._widget = widget
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        self._executor.submit(self._run, _warm_save_index)
+        self._executor.submit(self._run, _warm_highscores)
+        if IMAGES_AVAILABLE:
+            jobs = get_prefetch_jobs(self.asset_dir)
+            self.pending = len(jobs)
+            for path, size in jobs:
+                self._executor.submit(self._decode, path, size)
+        self._executor.shutdown(wait=False)
+        self._poll_id = widget.after(PREFETCH_POLL_MS, self._poll)
+
+    def _run(self, function):
+        try:
+            function()
+        except Exception as e:
+            self.errors.append((function.__name__, e))
+            print(f"Fehler beim Vorladen ({function.__name__}): {e}")
+
+    def _decode(self, path, size):
+        try:
+            self.cache.get_pil(path, size)
+        except Exception as e:
+            self.errors.append((path, e))
+            print(f"Bild konnte nicht vorgeladen werden: {path} ({e})")
+            # Still counted as handled, so polling ends.
+            path = None
+        self._decoded.put((path, size))
+
+    def _poll(self):
+        """Creates the PhotoImages of a few decoded images on the Tk thread."""
+        self._poll_id = None
+        for _ in range(PREFETCH_PHOTOS_PER_POLL):
+            try:
+                path, size = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if path is None:
+                continue
+            try:
+                self.cache.get_photo(path, size)
+            except Exception as e:
+                self.errors.append((path, e))
+        if self.pending > 0:
+            self._poll_id = self._widget.after(PREFETCH_POLL_MS, self._poll)
+
+    def is_done(self):
+        """Checks if every image was handed to the Tk thread."""
+        return self._executor is not None and self.pending <= 0
+
+    def stop(self):
+        """Stops polling and drops the images that were not decoded yet, e.g. when the game closes."""
+        if self._poll_id is not None:
+            self._widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,144 @@
+# autosave.py
+"""
+Saves the running game in the background.
+
+The UI thread only compares the character against its last known state and
+queues the resulting journal records (see save_journal). A writer thread
+appends them to the character's journal and every now and then replaces the
+journal with a full save, so no disk access ever happens on the UI thread.
+"""
+import queue
+import threading
+import time
+
+from save_format import encode_character, decode_character
+from save_journal import ChangeTracker, apply_record, append_records
+from save_load_system import save_game, delete_save, get_journal_path, get_last_journal_seq
+
+# How often the UI thread looks for changes.
+AUTOSAVE_INTERVAL_MS = 5000
+# A full save replaces the journal after this many records or seconds, whichever comes first.
+SNAPSHOT_EVERY_RECORDS = 200
+SNAPSHOT_INTERVAL_SECONDS = 60
+
+
+class Autosaver:
+    """Periodically journals a character's changes and writes full saves on a background thread."""
+
+    def __init__(self, character, interval_ms=AUTOSAVE_INTERVAL_MS):
+        """
+        Initializes the autosaver.
+
+        Args:
+            character (Character): The character to save. Only the UI thread may touch it.
+            interval_ms (int): How often to look for changes, in milliseconds.
+        """
+        self.character = character
+        self.interval_ms = interval_ms
+        self._tracker = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._widget = None
+        self._after_id = None
+
+    def is_running(self):
+        """Checks if the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, widget):
+        """
+        Starts the writer thread and the periodic change check.
+
+        Args:
+            widget (tk.Widget): A long-lived widget (usually the root window) used to schedule the checks.
+        """
+        # The writer works on its own copy of the character, built from this in-memory save.
+        baseline = encode_character(self.character, compress=False)
+        self._tracker = ChangeTracker(self.character)
+        self._thread = threading.Thread(target=self._run, args=(baseline,), daemon=True)
+        self._thread.start()
+        self._widget = widget
+        self._after_id = widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self.capture()
+        self._after_id = self._widget.after(self.interval_ms, self._tick)
+
+    def capture(self, snapshot=False):
+        """
+        Queues everything that changed since the last capture.
+
+        Args:
+            snapshot (bool): Whether the writer should write a full save right afterwards.
+        """
+        records = self._tracker.collect()
+        if records:
+            self._queue.put(("records", records))
+        if snapshot:
+            self._queue.put(("snapshot", None))
+
+    def save_now(self):
+        """Queues all changes and a full save, e.g. after a rebirth."""
+        self.capture(snapshot=True)
+
+    def stop(self, save=True, delete=False, wait=True):
+        """
+        Stops the periodic check and the writer thread.
+
+        Args:
+            save (bool): Whether to write a final full save first.
+            delete (bool): Whether to delete the character's save and journal instead, e.g. after its death.
+            wait (bool): Whether to wait until the writer has finished, e.g. before the program exits.
+        """
+        if self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+        if save and not delete:
+            self.capture(snapshot=True)
+        self._queue.put(("stop", delete))
+        if wait:
+            self.join()
+
+    def join(self):
+        """Waits until the writer thread has finished its queue after stop()."""
+        if self._thread is not None:
+            self._thread.join()
+
+    # --- Writer thread ---
+    def _run(self, baseline):
+        name = self.character.name
+        journal_file = get_journal_path(name)
+        try:
+            seq = get_last_journal_seq(name)
+            shadow = decode_character(baseline)
+            save_game(shadow, journal_seq=seq, quiet=True)
+        except Exception as e:
+            print(f"Fehler beim Start der automatischen Speicherung von {name}: {e}")
+            return
+
+        pending = 0
+        last_snapshot = time.monotonic()
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == "records":
+                    now = time.time()
+                    for record in payload:
+                        seq += 1
+                        record["seq"] = seq
+                        record["time"] = now
+                        apply_record(shadow, record)
+                    append_records(journal_file, payload)
+                    pending += len(payload)
+                elif kind == "stop":
+                    if payload:
+                        delete_save(name)
+                    return
+
+                if pending and (kind == "snapshot" or pending >= SNAPSHOT_EVERY_RECORDS
+                                or time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL_SECONDS):
+                    save_game(shadow, journal_seq=seq, quiet=True)
+                    pending = 0
+                    last_snapshot = time.monotonic()
+            except Exception as e:
+                print(f"Fehler bei der automatischen Speicherung von {name}: {e}")
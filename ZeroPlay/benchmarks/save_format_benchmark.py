@@ -0,0 +1,80 @@
+# benchmarks/save_format_benchmark.py
+"""
+Compares save and load times of the binary save format against pickle.
+
+Run from the ZeroPlay directory:
+    python benchmarks/save_format_benchmark.py [--items 1000] [--repeat 20]
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character import Character
+from loot_system import generate_item_for_level
+from save_format import encode_character, decode_character, read_header
+
+
+def build_character(item_count, seed=1):
+    """Creates a level 40 character with item_count items in the inventory."""
+    random.seed(seed)
+    character = Character("Benchmark", "warrior")
+    character.level = 40
+    character.max_inventory_size = item_count
+    for _ in range(item_count):
+        character.inventory.append(generate_item_for_level(40, 10))
+    for slot in character.equipment:
+        wearable = [item for item in character.inventory.by_slot(slot) if character.inventory.is_wearable(item)]
+        if wearable:
+            character.equip(character.inventory.index(wearable[0]))
+    character.add_resource("iron_ore", 120)
+    character.add_resource("jewel", 15)
+    return character
+
+
+def best_time(function, repeat):
+    """Returns the fastest of repeat runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    character = build_character(args.items)
+    pickled = pickle.dumps(character)
+    raw = encode_character(character, compress=False)
+    compressed = encode_character(character, compress=True)
+
+    print(f"{args.items} items, best of {args.repeat} runs")
+    print(f"{'format':<20}{'size (KB)':>12}{'save (ms)':>12}{'load (ms)':>12}")
+    rows = [
+        ("pickle", pickled, lambda: pickle.dumps(character), lambda: pickle.loads(pickled)),
+        ("binary", raw, lambda: encode_character(character, compress=False), lambda: decode_character(raw)),
+        ("binary + zlib", compressed, lambda: encode_character(character), lambda: decode_character(compressed)),
+    ]
+    for name, data, save, load in rows:
+        print(f"{name:<20}{len(data) / 1024:>12.1f}{best_time(save, args.repeat):>12.2f}{best_time(load, args.repeat):>12.2f}")
+
+    with tempfile.NamedTemporaryFile(suffix=".sav", delete=False) as f:
+        f.write(compressed)
+    try:
+        print(f"read_header only: {best_time(lambda: read_header(f.name), args.repeat):.3f} ms")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/translation_benchmark.py
+"""
+Measures the text lookups of one main screen redraw with the old get_text
+against the compiled Translator.
+
+Run from the ZeroPlay directory:
+    python benchmarks/translation_benchmark.py [--items 40] [--repeat 2000] [--lang de]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_data import CLASSES
+from loot_system import generate_item_for_level
+from translations import available_languages, get_translator, load_catalog
+
+# The catalogs as the plain nested dictionary get_text used to read.
+TEXTS = {lang: load_catalog(lang)[0] for lang in available_languages()}
+
+
+def legacy_get_text(lang, key, **kwargs):
+    """get_text as it was before catalogs were compiled: two lookups and a format parse per call."""
+    text = TEXTS.get(lang, TEXTS["en"]).get(key, key)
+    if kwargs:
+        try:
+            return text.format(**kwargs)
+        except (KeyError, ValueError):
+            return f"FMT_ERR:{key}"
+    return text
+
+
+def build_frame_calls(item_count, seed=1):
+    """
+    Returns the (key, kwargs) lookups of one redraw: class name, stat and slot
+    labels, equipped item names, and name, stats and slot of every visible
+    inventory row.
+    """
+    random.seed(seed)
+    items = [generate_item_for_level(30, 5) for _ in range(item_count)]
+    calls = [(CLASSES["warrior"]["name_key"], {})]
+    calls += [(stat, {}) for stat in ("strength", "agility", "intelligence", "luck")]
+    calls += [(slot, {}) for slot in ("head", "chest", "weapon")]
+    calls.append(("empty_slot", {}))
+    calls.append(("inventory_count", {"current": item_count, "max": 50}))
+    for item in items:
+        calls.append((item.name_key, {}))
+        if item.is_boss_item():
+            calls.append(("boss", {}))
+        calls += [(stat, {}) for stat, _ in item.get_boost_items()]
+        if item.slot:
+            calls.append((item.slot, {}))
+    return calls, items
+
+
+def best_time(function, repeat):
+    """Returns the fastest of repeat runs in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=40, help="visible inventory rows per redraw")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--lang", default="de")
+    args = parser.parse_args()
+
+    calls, items = build_frame_calls(args.items)
+    translator = get_translator(args.lang)
+    lang = args.lang
+
+    def legacy_frame():
+        for key, kwargs in calls:
+            legacy_get_text(lang, key, **kwargs)
+
+    def translator_frame():
+        for key, kwargs in calls:
+            translator(key, **kwargs)
+
+    def translator_plain_frame():
+        for key, kwargs in calls:
+            translator(key, **kwargs) if kwargs else translator[key]
+
+    def item_text_frame():
+        for item in items:
+            item.to_string(lang)
+
+    legacy = best_time(legacy_frame, args.repeat)
+    print(f"{len(calls)} lookups per redraw, best of {args.repeat} runs")
+    print(f"{'variant':<28}{'us/redraw':>12}{'speedup':>10}")
+    for name, function in (("get_text (old)", legacy_frame), ("Translator(key)", translator_frame),
+                           ("Translator[key]", translator_plain_frame)):
+        elapsed = legacy if function is legacy_frame else best_time(function, args.repeat)
+        print(f"{name:<28}{elapsed:>12.1f}{legacy / elapsed:>9.2f}x")
+    print(f"Item.to_string for {len(items)} rows: {best_time(item_text_frame, args.repeat):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
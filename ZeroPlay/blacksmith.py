@@ -17,7 +17,7 @@ class Blacksmith:
             dict: A dictionary of resource names and the required amounts.
                   Returns None if the item cannot be upgraded.
         """
-        if item.item_type != "Ausrüstung":
+        if item.item_type != "equipment":
             return None
 
         next_level = item.upgrade_level + 1
@@ -26,10 +26,10 @@ class Blacksmith:
         # This can be made more complex later (e.g., based on rarity)
         cost = {}
         if next_level <= 5:
-            cost["Eisenerz"] = next_level * 5
+            cost["iron_ore"] = next_level * 5
         else:
-            cost["Eisenerz"] = next_level * 5
-            cost["Juwel"] = (next_level - 5) * 2
+            cost["iron_ore"] = next_level * 5
+            cost["jewel"] = (next_level - 5) * 2
 
         return cost
 
@@ -70,6 +70,7 @@ class Blacksmith:
         # Attempt to upgrade the item
         if item.upgrade():
             player.remove_resources(cost)
-            return True, f"{item.name} erfolgreich aufgewertet!"
+            player.invalidate_stats_cache()
+            return True, f"{item.get_name(player.language)} erfolgreich aufgewertet!"
         else:
             return False, "Gegenstand hat bereits die maximale Stufe erreicht."
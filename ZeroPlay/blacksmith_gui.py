@@ -7,7 +7,7 @@ from tkinter import ttk, messagebox
 from blacksmith import Blacksmith
 from utils import center_window
 from game_data import RARITIES
-from translations import get_text
+from translations import get_translator
 
 class BlacksmithWindow(tk.Toplevel):
     """Manages the blacksmith interaction window."""
@@ -33,7 +33,7 @@ class BlacksmithWindow(tk.Toplevel):
 
     def _(self, key):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key)
 
     def create_widgets(self):
         """Creates and places all widgets for the blacksmith window."""
@@ -117,19 +117,19 @@ class BlacksmithWindow(tk.Toplevel):
         upgrade_level_text = f"+{self.selected_item.upgrade_level} / +{max_upgrades}"
         self.item_name_label.config(text=f"{self.selected_item.name} ({upgrade_level_text})")
 
-        stats_text = self._("current_stats") + "\n" + "\n".join([f"  {self._(stat.lower())}: {val}" for stat, val in self.selected_item.stats_boost.items()])
+        stats_text = self._("current_stats") + "\n" + "\n".join([f"  {self._(stat.lower())}: {val}" for stat, val in self.selected_item.get_boost_items()])
         self.current_stats_label.config(text=stats_text)
 
         if self.selected_item.upgrade_level >= max_upgrades:
-            max_stats_text = self._("current_stats") + f" ({self._('max_stat_indicator')}):\n" + "\n".join([f"  {self._(stat.lower())}: {val} ({self._('max_stat_indicator')})" for stat, val in self.selected_item.stats_boost.items()])
+            max_stats_text = self._("current_stats") + f" ({self._('max_stat_indicator')}):\n" + "\n".join([f"  {self._(stat.lower())}: {val} ({self._('max_stat_indicator')})" for stat, val in self.selected_item.get_boost_items()])
             self.current_stats_label.config(text=max_stats_text)
             self.next_stats_label.config(text=self._("max_level_reached"))
             self.cost_label.config(text="")
             self.upgrade_button.config(state=tk.DISABLED)
             return
 
-        next_level_stats = {stat: val + 1 for stat, val in self.selected_item.stats_boost.items()}
-        next_stats_text = f"{self._('next_level')} (+{self.selected_item.upgrade_level + 1}):\n" + "\n".join([f"  {self._(stat.lower())}: {val}" for stat, val in next_level_stats.items()])
+        next_level_stats = self.selected_item.stats_boost.raised(1)
+        next_stats_text = f"{self._('next_level')} (+{self.selected_item.upgrade_level + 1}):\n" + "\n".join([f"  {self._(stat.lower())}: {val}" for stat, val in next_level_stats.nonzero_items()])
         self.next_stats_label.config(text=next_stats_text)
 
         cost = self.blacksmith.get_upgrade_cost(self.selected_item)
@@ -3,7 +3,7 @@
 Defines the Boss class for the RPG game.
 """
 import random
-from translations import get_text
+from translations import get_translator
 
 class Boss:
     """Represents a boss enemy in the game."""
@@ -36,7 +36,7 @@ class Boss:
 
     def get_name(self, lang):
         """Returns the translated name of the boss."""
-        return get_text(lang, self.name_key)
+        return get_translator(lang)[self.name_key]
 
     def attack(self):
         """Calculates the damage for the boss's attack."""
@@ -6,13 +6,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import random
 import time
-from PIL import Image, ImageTk
 
 from boss import Boss
 from game_data import CLASSES
 from utils import center_window, format_currency
 from loot_system import generate_boss_reward
-from translations import get_text
+from translations import get_translator
+from image_cache import get_image_cache, ARENA_IMAGE_SIZE
 
 class BossArenaWindow(tk.Toplevel):
     """A Toplevel window for the boss fight."""
@@ -60,7 +60,7 @@ class BossArenaWindow(tk.Toplevel):
 
     def _(self, key):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key)
 
     def _setup_string_vars(self):
         """Initializes StringVars for dynamic labels."""
@@ -151,17 +151,13 @@ class BossArenaWindow(tk.Toplevel):
     def load_images(self):
         """Loads images for player and boss."""
         try:
-            player_img = Image.open(self.player.image_path)
-            player_img.thumbnail((150, 200))
-            self.player_photo = ImageTk.PhotoImage(player_img)
+            self.player_photo = get_image_cache().get_photo(self.player.image_path, ARENA_IMAGE_SIZE)
             self.player_portrait_label.config(image=self.player_photo)
         except Exception as e:
             self.player_portrait_label.config(text=self._("image_error_display").format(e=e))
 
         try:
-            boss_img = Image.open(self.boss.image_path)
-            boss_img.thumbnail((150, 200))
-            self.boss_photo = ImageTk.PhotoImage(boss_img)
+            self.boss_photo = get_image_cache().get_photo(self.boss.image_path, ARENA_IMAGE_SIZE)
             self.boss_portrait_label.config(image=self.boss_photo)
         except Exception as e:
             self.boss_portrait_label.config(text=self._("image_error_display").format(e=e))
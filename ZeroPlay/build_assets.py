@@ -0,0 +1,110 @@
+# build_assets.py
+"""
+Builds the pre-sized variants of every image under assets/, at the sizes
+the windows show it at, and a manifest with the content hashes of sources
+and variants. The game then reads the small variants instead of decoding
+and shrinking the full-size art on every start.
+
+Sources whose content hash did not change are not rendered again, so the
+build is cheap to repeat, e.g. after a checkout changed all mtimes.
+
+Run from the ZeroPlay directory:
+    python build_assets.py [--force] [--clean]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from asset_prefetch import get_prefetch_jobs
+from image_cache import (ASSET_DIR, ASSET_VARIANT_DIR, ASSET_MANIFEST, ASSET_MANIFEST_VERSION, MANIFEST_NAME,
+                         get_variant_name, load_manifest, render_image, save_image)
+
+
+def file_hash(filename):
+    """Returns the SHA-256 hash of a file's content."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_variants(asset_dir=ASSET_DIR, variant_dir=ASSET_VARIANT_DIR, force=False):
+    """
+    Renders the variants of all images and writes the manifest.
+
+    Args:
+        asset_dir (str): The directory with the source images.
+        variant_dir (str): The directory to write the variants and the manifest to.
+        force (bool): Render every variant, even if its source did not change.
+
+    Returns:
+        dict: The number of 'rendered' and 'reused' variants and of 'removed' outdated files.
+    """
+    old_images = load_manifest(os.path.join(variant_dir, MANIFEST_NAME))
+    sizes_by_path = {}
+    for path, size in get_prefetch_jobs(asset_dir):
+        if size:
+            sizes_by_path.setdefault(path, []).append(size)
+
+    images = {}
+    counts = {"rendered": 0, "reused": 0, "removed": 0}
+    for path, sizes in sizes_by_path.items():
+        source_hash = file_hash(path)
+        old_image = old_images.get(path, {})
+        old_variants = old_image.get("variants", {}) if old_image.get("sha256") == source_hash else {}
+        variants = {}
+        for size in sizes:
+            name = get_variant_name(path, size)
+            filename = os.path.join(variant_dir, name)
+            if not force and name in old_variants and os.path.exists(filename):
+                variants[name] = old_variants[name]
+                counts["reused"] += 1
+                continue
+            image = render_image(path, size)
+            save_image(image, filename)
+            variants[name] = {"size": list(image.size), "sha256": file_hash(filename)}
+            counts["rendered"] += 1
+        # The game only trusts variants whose source still has this mtime.
+        images[path] = {"mtime_ns": os.stat(path).st_mtime_ns, "sha256": source_hash, "variants": variants}
+
+    known = {os.path.normpath(os.path.join(variant_dir, name)) for image in images.values() for name in image["variants"]}
+    for dirpath, _, filenames in os.walk(variant_dir):
+        for filename in filenames:
+            full_path = os.path.normpath(os.path.join(dirpath, filename))
+            if filename != MANIFEST_NAME and full_path not in known:
+                os.remove(full_path)
+                counts["removed"] += 1
+
+    os.makedirs(variant_dir, exist_ok=True)
+    manifest_filename = os.path.join(variant_dir, MANIFEST_NAME)
+    temp_filename = manifest_filename + ".tmp"
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump({"version": ASSET_MANIFEST_VERSION, "images": images}, f, indent=2, ensure_ascii=False)
+    os.replace(temp_filename, manifest_filename)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="render every variant, even if its source did not change")
+    parser.add_argument("--clean", action="store_true", help="delete all variants and the manifest, then exit")
+    args = parser.parse_args()
+
+    if args.clean:
+        shutil.rmtree(ASSET_VARIANT_DIR, ignore_errors=True)
+        print(f"{ASSET_VARIANT_DIR} gelöscht.")
+        return
+
+    start = time.perf_counter()
+    counts = build_variants(force=args.force)
+    print(f"{counts['rendered']} Varianten erstellt, {counts['reused']} übernommen, "
+          f"{counts['removed']} veraltete Dateien gelöscht ({time.perf_counter() - start:.2f} s).")
+    print(f"Manifest: {ASSET_MANIFEST}")
+
+
+if __name__ == "__main__":
+    main()
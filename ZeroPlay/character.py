@@ -2,14 +2,20 @@
 """
 Defines the Character class, which manages the player's stats, inventory, and equipment.
 """
+import os
 import random
 from item import Item
+from inventory import Inventory
+from stat_block import StatBlock
 from game_data import CLASSES
-from translations import get_text
+from translations import get_translator
 
 class Character:
     """Manages character attributes, inventory, and equipment."""
 
+    # Debug mode: check every cached stat lookup against a full recompute.
+    verify_stats_cache = os.environ.get("ZEROPLAY_VERIFY_STATS_CACHE") == "1"
+
     def __init__(self, name, klasse):
         """
         Initializes a new character.
@@ -26,12 +32,12 @@ class Character:
         self.copper = 0
 
         class_data = CLASSES.get(klasse, {})
-        self.base_attributes = class_data.get("attributes", {'strength': 5, 'agility': 5, 'intelligence': 5, 'luck': 5}).copy()
+        self.base_attributes = StatBlock.from_dict(class_data.get("attributes", {'strength': 5, 'agility': 5, 'intelligence': 5, 'luck': 5}))
         self.attributes = self.base_attributes.copy()
         self.main_stat = class_data.get("main_stat")
         self.image_path = class_data.get("image_path", None)
 
-        self.inventory = []
+        self.inventory = Inventory(allowed_armor_types=class_data.get("allowed_armor", []))
         self.max_inventory_size = 10
         self.equipment = {'head': None, 'chest': None, 'weapon': None}
         self.resources = {}
@@ -45,6 +51,8 @@ class Character:
         self.cheat_activated = False
         self.is_immortal = False
         self.language = "de" # Default language, can be updated from outside
+        self.auto_questing = False
+        self.last_saved_at = None
 
         self.max_lp = 0
         self.current_lp = 0
@@ -54,8 +62,27 @@ class Character:
         self.current_energie = 0
         self.max_wut = 0
         self.current_wut = 0
+        self.invalidate_stats_cache()
         self.update_derived_stats(heal_on_update=True)
 
+    def __getstate__(self):
+        """Excludes the stats cache from pickled saves and stores the inventory as a plain list."""
+        state = self.__dict__.copy()
+        state["inventory"] = list(self.inventory)
+        state.pop("_stats_cache", None)
+        state.pop("_stats_cache_generation", None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a saved character with an empty stats cache. Characters from
+        older saves are upgraded afterwards by save_migrations.
+        """
+        self.__dict__.update(state)
+        allowed_armor = CLASSES.get(self.klasse, {}).get("allowed_armor", [])
+        self.inventory = Inventory(self.__dict__.get("inventory", []), allowed_armor)
+        self.invalidate_stats_cache()
+
     def get_allowed_armor_types(self):
         """Returns a list of armor types the character's class can wear."""
         return CLASSES[self.klasse].get("allowed_armor", [])
@@ -114,7 +141,7 @@ class Character:
         self.xp = 0
         self.xp_to_next_level = self._calculate_xp_for_next_level()
         self.copper = 0
-        self.inventory = []
+        self.inventory = Inventory(allowed_armor_types=self.get_allowed_armor_types())
         self.equipment = {'head': None, 'chest': None, 'weapon': None}
         self.resources = {}
         self.boss_tier = 0
@@ -134,6 +161,7 @@ class Character:
             self.base_attributes[stat] += increase
 
         self.attributes = self.base_attributes.copy()
+        self.invalidate_stats_cache()
         self.update_derived_stats(heal_on_update=True)
 
     def level_up(self):
@@ -148,12 +176,13 @@ class Character:
             self.attributes[stat] += increase
             stat_increases.append(f"{self._(stat)} +{increase}")
 
+        self.invalidate_stats_cache()
         self.update_derived_stats(heal_on_update=True)
         return stat_increases
 
     def _(self, key, **kwargs):
         """Alias for get_text for shorter calls, with formatting."""
-        return get_text(self.language, key, **kwargs)
+        return get_translator(self.language)(key, **kwargs)
 
     def use_item(self, item_index):
         """Uses a consumable item from the inventory."""
@@ -229,22 +258,31 @@ class Character:
         """
         Checks if an item in the inventory is an upgrade over the equipped item.
         """
-        if item_from_inventory.armor_type:
-            if item_from_inventory.armor_type not in self.get_allowed_armor_types():
-                return False
-
-        if item_from_inventory.item_type != "equipment":
+        if item_from_inventory.item_type != "equipment" or not self.inventory.is_wearable(item_from_inventory):
             return False
 
-        equipped_item = self.equipment.get(item_from_inventory.slot)
-        main_stat = self.main_stat
+        equipped_score = self.get_equipped_scores().get(item_from_inventory.slot, 0)
+        return item_from_inventory.get_weighted_score(self.main_stat) > equipped_score
 
-        if not equipped_item:
-            return item_from_inventory.get_weighted_score(main_stat) > 0
+    def get_upgrade_flags(self, start=0, stop=None):
+        """
+        Checks the inventory for upgrades in a single pass.
+
+        Args:
+            start (int): The first inventory index to check.
+            stop (int): The index to stop at. Defaults to the end of the inventory.
 
-        new_item_score = item_from_inventory.get_weighted_score(main_stat)
-        equipped_item_score = equipped_item.get_weighted_score(main_stat)
-        return new_item_score > equipped_item_score
+        Returns:
+            list: One bool per checked inventory item, True if it is an upgrade.
+        """
+        equipped_scores = self.get_equipped_scores()
+        is_wearable = self.inventory.is_wearable
+        main_stat = self.main_stat
+        return [
+            item.item_type == "equipment" and is_wearable(item) and
+            item.get_weighted_score(main_stat) > equipped_scores.get(item.slot, 0)
+            for item in self.inventory[start:stop]
+        ]
 
     def equip(self, item_index, is_auto_equip=False):
         """
@@ -269,25 +307,70 @@ class Character:
 
             self.equipment[slot] = item_to_equip
             self.inventory.pop(item_index)
+            self.invalidate_stats_cache()
             self.update_derived_stats()
 
             if is_auto_equip:
                 item_name = item_to_equip.get_name(self.language)
                 self.pending_unlock_messages.append(f"auto_equip_notification:{item_name}")
 
+    def invalidate_stats_cache(self):
+        """
+        Drops the cached total stats and item levels. Must be called whenever
+        the attributes or the equipment change.
+        """
+        self._stats_cache = {}
+        self._stats_cache_generation = Item.stats_generation
+
+    def _cached_stat(self, key, compute):
+        """Returns a cached stat value, computing it on first use."""
+        if self._stats_cache_generation != Item.stats_generation:
+            self.invalidate_stats_cache()
+        if key not in self._stats_cache:
+            self._stats_cache[key] = compute()
+        elif self.verify_stats_cache:
+            expected = compute()
+            if self._stats_cache[key] != expected:
+                raise AssertionError(f"Stale stats cache '{key}' for {self.name}: {self._stats_cache[key]} != {expected}")
+        return self._stats_cache[key]
+
     def get_total_stats(self):
+        """
+        Returns the total stats including bonuses from equipped items.
+        The result is cached and must be treated as read-only.
+        """
+        return self._cached_stat("total_stats", self._compute_total_stats)
+
+    def get_item_level(self):
+        """Returns the average item score of all equipped gear (cached)."""
+        return self._cached_stat("item_level", self._compute_item_level)
+
+    def get_base_item_level(self):
+        """Returns the average BASE item score of all equipped gear (cached)."""
+        return self._cached_stat("base_item_level", self._compute_base_item_level)
+
+    def get_equipped_scores(self):
+        """Returns the weighted score of the equipped item per slot (cached); empty slots score 0."""
+        return self._cached_stat("equipped_scores", self._compute_equipped_scores)
+
+    def _compute_total_stats(self):
         """
         Calculates total stats including bonuses from equipped items.
         """
         total_stats = self.attributes.copy()
         for item in self.equipment.values():
             if item:
-                for stat, boost in item.stats_boost.items():
-                    if stat in total_stats:
-                        total_stats[stat] += boost
+                total_stats += item.stats_boost
         return total_stats
 
-    def get_item_level(self):
+    def _compute_equipped_scores(self):
+        """Calculates the weighted score of the equipped item per slot."""
+        return {
+            slot: item.get_weighted_score(self.main_stat) if item else 0
+            for slot, item in self.equipment.items()
+        }
+
+    def _compute_item_level(self):
         """Calculates the average item score of all equipped gear."""
         total_score, equipped_items = 0, 0
         for item in self.equipment.values():
@@ -296,7 +379,7 @@ class Character:
                 equipped_items += 1
         return total_score // equipped_items if equipped_items > 0 else 0
 
-    def get_base_item_level(self):
+    def _compute_base_item_level(self):
         """
         Calculates the average item score of equipped gear based on BASE stats.
         """
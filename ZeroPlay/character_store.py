@@ -0,0 +1,143 @@
+# character_store.py
+"""
+Defines the CharacterStore, which keeps all characters in a single SQLite
+database instead of one save file per character.
+
+The summary of every character (the save header) lives in indexed columns
+of the 'characters' table, so listing heroes or ranking them by level never
+touches the saves themselves. The saves, in the binary format from
+save_format, are kept in the separate 'character_data' table.
+"""
+import json
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    name TEXT PRIMARY KEY,
+    klasse TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    rebirths INTEGER NOT NULL,
+    bosses_defeated INTEGER NOT NULL,
+    copper INTEGER NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_characters_klasse ON characters (klasse, level);
+CREATE INDEX IF NOT EXISTS idx_characters_level ON characters (level);
+CREATE INDEX IF NOT EXISTS idx_characters_rebirths ON characters (rebirths);
+CREATE INDEX IF NOT EXISTS idx_characters_bosses ON characters (bosses_defeated);
+CREATE INDEX IF NOT EXISTS idx_characters_copper ON characters (copper);
+CREATE TABLE IF NOT EXISTS character_data (
+    name TEXT PRIMARY KEY REFERENCES characters (name) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+"""
+
+# The summary fields stored in their own, indexed columns.
+SUMMARY_COLUMNS = ("name", "klasse", "level", "rebirths", "bosses_defeated", "copper")
+# The columns characters can be ranked by.
+RANKING_COLUMNS = ("level", "rebirths", "bosses_defeated", "copper")
+
+
+class CharacterStore:
+    """Stores characters and their summaries in an SQLite database in WAL mode."""
+
+    def __init__(self, path, timeout=5.0):
+        """
+        Opens the database and creates its tables if necessary.
+
+        Args:
+            path (str): The database file.
+            timeout (float): How long to wait for a lock held by another connection, in seconds.
+        """
+        self.path = path
+        self.timeout = timeout
+        # SQLite connections can't be shared between threads, e.g. with the autosave thread.
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def save(self, name, summary, data):
+        """
+        Inserts or replaces a character in a single transaction.
+
+        Args:
+            name (str): The character's name.
+            summary (dict): The save header, see save_format.build_header.
+            data (bytes): The complete save.
+        """
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO characters (name, klasse, level, rebirths, bosses_defeated, copper, summary) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, summary.get("klasse") or "", summary.get("level") or 0, summary.get("rebirths") or 0,
+                 summary.get("bosses_defeated") or 0, summary.get("copper") or 0,
+                 json.dumps(summary, ensure_ascii=False)))
+            connection.execute("INSERT OR REPLACE INTO character_data (name, data) VALUES (?, ?)", (name, data))
+
+    def load(self, name):
+        """Returns the save of a character, or None if it is not stored."""
+        row = self._connect().execute("SELECT data FROM character_data WHERE name = ?", (name,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def delete(self, name):
+        """Deletes a character. Returns True if it was stored."""
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute("DELETE FROM characters WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def get_names(self):
+        """Returns the names of all stored characters, sorted."""
+        return [row[0] for row in self._connect().execute("SELECT name FROM characters ORDER BY name")]
+
+    def get_summary(self, name):
+        """Returns the summary of a character, or None if it is not stored."""
+        row = self._connect().execute("SELECT summary FROM characters WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_summaries(self):
+        """Returns the summaries of all characters, keyed by name."""
+        return {name: json.loads(summary)
+                for name, summary in self._connect().execute("SELECT name, summary FROM characters ORDER BY name")}
+
+    def get_top(self, order_by="level", limit=10, klasse=None):
+        """
+        Returns the best characters by one of the RANKING_COLUMNS, using its index.
+
+        Args:
+            order_by (str): The column to rank by.
+            limit (int): The maximum number of characters.
+            klasse (str): Only rank characters of this class if given.
+
+        Returns:
+            list: The summaries of the best characters, best first.
+        """
+        if order_by not in RANKING_COLUMNS:
+            raise ValueError(f"Unbekannte Rangliste: {order_by}")
+        query = "SELECT summary FROM characters"
+        params = []
+        if klasse:
+            query += " WHERE klasse = ?"
+            params.append(klasse)
+        query += f" ORDER BY {order_by} DESC, name LIMIT ?"
+        params.append(limit)
+        return [json.loads(row[0]) for row in self._connect().execute(query, params)]
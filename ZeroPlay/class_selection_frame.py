@@ -4,9 +4,9 @@ Defines the GUI Frame for the class selection scene.
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
 from game_data import CLASSES
-from translations import get_text
+from translations import get_translator
+from image_cache import get_image_cache, CLASS_PREVIEW_SIZE
 
 class ClassSelectionFrame(ttk.Frame):
     """Manages the class selection frame."""
@@ -24,7 +24,7 @@ class ClassSelectionFrame(ttk.Frame):
 
     def _(self, key, **kwargs):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key, **kwargs)
+        return get_translator(self.language)(key, **kwargs)
 
     def create_widgets(self):
         """Creates the widgets for the class selection frame."""
@@ -103,9 +103,7 @@ class ClassSelectionFrame(ttk.Frame):
         try:
             img_path = class_data.get("image_path")
             if img_path:
-                img = Image.open(img_path)
-                img.thumbnail((250, 350))
-                self.character_photo = ImageTk.PhotoImage(img)
+                self.character_photo = get_image_cache().get_photo(img_path, CLASS_PREVIEW_SIZE)
                 self.image_label.config(image=self.character_photo, text="")
             else:
                 self.image_label.config(image="", text=self._("image_not_found", path=img_path))
@@ -0,0 +1,153 @@
+# farm.py
+"""
+Runs many independent character simulations in parallel ("farm" mode).
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from character import Character
+from game_data import CLASSES
+from game_engine import GameEngine
+from highscore_manager import build_score_entry, save_highscores
+
+
+def build_farm_specs(hero_count, quest_count, boss_attempts, max_rebirths=0, seed=None):
+    """
+    Spreads heroes evenly across all classes and rebirth counts.
+
+    Args:
+        hero_count (int): The number of heroes to simulate.
+        quest_count (int): The number of quests every hero plays.
+        boss_attempts (int): The maximum number of boss fights per hero.
+        max_rebirths (int): Heroes start with 0 up to this many rebirths.
+        seed (int): Optional base seed for reproducible runs.
+
+    Returns:
+        list: One spec dictionary per hero, to be passed to farm_hero.
+    """
+    class_keys = list(CLASSES.keys())
+    base_seed = seed if seed is not None else random.randrange(2 ** 32)
+    specs = []
+    for i in range(hero_count):
+        klasse = class_keys[i % len(class_keys)]
+        rebirths = (i // len(class_keys)) % (max_rebirths + 1)
+        specs.append({
+            "name": f"Farm-{klasse}-{i + 1}",
+            "klasse": klasse,
+            "rebirths": rebirths,
+            "quests": quest_count,
+            "boss_attempts": boss_attempts,
+            "seed": base_seed + i,
+        })
+    return specs
+
+
+def farm_hero(spec):
+    """
+    Simulates a single hero. Runs inside a worker process.
+
+    The quests are split into rounds; after each round the hero challenges the
+    next boss if its item level allows it, until the boss attempts are used up.
+
+    Args:
+        spec (dict): A spec as created by build_farm_specs.
+
+    Returns:
+        dict: The hero's high score entry plus the farm statistics
+              'quests_completed', 'boss_attempts_used', 'died', 'stopped' (why the
+              last quest round ended early, see GameEngine.run) and 'seconds'.
+    """
+    random.seed(spec["seed"])
+    start = time.perf_counter()
+
+    character = Character(spec["name"], spec["klasse"])
+    for _ in range(spec["rebirths"]):
+        character.rebirth()
+    character.pending_unlock_messages = []
+
+    engine = GameEngine(character)
+    rounds = spec["boss_attempts"] + 1
+    quests_per_round = max(1, spec["quests"] // rounds)
+    quests_completed, boss_attempts_used, stopped = 0, 0, None
+
+    while quests_completed < spec["quests"] and not engine.game_over:
+        run_result = engine.run(min(quests_per_round, spec["quests"] - quests_completed))
+        played, stopped = run_result["completed"], run_result["stopped"]
+        quests_completed += played
+        if boss_attempts_used < spec["boss_attempts"] and engine.can_fight_boss():
+            engine.fight_boss()
+            boss_attempts_used += 1
+        elif played == 0:
+            break
+
+    result = build_score_entry(character)
+    result.update({
+        "quests_completed": quests_completed,
+        "boss_attempts_used": boss_attempts_used,
+        "died": engine.game_over,
+        "stopped": stopped,
+        "seconds": time.perf_counter() - start,
+    })
+    return result
+
+
+def run_farm(specs, workers=None, max_pending=None):
+    """
+    Simulates the heroes across a process pool and yields their results as
+    they finish. Only a bounded number of heroes is in flight at a time, so
+    memory stays flat no matter how many specs are passed.
+
+    Args:
+        specs (iterable): Hero specs as created by build_farm_specs.
+        workers (int): The number of worker processes. Defaults to all cores.
+        max_pending (int): The maximum number of submitted but unfinished heroes.
+
+    Yields:
+        dict: The result of farm_hero for every hero, in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    spec_iter = iter(specs)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for spec in spec_iter:
+            pending.add(executor.submit(farm_hero, spec))
+            if len(pending) >= max_pending:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_spec = next(spec_iter, None)
+                if next_spec is not None:
+                    pending.add(executor.submit(farm_hero, next_spec))
+
+
+def run_farm_cli(hero_count, quest_count, boss_attempts, max_rebirths=0, workers=None, seed=None):
+    """
+    Runs a farm, prints every hero as it finishes and merges all results into
+    the high score list with a single write at the end.
+    """
+    specs = build_farm_specs(hero_count, quest_count, boss_attempts, max_rebirths, seed)
+    start = time.perf_counter()
+    score_entries = []
+    total_quests = 0
+
+    for result in run_farm(specs, workers=workers):
+        total_quests += result.pop("quests_completed")
+        boss_attempts_used = result.pop("boss_attempts_used")
+        died = result.pop("died")
+        stopped = result.pop("stopped")
+        result.pop("seconds")
+        score_entries.append(result)
+        status = " (gestorben)" if died else " (wenig LP)" if stopped == "low_health" else ""
+        print(f"[{len(score_entries)}/{len(specs)}] {result['name']}: Level {result['level']}, "
+              f"Wiedergeburten {result['rebirths']}, Bosse {result['bosses_defeated']}/{boss_attempts_used}{status}")
+
+    elapsed = time.perf_counter() - start
+    save_highscores(score_entries)
+    rate = total_quests / elapsed if elapsed > 0 else float("inf")
+    print(f"{len(score_entries)} Helden, {total_quests} Quests in {elapsed:.2f}s ({rate:.0f} Quests/s)")
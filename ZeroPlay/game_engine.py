@@ -0,0 +1,264 @@
+# game_engine.py
+"""
+Defines the GameEngine, which drives the quest, loot and level-up flow
+independently of any GUI, and a headless runner for soak tests.
+"""
+import random
+import time
+
+from boss import Boss
+from quest import Quest
+from trader import Trader
+from loot_system import generate_boss_reward
+from game_data import BOSS_TIERS
+from translations import get_text
+
+AVAILABLE_QUESTS = [
+    {"name": "quest_slimes_name", "image": "assets/quests/kill_all_slimes.jpg"},
+    {"name": "quest_iron_ore_name", "image": "assets/quests/bring_5_iron_ore_to_the_blacksmith.jpg"},
+    {"name": "quest_princess_name", "image": "assets/quests/save_a_princess_from_another_castle.jpg"},
+]
+
+# Maps the internal quest phase names to the Quest attribute holding their text.
+PHASE_TEXT_ATTRIBUTES = {
+    "Anreise": "travel_text",
+    "Aktion": "action_text",
+    "Rückkehr": "return_text",
+}
+
+LOW_HEALTH_THRESHOLD = 0.1
+
+# Pacing of the GUI quest loop, also used to estimate offline progress.
+QUEST_TICK_MS = 150
+QUEST_RESTART_DELAY_MS = 1000
+
+
+class GameEngine:
+    """Owns the quest loop of a single character without depending on tkinter."""
+
+    def __init__(self, character, trader=None):
+        """
+        Initializes the engine for a character.
+
+        Args:
+            character (Character): The character that goes on quests.
+            trader (Trader): The trader used for automatic selling. A new one is created if omitted.
+        """
+        self.player = character
+        self.trader = trader if trader else Trader()
+        self.current_quest = None
+        self.current_quest_data = None
+        self.game_over = False
+        self.quests_completed = 0
+        # Whether the last quest played by run_quest reported low health.
+        self.low_health = False
+
+    def is_inventory_full(self):
+        """Checks if the character's inventory has no free slot left."""
+        return len(self.player.inventory) >= self.player.max_inventory_size
+
+    def is_low_health(self):
+        """Checks if the character's LP are below LOW_HEALTH_THRESHOLD, where auto-quest stops."""
+        return self.player.current_lp / self.player.max_lp < LOW_HEALTH_THRESHOLD
+
+    def start_quest(self, quest_data=None):
+        """
+        Starts a new quest.
+
+        Args:
+            quest_data (dict): An entry of AVAILABLE_QUESTS. A random one is chosen if omitted.
+
+        Returns:
+            dict: The quest data of the started quest, or None if no quest could be started.
+        """
+        if self.current_quest or self.game_over or self.is_inventory_full():
+            return None
+
+        self.current_quest_data = quest_data if quest_data else random.choice(AVAILABLE_QUESTS)
+        self.current_quest = Quest(get_text(self.player.language, self.current_quest_data["name"]))
+        return self.current_quest_data
+
+    def advance(self):
+        """
+        Advances the current quest by one tick and resolves its completion.
+
+        Returns:
+            dict: The outcome of the tick with the keys 'phase_text', 'event',
+                  'game_over', 'low_health' and 'loot' (None until the quest is complete).
+        """
+        result = {"phase_text": None, "event": None, "game_over": False, "low_health": False, "loot": None}
+        quest = self.current_quest
+        if quest is None:
+            return result
+
+        old_phase = quest.phase
+        result["event"] = quest.advance(self.player)
+        if quest.phase != old_phase:
+            result["phase_text"] = getattr(quest, PHASE_TEXT_ATTRIBUTES.get(quest.phase, ""), None)
+
+        if self.player.current_lp <= 0:
+            self.game_over = True
+            self.current_quest = None
+            result["game_over"] = True
+            return result
+        result["low_health"] = self.is_low_health()
+
+        if quest.is_complete():
+            result["loot"] = self._complete_quest(quest)
+        return result
+
+    def _complete_quest(self, quest):
+        """Grants the rewards of a finished quest and clears it."""
+        copper, xp, item = quest.generate_reward(self.player)
+        status, received_item = self.player.add_loot(copper, item)
+        level_ups = self.player.add_xp(xp)
+
+        self.current_quest = None
+        self.current_quest_data = None
+        self.quests_completed += 1
+        return {"copper": copper, "xp": xp, "status": status, "item": received_item, "level_ups": level_ups}
+
+    def run_quest(self, quest_data=None):
+        """
+        Plays a complete quest as fast as possible. Whether any tick reported
+        low health is kept in self.low_health.
+
+        Returns:
+            dict: The loot of the quest, or None if it could not be started or the character died.
+        """
+        self.low_health = False
+        if not self.start_quest(quest_data):
+            return None
+        while self.current_quest:
+            result = self.advance()
+            self.low_health = self.low_health or result["low_health"]
+            if result["loot"]:
+                return result["loot"]
+        return None
+
+    def manage_inventory(self):
+        """
+        Equips the best upgrade for every slot and sells all remaining non-upgrades.
+
+        Returns:
+            tuple: The number of items sold and the copper gained.
+        """
+        player = self.player
+        for slot in player.equipment:
+            candidates = [item for item in player.inventory.by_slot(slot) if player.is_upgrade(item)]
+            if candidates:
+                best_item = max(candidates, key=lambda item: item.get_weighted_score(player.main_stat))
+                player.equip(player.inventory.index(best_item))
+        return self.trader.sell_all_non_upgrades(player)
+
+    def can_fight_boss(self):
+        """Checks if the next boss is available and the character's item level is high enough."""
+        tier = self.player.boss_tier
+        return (self.current_quest is None and not self.game_over and tier < len(BOSS_TIERS) and
+                self.player.get_item_level() >= BOSS_TIERS[tier]["required_item_level"])
+
+    def fight_boss(self):
+        """
+        Fights the next boss with plain attacks until one side falls.
+
+        A victory grants the same rewards as the boss arena. A defeat leads to
+        a rebirth, as it does in the game.
+
+        Returns:
+            dict: The outcome with the keys 'boss' (name key), 'won', 'copper', 'xp',
+                  'item' and 'level_ups', or None if no boss can be fought.
+        """
+        if not self.can_fight_boss():
+            return None
+        player = self.player
+        boss_data = BOSS_TIERS[player.boss_tier]
+        boss = Boss(boss_data["name_key"], boss_data["hp"], boss_data["damage"], boss_data["image_path"],
+                    player.get_base_item_level(), player.rebirths)
+        result = {"boss": boss.name_key, "won": False, "copper": 0, "xp": 0, "item": None, "level_ups": []}
+
+        main_stat_value = player.get_total_stats()[player.main_stat]
+        while True:
+            boss.take_damage(random.randint(main_stat_value // 2, main_stat_value))
+            if boss.is_defeated():
+                break
+            player.take_damage(boss.attack())
+            if player.current_lp <= 0:
+                player.rebirth()
+                return result
+
+        player.boss_tier += 1
+        player.bosses_defeated += 1
+        result["won"] = True
+        result["copper"] = boss.max_hp
+        result["xp"] = boss.max_hp * 5
+        _, result["item"] = player.add_loot(result["copper"], generate_boss_reward(player))
+        result["level_ups"] = player.add_xp(result["xp"])
+        return result
+
+    def run(self, quest_count, auto_manage=True):
+        """
+        Plays up to quest_count quests back to back. Like auto-quest in the
+        game, it stops after a quest that left the character at low health,
+        and doesn't start one while the character is at low health.
+
+        Args:
+            quest_count (int): The number of quests to play.
+            auto_manage (bool): Whether to equip upgrades and sell junk when the inventory is full.
+
+        Returns:
+            dict: 'completed', the number of quests actually completed, and 'stopped',
+                  why the run ended early ('low_health', 'inventory_full', 'game_over' or None).
+        """
+        completed, stopped = 0, None
+        while completed < quest_count:
+            if self.game_over:
+                stopped = "game_over"
+                break
+            if self.is_low_health():
+                stopped = "low_health"
+                break
+            if self.is_inventory_full():
+                if auto_manage:
+                    self.manage_inventory()
+                if self.is_inventory_full():
+                    stopped = "inventory_full"
+                    break
+            if self.run_quest() is None:
+                stopped = "game_over" if self.game_over else None
+                break
+            completed += 1
+            if self.low_health:
+                stopped = "low_health"
+                break
+        return {"completed": completed, "stopped": stopped}
+
+
+def run_headless(character, quest_count, auto_manage=True):
+    """
+    Runs quests without a GUI and reports the throughput.
+
+    Args:
+        character (Character): The character to play with.
+        quest_count (int): The number of quests to play.
+        auto_manage (bool): Whether to manage the inventory automatically.
+
+    Returns:
+        GameEngine: The engine after the run, for inspection by the caller.
+    """
+    engine = GameEngine(character)
+    start_level = character.level
+
+    start = time.perf_counter()
+    run_result = engine.run(quest_count, auto_manage=auto_manage)
+    completed = run_result["completed"]
+    elapsed = time.perf_counter() - start
+
+    rate = completed / elapsed if elapsed > 0 else float("inf")
+    print(f"{completed} Quests in {elapsed:.2f}s ({rate:.0f} Quests/s)")
+    print(f"Level {start_level} -> {character.level}, Kupfer: {character.copper}, "
+          f"Inventar: {len(character.inventory)}/{character.max_inventory_size}")
+    if engine.game_over:
+        print(f"{character.name} ist bei einer Quest gestorben.")
+    elif run_result["stopped"] == "low_health":
+        print(f"{character.name} hat kaum noch Lebenspunkte; die Quests wurden wie bei Auto-Quest beendet.")
+    return engine
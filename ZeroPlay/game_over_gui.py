@@ -5,13 +5,9 @@ Defines the custom Game Over window with a tombstone image.
 import tkinter as tk
 from tkinter import ttk
 from utils import center_window
-from translations import get_text
-
-try:
-    from PIL import Image, ImageTk
-except ImportError:
-    Image = None
-    ImageTk = None
+from translations import get_translator
+from image_cache import (get_image_cache, IMAGES_AVAILABLE, TOMBSTONE_IMAGE, TOMBSTONE_SIZE,
+                         REBIRTH_IMAGE, REBIRTH_IMAGE_SIZE)
 
 class GameOverWindow(tk.Toplevel):
     """A Toplevel window to display the game over message and image."""
@@ -36,7 +32,7 @@ class GameOverWindow(tk.Toplevel):
 
     def _(self, key):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key)
 
     def create_death_widgets(self, player):
         """Creates and places the widgets for a permanent death."""
@@ -44,11 +40,9 @@ class GameOverWindow(tk.Toplevel):
         container.pack(fill="both", expand=True)
 
         self.tombstone_photo = None
-        if Image and ImageTk:
+        if IMAGES_AVAILABLE:
             try:
-                img = Image.open("assets/grabstein.png")
-                img.thumbnail((200, 300))
-                self.tombstone_photo = ImageTk.PhotoImage(img)
+                self.tombstone_photo = get_image_cache().get_photo(TOMBSTONE_IMAGE, TOMBSTONE_SIZE)
                 image_label = ttk.Label(container, image=self.tombstone_photo)
                 image_label.pack(pady=(10, 10))
             except FileNotFoundError:
@@ -67,11 +61,9 @@ class GameOverWindow(tk.Toplevel):
         container.pack(fill="both", expand=True)
 
         self.rebirth_photo = None
-        if Image and ImageTk:
+        if IMAGES_AVAILABLE:
             try:
-                img = Image.open("assets/bosses/boss_phoenix.png")
-                img.thumbnail((250, 250))
-                self.rebirth_photo = ImageTk.PhotoImage(img)
+                self.rebirth_photo = get_image_cache().get_photo(REBIRTH_IMAGE, REBIRTH_IMAGE_SIZE)
                 image_label = ttk.Label(container, image=self.rebirth_photo)
                 image_label.pack(pady=(10, 10))
             except FileNotFoundError:
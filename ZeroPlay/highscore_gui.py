@@ -4,9 +4,15 @@ Defines the GUI window for displaying high scores.
 """
 import tkinter as tk
 from tkinter import ttk
-from highscore_manager import load_highscores
+from highscore_manager import load_highscores, count_highscores, load_score_sketch, RANKING_METRICS
+from game_data import CLASSES
 from utils import center_window, format_currency
-from translations import get_text
+from translations import get_translator
+
+# The number of scores shown per page.
+HIGHSCORE_PAGE_SIZE = 25
+# The translation key of every leaderboard's name.
+METRIC_LABEL_KEYS = {"level": "level", "rebirths": "rebirths", "bosses_defeated": "bosses_defeated", "copper": "gold"}
 
 class HighscoreWindow(tk.Toplevel):
     """A Toplevel window to display the high score list."""
@@ -19,27 +25,54 @@ class HighscoreWindow(tk.Toplevel):
         self.transient(parent)
         self.grab_set()
 
+        self.page = 0
+        self.metric = "level"
+        self.klasse = None
+
         self.create_widgets()
         self.populate_scores()
 
         self.protocol("WM_DELETE_WINDOW", self.destroy)
 
-    def _(self, key):
+    def _(self, key, **kwargs):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key, **kwargs)
 
     def create_widgets(self):
         """Creates and places the widgets for the window."""
         container = ttk.Frame(self, padding="10")
         container.pack(fill="both", expand=True)
         container.columnconfigure(0, weight=1)
-        container.rowconfigure(0, weight=1)
+        container.rowconfigure(1, weight=1)
+
+        # Leaderboard and class selection
+        filter_frame = ttk.Frame(container)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        self.metric_labels = {self._(METRIC_LABEL_KEYS[metric]): metric for metric in RANKING_METRICS}
+        self.class_labels = {self._("all_classes"): None}
+        self.class_labels.update({self._(class_data["name_key"]): key for key, class_data in CLASSES.items()})
+
+        ttk.Label(filter_frame, text=self._("sort_by")).pack(side=tk.LEFT)
+        self.metric_var = tk.StringVar(value=self._(METRIC_LABEL_KEYS[self.metric]))
+        metric_box = ttk.Combobox(filter_frame, textvariable=self.metric_var, values=list(self.metric_labels),
+                                  state="readonly", width=18)
+        metric_box.pack(side=tk.LEFT, padx=(5, 15))
+        metric_box.bind("<<ComboboxSelected>>", self.on_filter_changed)
+
+        ttk.Label(filter_frame, text=self._("class")).pack(side=tk.LEFT)
+        self.class_var = tk.StringVar(value=self._("all_classes"))
+        class_box = ttk.Combobox(filter_frame, textvariable=self.class_var, values=list(self.class_labels),
+                                 state="readonly", width=18)
+        class_box.pack(side=tk.LEFT, padx=5)
+        class_box.bind("<<ComboboxSelected>>", self.on_filter_changed)
 
         # Define the columns for the Treeview
-        columns = ("name", "level", "rebirths", "bosses", "resources", "best_equipment", "copper")
+        columns = ("rank", "percentile", "name", "level", "rebirths", "bosses", "resources", "best_equipment", "copper")
         self.tree = ttk.Treeview(container, columns=columns, show="headings")
 
         # Define headings
+        self.tree.heading("rank", text=self._("rank"))
+        self.tree.heading("percentile", text=self._("percentile"))
         self.tree.heading("name", text=self._("name"))
         self.tree.heading("level", text=self._("level"))
         self.tree.heading("rebirths", text=self._("rebirths"))
@@ -49,6 +82,8 @@ class HighscoreWindow(tk.Toplevel):
         self.tree.heading("copper", text=self._("gold"))
 
         # Configure column widths
+        self.tree.column("rank", width=50, anchor="center")
+        self.tree.column("percentile", width=80, anchor="center")
         self.tree.column("name", width=120)
         self.tree.column("level", width=50, anchor="center")
         self.tree.column("rebirths", width=100, anchor="center")
@@ -57,23 +92,53 @@ class HighscoreWindow(tk.Toplevel):
         self.tree.column("best_equipment", width=300)
         self.tree.column("copper", width=100, anchor="e")
 
-        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.tree.grid(row=1, column=0, sticky="nsew")
 
         # Add a scrollbar
         scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        scrollbar.grid(row=1, column=1, sticky="ns")
+
+        # Page navigation
+        page_frame = ttk.Frame(container)
+        page_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
+        self.previous_button = ttk.Button(page_frame, text=self._("previous_page"), command=lambda: self.change_page(-1))
+        self.previous_button.pack(side=tk.LEFT)
+        self.page_label = ttk.Label(page_frame, width=20, anchor="center")
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        self.next_button = ttk.Button(page_frame, text=self._("next_page"), command=lambda: self.change_page(1))
+        self.next_button.pack(side=tk.LEFT)
 
         # Close button
         close_button = ttk.Button(container, text=self._("close"), command=self.destroy)
-        close_button.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+        close_button.grid(row=3, column=0, columnspan=2, pady=(10, 0))
 
         center_window(self, self.master.winfo_toplevel())
 
+    def on_filter_changed(self, event=None):
+        """Shows the first page of the selected leaderboard."""
+        self.metric = self.metric_labels.get(self.metric_var.get(), "level")
+        self.klasse = self.class_labels.get(self.class_var.get())
+        self.page = 0
+        self.populate_scores()
+
+    def change_page(self, delta):
+        """Moves delta pages forward or back."""
+        self.page = max(0, self.page + delta)
+        self.populate_scores()
+
     def populate_scores(self):
-        """Loads scores and inserts them into the Treeview."""
-        scores = load_highscores()
-        for score in scores:
+        """Loads the current page of the selected leaderboard and shows it in the Treeview."""
+        total = count_highscores(self.klasse)
+        pages = max(1, -(-total // HIGHSCORE_PAGE_SIZE))
+        self.page = min(self.page, pages - 1)
+        offset = self.page * HIGHSCORE_PAGE_SIZE
+        scores = load_highscores(self.metric, self.klasse, HIGHSCORE_PAGE_SIZE, offset)
+        # The percentile of each score among all past runs in the selected leaderboard.
+        sketch = load_score_sketch(self.metric, self.klasse)
+
+        self.tree.delete(*self.tree.get_children())
+        for rank, score in enumerate(scores, start=offset + 1):
             copper_formatted = format_currency(score.get("copper", 0))
 
             resources_dict = score.get("resources", {})
@@ -90,7 +155,10 @@ class HighscoreWindow(tk.Toplevel):
                 f"{self._('head')}: {score.get('best_head', 'N/A')}, "
                 f"{self._('chest')}: {score.get('best_chest', 'N/A')}"
             )
+            percentile = sketch.rank(score.get(self.metric, 0))
             self.tree.insert("", tk.END, values=(
+                rank,
+                f"{percentile * 100:.1f}" if percentile is not None else "N/A",
                 player_name,
                 score.get("level", 0),
                 score.get("rebirths", 0),
@@ -99,3 +167,7 @@ class HighscoreWindow(tk.Toplevel):
                 best_equipment,
                 copper_formatted
             ))
+
+        self.page_label.config(text=self._("page_of", page=self.page + 1, pages=pages))
+        self.previous_button.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self.page < pages - 1 else tk.DISABLED)
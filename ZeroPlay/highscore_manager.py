@@ -1,46 +1,257 @@
 # highscore_manager.py
 """
 Handles saving and loading of high scores.
+
+Every submitted score is kept in an SQLite database with one index per
+leaderboard, so inserting a score and reading any page of a leaderboard
+never sorts or rewrites the whole history. Scores from the old JSON list
+are imported when the database is created.
+
+Next to the scores, the database keeps a ScoreSketch per leaderboard (and
+per class), updated with every insert, which tells the percentile rank of
+any value without counting or sorting the history.
+
+The game submits scores with submit_highscore, which only queues them; a
+background thread writes them, batching bursts into a single transaction.
 """
+import atexit
 import json
 import os
+import queue
+import sqlite3
+import threading
+import time
+
+from game_data import CLASSES
+from score_sketch import ScoreSketch
+from translations import get_text
 
 HIGHSCORE_FILE = "highscores.json"
+HIGHSCORE_DB = "highscores.db"
+# The fields scores can be ranked by.
+RANKING_METRICS = ("level", "rebirths", "bosses_defeated", "copper")
+# How long a write waits for other processes holding the database lock, in seconds.
+HIGHSCORE_BUSY_TIMEOUT = 5.0
+# How often a write is attempted before its scores are given up.
+HIGHSCORE_WRITE_ATTEMPTS = 3
+# How long the background writer waits for more scores of a burst, and the most it writes at once.
+HIGHSCORE_BATCH_DELAY = 0.2
+HIGHSCORE_MAX_BATCH = 500
 
-def load_highscores():
-    """
-    Loads the high scores from the JSON file.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    klasse TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    rebirths INTEGER NOT NULL,
+    bosses_defeated INTEGER NOT NULL,
+    copper INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_sketches (
+    metric TEXT NOT NULL,
+    klasse TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (metric, klasse)
+);
+""" + "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_scores_{metric} ON scores ({metric} DESC, id);\n"
+    f"CREATE INDEX IF NOT EXISTS idx_scores_klasse_{metric} ON scores (klasse, {metric} DESC, id);\n"
+    for metric in RANKING_METRICS
+)
 
-    Returns:
-        list: A list of high score dictionaries, sorted by level.
-              Returns an empty list if the file doesn't exist.
+_initialized_db = None
+# The writer thread, the prefetch at startup and the GUI may all open the database first.
+_connect_lock = threading.Lock()
+
+def _connect():
+    """
+    Opens a connection to the high score database, creating it and importing
+    HIGHSCORE_FILE the first time.
     """
+    global _initialized_db
+    with _connect_lock:
+        is_new = not os.path.exists(HIGHSCORE_DB)
+        connection = sqlite3.connect(HIGHSCORE_DB, timeout=HIGHSCORE_BUSY_TIMEOUT)
+        if _initialized_db != HIGHSCORE_DB or is_new:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            if is_new:
+                _import_highscore_file(connection)
+            else:
+                _backfill_sketches(connection)
+            _initialized_db = HIGHSCORE_DB
+    return connection
+
+def _import_highscore_file(connection):
+    """Copies the scores of the old JSON list into a new database."""
     if not os.path.exists(HIGHSCORE_FILE):
-        return []
+        return
     try:
         with open(HIGHSCORE_FILE, 'r', encoding='utf-8') as f:
             scores = json.load(f)
-            # Sort scores by level in descending order
-            scores.sort(key=lambda x: x.get('level', 0), reverse=True)
-            return scores
-    except (json.JSONDecodeError, IOError):
-        return []
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Fehler beim Übernehmen der alten Highscores: {e}")
+        return
+    for score in scores:
+        score["klasse"] = _class_key(score.get("klasse", ""))
+    with connection:
+        _insert_scores(connection, scores)
 
-def save_highscore(character):
+def _backfill_sketches(connection):
+    """Builds the sketches from the stored scores once, for databases created before sketches existed."""
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        if connection.execute("SELECT 1 FROM score_sketches LIMIT 1").fetchone():
+            return
+        sketches = {}
+        rows = connection.execute(f"SELECT klasse, {', '.join(RANKING_METRICS)} FROM scores")
+        for klasse, *values in rows:
+            _add_to_sketches(sketches, dict(zip(RANKING_METRICS, values), klasse=klasse))
+        _store_sketches(connection, sketches)
+
+def _class_key(klasse):
+    """Returns the class key for a class key or a translated class name, as stored by old high scores."""
+    if klasse in CLASSES:
+        return klasse
+    for key, class_data in CLASSES.items():
+        if klasse in (get_text("de", class_data["name_key"]), get_text("en", class_data["name_key"])):
+            return key
+    return klasse
+
+def _insert_scores(connection, scores):
+    now = time.time()
+    connection.executemany(
+        "INSERT INTO scores (name, klasse, level, rebirths, bosses_defeated, copper, created_at, entry) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(score.get("name", ""), score.get("klasse", ""), score.get("level", 0), score.get("rebirths", 0),
+          score.get("bosses_defeated", 0), score.get("copper", 0), score.get("created_at", now),
+          json.dumps(score, ensure_ascii=False)) for score in scores])
+    sketches = {}
+    for score in scores:
+        _add_to_sketches(sketches, score)
+    _store_sketches(connection, sketches)
+
+def _add_to_sketches(sketches, score):
+    """Adds a score to the sketches of every leaderboard, overall ('' class) and for its class."""
+    for metric in RANKING_METRICS:
+        value = score.get(metric) or 0
+        for klasse in ("", score.get("klasse", "")):
+            key = (metric, klasse)
+            if key not in sketches:
+                sketches[key] = ScoreSketch()
+            sketches[key].add(value)
+
+def _store_sketches(connection, sketches):
+    """Merges sketches of new scores into the stored ones. Runs inside the inserting transaction."""
+    for (metric, klasse), sketch in sketches.items():
+        row = connection.execute("SELECT data FROM score_sketches WHERE metric = ? AND klasse = ?",
+                                 (metric, klasse)).fetchone()
+        if row:
+            stored = ScoreSketch.from_dict(json.loads(row[0]))
+            stored.merge(sketch)
+            sketch = stored
+        connection.execute("INSERT OR REPLACE INTO score_sketches (metric, klasse, data) VALUES (?, ?, ?)",
+                           (metric, klasse, json.dumps(sketch.to_dict())))
+
+def load_score_sketch(metric="level", klasse=None):
     """
-    Saves a character's stats to the high score list.
+    Loads the sketch of a leaderboard.
 
     Args:
-        character (Character): The character object whose stats to save.
+        metric (str): One of RANKING_METRICS.
+        klasse (str): The class whose sketch to load; all classes if not given.
+
+    Returns:
+        ScoreSketch: The sketch, empty if no scores were submitted yet.
+    """
+    try:
+        connection = _connect()
+        try:
+            row = connection.execute("SELECT data FROM score_sketches WHERE metric = ? AND klasse = ?",
+                                     (metric, klasse or "")).fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Fehler beim Laden der Highscores: {e}")
+        row = None
+    return ScoreSketch.from_dict(json.loads(row[0])) if row else ScoreSketch()
+
+def get_percentile_rank(metric, value, klasse=None):
+    """
+    Estimates the share of all submitted scores below a value, e.g. 0.97 if
+    a level beats 97% of all past runs.
+
+    Returns:
+        float: The percentile rank between 0.0 and 1.0, or None if there are no scores yet.
+    """
+    return load_score_sketch(metric, klasse).rank(value)
+
+def load_highscores(metric="level", klasse=None, limit=10, offset=0):
+    """
+    Loads one page of a leaderboard.
+
+    Args:
+        metric (str): The field to rank by, one of RANKING_METRICS.
+        klasse (str): Only rank scores of this class if given.
+        limit (int): The number of scores per page.
+        offset (int): The number of better scores to skip.
+
+    Returns:
+        list: High score dictionaries, best first. Earlier scores rank first on ties.
+    """
+    if metric not in RANKING_METRICS:
+        raise ValueError(f"Unbekannte Rangliste: {metric}")
+    query = "SELECT entry FROM scores"
+    params = []
+    if klasse:
+        query += " WHERE klasse = ?"
+        params.append(klasse)
+    query += f" ORDER BY {metric} DESC, id LIMIT ? OFFSET ?"
+    params += [limit, offset]
+    try:
+        connection = _connect()
+        try:
+            return [json.loads(row[0]) for row in connection.execute(query, params)]
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Fehler beim Laden der Highscores: {e}")
+        return []
+
+def count_highscores(klasse=None):
+    """Returns the number of scores in the history, optionally only of one class."""
+    try:
+        connection = _connect()
+        try:
+            if klasse:
+                return connection.execute("SELECT COUNT(*) FROM scores WHERE klasse = ?", (klasse,)).fetchone()[0]
+            return connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Fehler beim Laden der Highscores: {e}")
+        return 0
+
+def build_score_entry(character):
     """
-    scores = load_highscores()
+    Builds the high score entry for a character.
+
+    Args:
+        character (Character): The character object whose stats to record.
 
+    Returns:
+        dict: The high score entry.
+    """
     # Extract best equipment names
-    best_weapon = character.equipment.get('Waffe').name if character.equipment.get('Waffe') else "Nichts"
-    best_head = character.equipment.get('Kopf').name if character.equipment.get('Kopf') else "Nichts"
-    best_chest = character.equipment.get('Brust').name if character.equipment.get('Brust') else "Nichts"
+    language = getattr(character, "language", "de")
+    best_weapon = character.equipment['weapon'].get_name(language) if character.equipment.get('weapon') else "Nichts"
+    best_head = character.equipment['head'].get_name(language) if character.equipment.get('head') else "Nichts"
+    best_chest = character.equipment['chest'].get_name(language) if character.equipment.get('chest') else "Nichts"
 
-    new_score = {
+    return {
         "name": character.name,
         "klasse": character.klasse,
         "level": character.level,
@@ -54,16 +265,117 @@ def save_highscore(character):
         "best_chest": best_chest
     }
 
-    scores.append(new_score)
+def save_highscore(character):
+    """
+    Saves a character's stats to the high score list.
 
-    # Sort the scores by level in descending order
-    scores.sort(key=lambda x: x.get('level', 0), reverse=True)
+    Args:
+        character (Character): The character object whose stats to save.
+    """
+    save_highscores([build_score_entry(character)])
 
-    # Keep only the top 10 scores
-    top_scores = scores[:10]
+def save_highscores(new_scores):
+    """
+    Adds several high score entries to the history in a single transaction.
 
-    try:
-        with open(HIGHSCORE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(top_scores, f, indent=4, ensure_ascii=False)
-    except IOError as e:
-        print(f"Fehler beim Speichern der Highscores: {e}")
+    The database lock is taken at the start of the transaction. If another
+    process holds it for longer than HIGHSCORE_BUSY_TIMEOUT, the write is
+    retried up to HIGHSCORE_WRITE_ATTEMPTS times.
+
+    Args:
+        new_scores (list): High score entries as returned by build_score_entry.
+
+    Returns:
+        bool: True if the scores were written.
+    """
+    for attempt in range(1, HIGHSCORE_WRITE_ATTEMPTS + 1):
+        try:
+            connection = _connect()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                _insert_scores(connection, new_scores)
+                connection.commit()
+                return True
+            finally:
+                connection.close()
+        except sqlite3.OperationalError as e:
+            if attempt == HIGHSCORE_WRITE_ATTEMPTS:
+                print(f"Fehler beim Speichern der Highscores: {e}")
+        except sqlite3.Error as e:
+            print(f"Fehler beim Speichern der Highscores: {e}")
+            break
+    return False
+
+
+class HighscoreWriter:
+    """Writes queued high score entries on a background thread."""
+
+    def __init__(self, batch_delay=HIGHSCORE_BATCH_DELAY, max_batch=HIGHSCORE_MAX_BATCH):
+        """
+        Initializes the writer and starts its thread.
+
+        Args:
+            batch_delay (float): How long to wait for further entries after the first one, in seconds.
+            max_batch (int): The maximum number of entries written in one transaction.
+        """
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        """Queues a high score entry for writing."""
+        self._queue.put(entry)
+
+    def flush(self):
+        """Waits until every queued entry has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                save_highscores(batch)
+            except Exception as e:
+                # Any error must not end the thread, or later scores and flushes would wait forever.
+                print(f"Fehler beim Speichern der Highscores: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def submit_highscore(character):
+    """
+    Queues a character's score for the background writer and returns at once.
+
+    The entry is built right away, so later changes to the character (e.g.
+    a rebirth) don't affect it.
+
+    Args:
+        character (Character): The character object whose stats to save.
+    """
+    global _writer
+    entry = build_score_entry(character)
+    with _writer_lock:
+        if _writer is None:
+            _writer = HighscoreWriter()
+            atexit.register(flush_highscores)
+    _writer.submit(entry)
+
+def flush_highscores():
+    """Waits until all submitted scores are written, e.g. before the program exits."""
+    if _writer is not None:
+        _writer.flush()
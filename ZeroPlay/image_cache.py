@@ -0,0 +1,356 @@
+# image_cache.py
+"""
+Defines the ImageCache, a shared, size-bounded LRU cache of decoded and
+resized images, so artwork that is shown again (quest pictures, portraits,
+bosses) is not read and decoded from disk again.
+
+Images that are not in memory are read, in this order, from:
+  1. the pre-sized variants written by build_assets.py, listed in
+     ASSET_MANIFEST, if the source's mtime still matches the manifest;
+  2. the on-disk cache in DISK_CACHE_DIR, whose files carry the mtime of
+     their source, so a changed source invalidates them;
+  3. the full-size source. JPEGs are decoded at reduced resolution (draft
+     mode); the result is written to the on-disk cache.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = None
+    ImageTk = None
+
+IMAGES_AVAILABLE = Image is not None
+# The decoded pixels the cache may hold, counted as 4 bytes per pixel.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# The sizes the windows show images at.
+PORTRAIT_SIZE = (220, 280)
+QUEST_IMAGE_SIZE = (300, 200)
+CLASS_PREVIEW_SIZE = (250, 350)
+ARENA_IMAGE_SIZE = (150, 200)
+TOMBSTONE_SIZE = (200, 300)
+REBIRTH_IMAGE_SIZE = (250, 250)
+
+ASSET_DIR = "assets"
+# Written by build_assets.py; both are generated and not part of the repository.
+ASSET_VARIANT_DIR = os.path.join(ASSET_DIR, "__variants__")
+MANIFEST_NAME = "manifest.json"
+ASSET_MANIFEST = os.path.join(ASSET_VARIANT_DIR, MANIFEST_NAME)
+ASSET_MANIFEST_VERSION = 1
+DISK_CACHE_DIR = os.path.join(ASSET_DIR, "__cache__")
+JPEG_QUALITY = 90
+# ScaledImage halves its image down to this edge length.
+MIP_MIN_SIZE = 32
+# The final renders a ScaledImage keeps, e.g. for the normal and the maximized window.
+SCALED_CACHE_SIZE = 4
+# The modes ScaledImage scales directly. Others (e.g. palette, bilevel or 16-bit
+# images) can't be reduced, or would average palette indices, and are converted first.
+SCALABLE_MODES = ("RGB", "RGBA", "L", "LA")
+
+TOMBSTONE_IMAGE = "assets/grabstein.png"
+REBIRTH_IMAGE = "assets/bosses/boss_phoenix.png"
+MINIGAME_BACKGROUND = "assets/minigame_background.png"
+
+
+def render_image(path, size=None):
+    """
+    Decodes an image and shrinks it to fit size like Image.thumbnail.
+
+    JPEGs are decoded in draft mode, which lets the decoder scale them down
+    by up to 1/8 while decoding, so only the pixels needed for the size are
+    produced.
+
+    Args:
+        path (str): The image file.
+        size (tuple): The (width, height) to fit the image into, or None for the original size.
+    """
+    image = Image.open(path)
+    if size:
+        if image.format == "JPEG":
+            image.draft("RGB", tuple(size))
+        image.thumbnail(size)
+    image.load()
+    return image
+
+def get_variant_name(path, size):
+    """
+    Returns the file name of an image's variant at a size, relative to the
+    variant or disk cache directory, e.g. 'quests/kill_all_slimes_300x200.jpg'.
+    """
+    stem, extension = os.path.splitext(path.replace("\\", "/"))
+    prefix = ASSET_DIR + "/"
+    if stem.startswith(prefix):
+        stem = stem[len(prefix):]
+    return f"{stem}_{size[0]}x{size[1]}{extension.lower()}"
+
+def save_image(image, filename, mtime_ns=None):
+    """
+    Writes an image atomically, as JPEG or PNG depending on the file extension.
+
+    Args:
+        image: The PIL image.
+        filename (str): The target file.
+        mtime_ns (int): If given, the file's mtime is set to it, e.g. to the mtime of the source.
+    """
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    temp_filename = f"{filename}.{threading.get_ident()}.tmp"
+    try:
+        if filename.lower().endswith((".jpg", ".jpeg")):
+            image.convert("RGB").save(temp_filename, "JPEG", quality=JPEG_QUALITY)
+        else:
+            image.save(temp_filename, "PNG")
+        if mtime_ns is not None:
+            os.utime(temp_filename, ns=(mtime_ns, mtime_ns))
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+def load_manifest(filename=ASSET_MANIFEST):
+    """Returns the images of the variant manifest, keyed by source path, or {} if there is none (or it is outdated)."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != ASSET_MANIFEST_VERSION:
+        return {}
+    return manifest.get("images", {})
+
+
+class _Entry:
+    __slots__ = ("image", "photo", "size_bytes")
+
+    def __init__(self, image):
+        self.image = image
+        self.photo = None
+        self.size_bytes = image.width * image.height * 4
+
+
+class ImageCache:
+    """
+    Caches images keyed by (path, size, mtime), so a changed file is decoded
+    again. Decoding is thread-safe; PhotoImages must be requested on the Tk
+    thread, like every other Tk call.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, variant_dir=ASSET_VARIANT_DIR, disk_cache_dir=DISK_CACHE_DIR):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The pixel memory after which the least recently used images are dropped.
+            variant_dir (str): The directory of the pre-sized variants, or None to not use them.
+            disk_cache_dir (str): The directory of the on-disk cache, or None to not use one.
+        """
+        self.max_bytes = max_bytes
+        self.variant_dir = variant_dir
+        self.disk_cache_dir = disk_cache_dir
+        self._manifest = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # How the misses were served.
+        self.variant_loads = 0
+        self.disk_cache_loads = 0
+
+    def get_pil(self, path, size=None):
+        """
+        Returns the decoded image of a file, shrunk to fit size like Image.thumbnail.
+        The image is shared, so callers must not modify it.
+
+        Args:
+            path (str): The image file.
+            size (tuple): The (width, height) to fit the image into, or None for the original size.
+
+        Raises:
+            OSError: If the file is missing or can't be decoded (e.g. FileNotFoundError).
+        """
+        return self._get_entry(path, size).image
+
+    def get_photo(self, path, size=None):
+        """
+        Returns a ready PhotoImage of a file, shrunk to fit size. Must be called on the Tk thread.
+
+        Callers must keep a reference to the PhotoImage as long as it is shown,
+        because Tk drops images once the cache evicts them.
+        """
+        entry = self._get_entry(path, size)
+        if entry.photo is None:
+            entry.photo = ImageTk.PhotoImage(entry.image)
+        return entry.photo
+
+    def _get_entry(self, path, size):
+        size = tuple(size) if size else None
+        mtime_ns = os.stat(path).st_mtime_ns
+        key = (path, size, mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = _Entry(self._decode(path, size, mtime_ns))
+
+        with self._lock:
+            # Another thread may have decoded the same image meanwhile; keep the first one.
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = entry
+            self.total_bytes += entry.size_bytes
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size_bytes
+                self.evictions += 1
+        return entry
+
+    def _decode(self, path, size, mtime_ns):
+        """Reads an image from its variant, the on-disk cache or its source, in this order."""
+        if not size:
+            return render_image(path)
+        variant_name = get_variant_name(path, size)
+
+        variant = self._get_manifest().get(path)
+        if variant and variant.get("mtime_ns") == mtime_ns and variant_name in variant.get("variants", ()):
+            try:
+                image = render_image(os.path.join(self.variant_dir, variant_name))
+                self.variant_loads += 1
+                return image
+            except OSError:
+                pass
+
+        cached_filename = os.path.join(self.disk_cache_dir, variant_name) if self.disk_cache_dir else None
+        if cached_filename:
+            try:
+                if os.stat(cached_filename).st_mtime_ns == mtime_ns:
+                    image = render_image(cached_filename)
+                    self.disk_cache_loads += 1
+                    return image
+            except OSError:
+                pass
+
+        image = render_image(path, size)
+        if cached_filename:
+            try:
+                save_image(image, cached_filename, mtime_ns)
+            except OSError:
+                # The cache is only an optimization, e.g. the directory may be read-only.
+                pass
+        return image
+
+    def _get_manifest(self):
+        if self._manifest is None:
+            self._manifest = load_manifest(os.path.join(self.variant_dir, MANIFEST_NAME)) if self.variant_dir else {}
+        return self._manifest
+
+    def contains(self, path, size=None):
+        """Checks if an up-to-date image of the file is cached, without counting a hit or miss."""
+        try:
+            key = (path, tuple(size) if size else None, os.stat(path).st_mtime_ns)
+        except OSError:
+            return False
+        with self._lock:
+            return key in self._entries
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'entries', 'bytes', and how many misses were
+            served from variants ('variant_loads') and the on-disk cache ('disk_cache_loads').
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.total_bytes,
+                    "variant_loads": self.variant_loads, "disk_cache_loads": self.disk_cache_loads}
+
+    def clear(self):
+        """Drops all cached images and reloads the manifest on next use; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self._manifest = None
+
+
+
+class ScaledImage:
+    """
+    Renders one image, e.g. a background, at any size, stretched to fill it.
+
+    The image is kept as a mip pyramid of halved copies. Every size is
+    rendered from the smallest copy that is still at least as large, so
+    even a 4K image scales cheaply: fast renders (previews while a window
+    is resized) use nearest-neighbour sampling, final renders Lanczos. The
+    last few final PhotoImages are kept by size.
+    """
+
+    def __init__(self, image, min_size=MIP_MIN_SIZE, cache_size=SCALED_CACHE_SIZE):
+        """
+        Builds the mip pyramid.
+
+        Args:
+            image: The full-size PIL image. It is not modified.
+            min_size (int): The smallest edge length of the pyramid's copies.
+            cache_size (int): The number of final PhotoImages to keep.
+        """
+        if image.mode not in SCALABLE_MODES:
+            has_alpha = "A" in image.mode or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        self.levels = [image]
+        while min(self.levels[-1].size) // 2 >= min_size:
+            self.levels.append(self.levels[-1].reduce(2))
+        self.cache_size = cache_size
+        self._photos = OrderedDict()
+
+    def _get_level(self, size):
+        for level in reversed(self.levels):
+            if level.width >= size[0] and level.height >= size[1]:
+                return level
+        return self.levels[0]
+
+    def render(self, size, fast=False):
+        """
+        Returns the image at a size as a PIL image.
+
+        Args:
+            size (tuple): The (width, height) to stretch the image to.
+            fast (bool): Use nearest-neighbour sampling instead of Lanczos.
+        """
+        level = self._get_level(size)
+        if level.size == tuple(size):
+            return level
+        resample = Image.Resampling.NEAREST if fast else Image.Resampling.LANCZOS
+        return level.resize(tuple(size), resample)
+
+    def get_photo(self, size, fast=False):
+        """Returns the image at a size as a PhotoImage. Must be called on the Tk thread."""
+        size = tuple(size)
+        photo = self._photos.get(size)
+        if photo is not None:
+            self._photos.move_to_end(size)
+            return photo
+        photo = ImageTk.PhotoImage(self.render(size, fast))
+        # Previews are replaced right away; only final renders are worth keeping.
+        if not fast:
+            self._photos[size] = photo
+            while len(self._photos) > self.cache_size:
+                self._photos.popitem(last=False)
+        return photo
+
+
+_shared_cache = ImageCache()
+
+def get_image_cache():
+    """Returns the image cache shared by all windows."""
+    return _shared_cache
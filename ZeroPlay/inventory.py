@@ -0,0 +1,128 @@
+# inventory.py
+"""
+Defines the Inventory, a list of items that keeps an index of its contents.
+"""
+
+
+class Inventory(list):
+    """
+    A list of items that indexes its contents by slot, rarity, boss flag and
+    armor compatibility, so filtered queries don't have to scan every item.
+
+    It is used exactly like a list; every mutating list operation keeps the
+    index up to date. Each item object is expected to be in the inventory at
+    most once.
+    """
+
+    def __init__(self, items=(), allowed_armor_types=()):
+        """
+        Initializes the inventory.
+
+        Args:
+            items (iterable): The initial items.
+            allowed_armor_types (iterable): The armor types the owner's class can wear.
+        """
+        super().__init__(items)
+        self.allowed_armor_types = frozenset(allowed_armor_types)
+        self._rebuild_index()
+
+    def __reduce__(self):
+        """Pickles the inventory as its items and armor types, without the index."""
+        return self.__class__, (list(self), self.allowed_armor_types)
+
+    # --- Queries ---
+    def is_wearable(self, item):
+        """Checks if the owner's class can wear the item's armor type."""
+        return not item.armor_type or item.armor_type in self.allowed_armor_types
+
+    def by_slot(self, slot):
+        """Returns all items for the given equipment slot."""
+        return list(self._index.get(("slot", slot), ()))
+
+    def by_rarity(self, rarity_key):
+        """Returns all items of the given rarity."""
+        return list(self._index.get(("rarity", rarity_key), ()))
+
+    def boss_items(self):
+        """Returns all boss items."""
+        return list(self._index.get(("boss", True), ()))
+
+    def wearable_items(self):
+        """Returns all items whose armor type the owner can wear."""
+        return list(self._index.get(("wearable", True), ()))
+
+    def count_in_slot(self, slot):
+        """Returns the number of items for the given equipment slot."""
+        return len(self._index.get(("slot", slot), ()))
+
+    # --- Index maintenance ---
+    def _index_keys(self, item):
+        return (("slot", item.slot), ("rarity", item.rarity_key),
+                ("boss", item.is_boss_item()), ("wearable", self.is_wearable(item)))
+
+    def _index_add(self, item):
+        index = self._index
+        for key in self._index_keys(item):
+            index.setdefault(key, {})[item] = None
+
+    def _index_remove(self, item):
+        for key in self._index_keys(item):
+            group = self._index.get(key)
+            if group is not None:
+                group.pop(item, None)
+                if not group:
+                    del self._index[key]
+
+    def _rebuild_index(self):
+        # Items are grouped in dicts used as ordered sets, so removal is O(1).
+        self._index = {}
+        for item in self:
+            self._index_add(item)
+
+    # --- Mutating list operations ---
+    def append(self, item):
+        super().append(item)
+        self._index_add(item)
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._index_add(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._index_add(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._index_remove(item)
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._index_remove(item)
+
+    def clear(self):
+        super().clear()
+        self._index = {}
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self._rebuild_index()
+        else:
+            self._index_remove(self[index])
+            super().__setitem__(index, value)
+            self._index_add(value)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            super().__delitem__(index)
+            self._rebuild_index()
+        else:
+            self.pop(index)
@@ -2,47 +2,122 @@
 """
 Defines the Item class for all in-game items.
 """
+from collections import namedtuple
 from utils import format_currency
 from game_data import ITEM_ICONS, RARITIES
-from translations import get_text
+from stat_block import StatBlock, main_stat_weights, LEGACY_STAT_KEYS
+from translations import get_translator
+
+# Everything about an item that is fixed by its blueprint. Records are
+# interned, so all items built from the same blueprint share one instance.
+ItemBlueprint = namedtuple("ItemBlueprint", ["name_key", "gender", "item_type", "slot", "armor_type", "icon"])
+
+# The parts of a RARITIES entry an item needs, shared by all items of that rarity.
+RarityRecord = namedtuple("RarityRecord", ["key", "color", "modifier", "max_upgrades"])
+
+_BLUEPRINTS = {}
+RARITY_RECORDS = {
+    key: RarityRecord(key, data.get("color", "#FFFFFF"), data.get("modifier", 1.0), data.get("max_upgrades", 0))
+    for key, data in RARITIES.items()
+}
+
+def get_blueprint(name_key, gender, item_type="equipment", slot=None, armor_type=None):
+    """Returns the shared ItemBlueprint record for the given fields."""
+    key = (name_key, gender, item_type, slot, armor_type)
+    blueprint = _BLUEPRINTS.get(key)
+    if blueprint is None:
+        icon = "❔"
+        if item_type == "equipment" and slot:
+            icon = ITEM_ICONS.get(slot, "❔")
+        elif item_type == "consumable":
+            icon = ITEM_ICONS.get("consumable", "❔")
+        blueprint = _BLUEPRINTS[key] = ItemBlueprint(name_key, gender, item_type, slot, armor_type, icon)
+    return blueprint
 
 class Item:
     """Represents an item with localizable name, type, value, and effects."""
 
+    __slots__ = ("blueprint", "rarity", "base_stats", "stats_boost", "base_value", "value",
+                 "upgrade_level", "is_boss_item_flag")
+
+    # Bumped whenever an existing item's stats change, so characters know
+    # their cached stats may be stale.
+    stats_generation = 0
+
     def __init__(self, name_key, gender, item_type="equipment", slot=None,
                  stats_boost=None, value=0, rarity_key="common", armor_type=None, is_boss_item=False):
         """
         Initializes an Item using localization keys.
         """
-        self.name_key = name_key
-        self.gender = gender
-        self.item_type = item_type
-        self.slot = slot
-        self.armor_type = armor_type
-        self.base_stats = stats_boost if stats_boost else {}
+        self.blueprint = get_blueprint(name_key, gender, item_type, slot, armor_type)
+        self.rarity = RARITY_RECORDS[rarity_key]
+        self.base_stats = _to_base_stats(item_type, stats_boost)
         self.base_value = value
-        self.rarity_key = rarity_key
         self.upgrade_level = 0
-        self.color = RARITIES[rarity_key].get("color", "#FFFFFF")
         self.is_boss_item_flag = is_boss_item
+        self.update_upgraded_state()
 
-        self.icon = "❔"
-        if self.item_type == "equipment" and self.slot:
-            self.icon = ITEM_ICONS.get(self.slot, "❔")
-        elif self.item_type == "consumable":
-            self.icon = ITEM_ICONS.get("consumable", "❔")
-
-        self.stats_boost = {}
-        self.value = 0
+    def __getstate__(self):
+        """Returns the item's own data; blueprint and rarity are stored by key."""
+        blueprint = self.blueprint
+        return {
+            "name_key": blueprint.name_key, "gender": blueprint.gender, "item_type": blueprint.item_type,
+            "slot": blueprint.slot, "armor_type": blueprint.armor_type, "rarity_key": self.rarity.key,
+            "base_stats": self.base_stats, "base_value": self.base_value,
+            "upgrade_level": self.upgrade_level, "is_boss_item_flag": self.is_boss_item_flag,
+        }
+
+    def __setstate__(self, state):
+        """Restores an item from __getstate__ or from the __dict__ of an old pickled save."""
+        self.blueprint = get_blueprint(state["name_key"], state["gender"], state.get("item_type", "equipment"),
+                                       state.get("slot"), state.get("armor_type"))
+        self.rarity = RARITY_RECORDS[state.get("rarity_key", "common")]
+        self.base_stats = _to_base_stats(self.blueprint.item_type, state.get("base_stats"))
+        self.base_value = state.get("base_value", 0)
+        self.upgrade_level = state.get("upgrade_level", 0)
+        self.is_boss_item_flag = state.get("is_boss_item_flag", False)
         self.update_upgraded_state()
 
+    @classmethod
+    def from_record(cls, blueprint, rarity, base_stats, base_value, upgrade_level=0, is_boss_item=False):
+        """
+        Builds an item directly from its shared records, as stored in save files.
+
+        Args:
+            blueprint (ItemBlueprint): The item's blueprint record.
+            rarity (RarityRecord): The item's rarity record.
+            base_stats: A StatBlock for equipment, an effect dictionary for consumables.
+            base_value (int): The value before upgrades.
+            upgrade_level (int): The item's upgrade level.
+            is_boss_item (bool): Whether the item is a boss item.
+        """
+        item = cls.__new__(cls)
+        item.blueprint = blueprint
+        item.rarity = rarity
+        item.base_stats = base_stats
+        item.base_value = base_value
+        item.upgrade_level = upgrade_level
+        item.is_boss_item_flag = is_boss_item
+        item.update_upgraded_state()
+        return item
+
+    name_key = property(lambda self: self.blueprint.name_key)
+    gender = property(lambda self: self.blueprint.gender)
+    item_type = property(lambda self: self.blueprint.item_type)
+    slot = property(lambda self: self.blueprint.slot)
+    armor_type = property(lambda self: self.blueprint.armor_type)
+    icon = property(lambda self: self.blueprint.icon)
+    rarity_key = property(lambda self: self.rarity.key)
+    color = property(lambda self: self.rarity.color)
+
     def get_name(self, lang):
         """Returns the translated name based on the language."""
-        base_name = get_text(lang, self.name_key)
+        translator = get_translator(lang)
+        base_name = translator[self.name_key]
 
         # Add "Boss" prefix if it's a boss item
         if self.is_boss_item():
-            boss_prefix = get_text(lang, "boss") # "Boss" or "Boss"
+            boss_prefix = translator["boss"] # "Boss" or "Boss"
             base_name = f"{boss_prefix} {base_name}"
 
         if self.upgrade_level > 0:
@@ -55,24 +130,25 @@ class Item:
 
     def to_string(self, lang):
         """Returns a fully translated string representation of the item."""
+        translator = get_translator(lang)
         value_str = format_currency(self.value)
         display_name = f"{self.icon} {self.get_name(lang)}"
 
         if self.item_type == "equipment":
             boosts = []
             if self.stats_boost:
-                for stat, val in self.stats_boost.items():
-                    translated_stat = get_text(lang, stat)
+                for stat, val in self.get_boost_items():
+                    translated_stat = translator[stat]
                     boosts.append(f"{'+' if val >= 0 else ''}{val} {translated_stat}")
             boost_str = ", ".join(boosts)
-            translated_slot = get_text(lang, self.slot)
+            translated_slot = translator[self.slot]
             return f"{display_name} ({translated_slot}) [{boost_str}] - {value_str}"
 
         elif self.item_type == "consumable":
             # Consumable effects are stored in base_stats and don't change
             effect = list(self.base_stats.keys())[0] # e.g., 'LP'
             val = list(self.base_stats.values())[0]
-            effect_str = get_text(lang, "consumable_effect", value=val, effect=effect)
+            effect_str = translator("consumable_effect", value=val, effect=effect)
             return f"{display_name} [{effect_str}] - {value_str}"
 
         return f"{display_name} - {value_str}"
@@ -80,12 +156,11 @@ class Item:
 
     def update_upgraded_state(self):
         """Calculates and sets the item's stats and value based on its upgrade level."""
-        if self.item_type == "equipment":
-            self.stats_boost = {}
-            for stat, base_value in self.base_stats.items():
-                self.stats_boost[stat] = base_value + self.upgrade_level
+        if self.item_type == "equipment" and self.upgrade_level > 0:
+            self.stats_boost = self.base_stats.raised(self.upgrade_level)
         else:
-            self.stats_boost = self.base_stats.copy()
+            # Without upgrades the boost equals the base stats, so both share one object.
+            self.stats_boost = self.base_stats
 
         self.value = int(self.base_value * (1 + self.upgrade_level * 0.5))
 
@@ -94,31 +169,33 @@ class Item:
         if self.item_type != "equipment":
             return False
 
-        max_upgrades = RARITIES[self.rarity_key].get("max_upgrades", 0)
-        if self.upgrade_level >= max_upgrades:
+        if self.upgrade_level >= self.rarity.max_upgrades:
             return False
 
         self.upgrade_level += 1
         self.update_upgraded_state()
+        Item.stats_generation += 1
         return True
 
+    def get_boost_items(self):
+        """Returns the (stat, value) pairs the item grants, leaving out unset stats."""
+        if isinstance(self.stats_boost, StatBlock):
+            return self.stats_boost.nonzero_items()
+        return list(self.stats_boost.items())
+
     def get_weighted_score(self, main_stat, main_stat_weight=1.5):
         """Calculates a weighted score for an item based on a main stat."""
-        if not self.stats_boost:
+        if not self.stats_boost or self.item_type != "equipment":
             return 0
-
-        score = 0
-        for stat, value in self.stats_boost.items():
-            score += value * main_stat_weight if stat == main_stat else value
-        return score
+        return self.stats_boost.dot(main_stat_weights(main_stat, main_stat_weight))
 
     def get_item_score(self):
         """Calculates a single 'item level' score based on total stats and rarity."""
         if not self.stats_boost or self.item_type != "equipment":
             return 0
 
-        total_stats = sum(self.stats_boost.values())
-        rarity_modifier = RARITIES[self.rarity_key].get("modifier", 1.0)
+        total_stats = self.stats_boost.total()
+        rarity_modifier = self.rarity.modifier
 
         score = total_stats * (rarity_modifier ** 2)
         return int(score)
@@ -132,8 +209,24 @@ class Item:
         if not self.base_stats or self.item_type != "equipment":
             return 0
 
-        total_stats = sum(self.base_stats.values())
-        rarity_modifier = RARITIES[self.rarity_key].get("modifier", 1.0)
+        total_stats = self.base_stats.total()
+        rarity_modifier = self.rarity.modifier
 
         score = total_stats * (rarity_modifier ** 2)
         return int(score)
+
+
+def _to_base_stats(item_type, stats):
+    """
+    Returns the base stats in the form the item type uses: a StatBlock for
+    equipment, the plain effect dictionary (e.g. {'LP': 50}) for consumables.
+    Accepts both forms, so dictionaries from old saves are converted; their
+    German stat keys are translated first, as StatBlock drops unknown keys.
+    """
+    if item_type == "equipment":
+        if isinstance(stats, StatBlock):
+            return stats
+        if not stats:
+            return StatBlock()
+        return StatBlock.from_dict({LEGACY_STAT_KEYS.get(stat, stat): value for stat, value in stats.items()})
+    return stats if stats else {}
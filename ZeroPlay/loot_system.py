@@ -5,6 +5,18 @@ Handles the dynamic generation of loot based on player level.
 import random
 from item import Item
 from game_data import ITEM_BLUEPRINTS, RARITIES
+from stat_block import StatBlock, STAT_KEYS, STAT_INDEX
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Flat lookup tables used by the batch generator and ItemBatch.
+SLOT_KEYS = list(ITEM_BLUEPRINTS.keys())
+RARITY_KEYS = list(RARITIES.keys())
+BLUEPRINTS = [(slot, blueprint) for slot in SLOT_KEYS for blueprint in ITEM_BLUEPRINTS[slot]]
+BLUEPRINT_INDEX = {(slot, blueprint["name_key"]): i for i, (slot, blueprint) in enumerate(BLUEPRINTS)}
 
 def generate_item_for_level(level, luck):
     """
@@ -26,28 +38,27 @@ def generate_item_for_level(level, luck):
     slot = random.choice(list(ITEM_BLUEPRINTS.keys()))
     blueprint = random.choice(ITEM_BLUEPRINTS[slot])
 
-    stats_boost = {}
+    stats_boost = StatBlock()
     base_bonus = blueprint["base_bonus"]
     primary_stat_value = int((base_bonus + (level * 0.9)) * rarity_data["modifier"])
     primary_stat_value = int(primary_stat_value * random.uniform(0.95, 1.05))
     stats_boost[blueprint["base_stat"]] = max(1, primary_stat_value)
 
-    all_stats = ["strength", "agility", "intelligence", "luck"]
     if chosen_rarity_key in ["epic", "legendary", "mythic"]:
-        possible_secondary_stats = [s for s in all_stats if s != blueprint["base_stat"]]
+        possible_secondary_stats = [s for s in STAT_KEYS if s != blueprint["base_stat"]]
         if possible_secondary_stats:
             secondary_stat = random.choice(possible_secondary_stats)
             secondary_value = int(primary_stat_value * 0.4)
             stats_boost[secondary_stat] = max(1, secondary_value)
 
     if chosen_rarity_key == "mythic":
-        possible_tertiary_stats = [s for s in all_stats if s not in stats_boost]
+        possible_tertiary_stats = [s for s in STAT_KEYS if not stats_boost[s]]
         if possible_tertiary_stats:
             tertiary_stat = random.choice(possible_tertiary_stats)
             tertiary_value = int(primary_stat_value * 0.25)
             stats_boost[tertiary_stat] = max(1, tertiary_value)
 
-    total_stat_points = sum(stats_boost.values())
+    total_stat_points = stats_boost.total()
     value = max(1, int((level * 1.5) + (total_stat_points * 2.0) * rarity_data["modifier"]))
 
     return Item(
@@ -67,10 +78,9 @@ def generate_boss_reward(player):
     all_slots = ["weapon", "head", "chest"]
     main_stat = player.main_stat
 
-    occupied_slots = {
-        item.slot for item in list(player.equipment.values()) + player.inventory
-        if item and item.is_boss_item()
-    }
+    existing_boss_items = [item for item in player.equipment.values() if item and item.is_boss_item()]
+    existing_boss_items += player.inventory.boss_items()
+    occupied_slots = {item.slot for item in existing_boss_items}
 
     available_slots = [s for s in all_slots if s not in occupied_slots]
 
@@ -86,23 +96,22 @@ def generate_boss_reward(player):
 
         min_primary_stat = int((base_score * 1.2) + (player.level * 1.5))
         primary_stat_value = int(min_primary_stat * rarity_data["modifier"])
-        stats_boost = {main_stat: max(min_primary_stat, primary_stat_value)}
+        stats_boost = StatBlock()
+        stats_boost[main_stat] = max(min_primary_stat, primary_stat_value)
 
         if random.random() < 0.75:
             stats_boost[main_stat] += int(primary_stat_value * 0.4)
         else:
             stats_boost["luck"] = int(primary_stat_value * 0.5)
     else:
-        existing_boss_items = [item for item in list(player.equipment.values()) + player.inventory if item and item.is_boss_item()]
         item_to_upgrade = random.choice(existing_boss_items)
         chosen_slot = item_to_upgrade.slot
         chosen_rarity_key = item_to_upgrade.rarity_key
         rarity_data = RARITIES[chosen_rarity_key]
 
-        stats_boost = {
-            stat: int(value * random.uniform(1.05, 1.10)) + 1
-            for stat, value in item_to_upgrade.base_stats.items()
-        }
+        stats_boost = StatBlock()
+        for stat, value in item_to_upgrade.base_stats.nonzero_items():
+            stats_boost[stat] = int(value * random.uniform(1.05, 1.10)) + 1
 
     allowed_armor_types = player.get_allowed_armor_types()
     possible_blueprints = [
@@ -116,7 +125,7 @@ def generate_boss_reward(player):
         chosen_slot = "weapon"
     blueprint = random.choice(possible_blueprints)
 
-    total_stat_points = sum(stats_boost.values())
+    total_stat_points = stats_boost.total()
     value = int((player.level * 5) + (total_stat_points * 4) * rarity_data["modifier"])
 
     return Item(
@@ -129,3 +138,131 @@ def generate_boss_reward(player):
         armor_type=blueprint.get("armor_type"),
         is_boss_item=True
     )
+
+
+class ItemBatch:
+    """
+    A columnar table of generated items. Row i describes one item; Item
+    objects are only built on demand via to_item() or iteration.
+    """
+
+    def __init__(self, level, blueprint_ids, rarity_ids, stats, values):
+        """
+        Initializes the table from its columns.
+
+        Args:
+            level (int): The level the items were generated for.
+            blueprint_ids: Index into BLUEPRINTS for every row.
+            rarity_ids: Index into RARITY_KEYS for every row.
+            stats: One row of four stat values (in STAT_KEYS order) per item.
+            values: The copper value of every item.
+        """
+        self.level = level
+        self.blueprint_ids = blueprint_ids
+        self.rarity_ids = rarity_ids
+        self.stats = stats
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.to_item(index)
+
+    def to_item(self, index):
+        """Builds the Item for a single row."""
+        slot, blueprint = BLUEPRINTS[int(self.blueprint_ids[index])]
+        return Item(
+            name_key=blueprint["name_key"],
+            gender=blueprint["gender"],
+            slot=slot,
+            stats_boost=StatBlock(self.stats[index]),
+            value=int(self.values[index]),
+            rarity_key=RARITY_KEYS[int(self.rarity_ids[index])],
+            armor_type=blueprint.get("armor_type")
+        )
+
+    def to_items(self):
+        """Builds the Items for all rows."""
+        return list(self)
+
+
+def generate_items_batch(level, luck, n, rng=None):
+    """
+    Generates n items for the given level at once.
+
+    Draws rarities, blueprints and stat rolls for all items with NumPy and
+    follows the same rules as generate_item_for_level. Without NumPy the
+    table is filled item by item.
+
+    Args:
+        level (int): The level to scale the items to.
+        luck (int): The luck stat, raising the weight of better rarities.
+        n (int): The number of items to generate.
+        rng (numpy.random.Generator): Optional random generator for reproducible runs.
+
+    Returns:
+        ItemBatch: The generated items as a columnar table.
+    """
+    if np is None:
+        return _generate_items_batch_fallback(level, luck, n)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    # --- Rarity ---
+    luck_factor = 1 + (luck / 100)
+    weights = np.array([
+        (data["weight"] * (luck_factor if r_key not in ["poor", "common"] else 1)) if level >= data["min_level"] else 0.0
+        for r_key, data in RARITIES.items()
+    ])
+    cumulative = np.cumsum(weights)
+    rarity_ids = np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side="right").astype(np.uint8)
+    rarity_ids = np.minimum(rarity_ids, len(RARITY_KEYS) - 1)
+
+    # --- Slot and blueprint ---
+    slot_ids = rng.integers(0, len(SLOT_KEYS), size=n)
+    slot_sizes = np.array([len(ITEM_BLUEPRINTS[slot]) for slot in SLOT_KEYS])
+    slot_offsets = np.concatenate(([0], np.cumsum(slot_sizes)[:-1]))
+    blueprint_ids = (slot_offsets[slot_ids] + (rng.random(n) * slot_sizes[slot_ids]).astype(np.int64)).astype(np.uint16)
+
+    base_bonus = np.array([blueprint["base_bonus"] for _, blueprint in BLUEPRINTS])[blueprint_ids]
+    base_stat = np.array([STAT_INDEX[blueprint["base_stat"]] for _, blueprint in BLUEPRINTS])[blueprint_ids]
+    modifiers = np.array([RARITIES[r_key]["modifier"] for r_key in RARITY_KEYS])[rarity_ids]
+
+    # --- Stats ---
+    primary = np.trunc((base_bonus + level * 0.9) * modifiers)
+    primary = np.trunc(primary * rng.uniform(0.95, 1.05, size=n)).astype(np.int32)
+    rows = np.arange(n)
+    stats = np.zeros((n, len(STAT_KEYS)), dtype=np.int32)
+    stats[rows, base_stat] = np.maximum(1, primary)
+
+    # Secondary stat for epic and better: any stat except the base stat.
+    secondary_offset = rng.integers(1, len(STAT_KEYS), size=n)
+    has_secondary = rarity_ids >= RARITY_KEYS.index("epic")
+    secondary_stat = (base_stat + secondary_offset) % len(STAT_KEYS)
+    stats[rows[has_secondary], secondary_stat[has_secondary]] = np.maximum(1, (primary * 0.4).astype(np.int32))[has_secondary]
+
+    # Tertiary stat for mythic: one of the two stats still unused.
+    remaining_offsets = np.array([[0, 0], [2, 3], [1, 3], [1, 2]])
+    tertiary_offset = remaining_offsets[secondary_offset, rng.integers(0, 2, size=n)]
+    has_tertiary = rarity_ids == RARITY_KEYS.index("mythic")
+    tertiary_stat = (base_stat + tertiary_offset) % len(STAT_KEYS)
+    stats[rows[has_tertiary], tertiary_stat[has_tertiary]] = np.maximum(1, (primary * 0.25).astype(np.int32))[has_tertiary]
+
+    # --- Value ---
+    total_stat_points = stats.sum(axis=1)
+    values = np.maximum(1, np.trunc(level * 1.5 + total_stat_points * 2.0 * modifiers)).astype(np.int32)
+
+    return ItemBatch(level, blueprint_ids, rarity_ids, stats, values)
+
+
+def _generate_items_batch_fallback(level, luck, n):
+    """Fills an ItemBatch from generate_item_for_level when NumPy is unavailable."""
+    blueprint_ids, rarity_ids, stats, values = [], [], [], []
+    for _ in range(n):
+        item = generate_item_for_level(level, luck)
+        blueprint_ids.append(BLUEPRINT_INDEX[(item.slot, item.name_key)])
+        rarity_ids.append(RARITY_KEYS.index(item.rarity_key))
+        stats.append(item.base_stats.values())
+        values.append(item.value)
+    return ItemBatch(level, blueprint_ids, rarity_ids, stats, values)
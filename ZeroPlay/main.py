@@ -2,16 +2,23 @@
 """
 Main entry point for the RPG. Launches the main Game controller.
 """
+import argparse
 import tkinter as tk
 from tkinter import ttk
 from character import Character
+from game_data import CLASSES
+from game_engine import run_headless
+from farm import run_farm_cli
+from offline_progress import apply_offline_progress
 from start_menu_gui import StartMenu
 from class_selection_frame import ClassSelectionFrame
 from rpg_gui import RpgGui
-from save_load_system import save_game, load_game, get_save_files, SAVE_DIR
+from save_load_system import save_game, load_game
+from autosave import Autosaver
 from highscore_gui import HighscoreWindow
+from highscore_manager import flush_highscores
 from splash_screen import SplashScreen
-import os
+from asset_prefetch import AssetPrefetcher
 
 class Game:
     """The main controller for the application, manages scenes."""
@@ -26,6 +33,10 @@ class Game:
 
         self.current_frame = None
         self.character = None
+        self.autosaver = None
+        # Autosavers of previous characters whose writers may still be busy; only joined on exit.
+        self.stopped_autosavers = []
+        self.prefetcher = None
         self.language = "de" # Default language
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -44,6 +55,9 @@ class Game:
         """Displays the initial splash screen for language selection."""
         callbacks = {'continue': self.start_game_from_splash}
         self.switch_frame(SplashScreen, callbacks=callbacks)
+        # Decode images and warm the saves and highscores while the player reads the introduction.
+        self.prefetcher = AssetPrefetcher()
+        self.prefetcher.start(self.root)
 
     def start_game_from_splash(self, selected_language):
         """Sets the language and proceeds to the main menu."""
@@ -76,12 +90,13 @@ class Game:
     def load_and_show_game(self, character_name):
         self.character = load_game(character_name)
         if self.character:
-            self.show_game()
+            offline_report = apply_offline_progress(self.character)
+            self.show_game(offline_report=offline_report)
         else:
             # Handle failed load, maybe show an error and return to start menu
             self.show_start_menu()
 
-    def show_game(self):
+    def show_game(self, offline_report=None):
         self.root.title(f"Chronicle of the Idle Hero - {self.character.name}")
         callbacks = {
             'game_over': self.handle_game_over_and_restart,
@@ -92,7 +107,20 @@ class Game:
         self.character.pending_unlock_messages = [] # Clear messages after retrieving
 
         # The RpgGui now takes the character object directly
-        self.switch_frame(RpgGui, character=self.character, callbacks=callbacks, initial_messages=initial_messages, language=self.language)
+        self.switch_frame(RpgGui, character=self.character, callbacks=callbacks, initial_messages=initial_messages,
+                          language=self.language, offline_report=offline_report)
+        self.start_autosave()
+
+    def start_autosave(self):
+        """Starts saving the current character in the background, unless that is already happening."""
+        if self.autosaver and self.autosaver.character is self.character:
+            return
+        if self.autosaver:
+            # The writer finishes its final save by itself; the UI thread doesn't wait for the disk.
+            self.autosaver.stop(wait=False)
+            self.stopped_autosavers.append(self.autosaver)
+        self.autosaver = Autosaver(self.character)
+        self.autosaver.start(self.root)
 
 
     def handle_game_over_and_restart(self, death_by_boss):
@@ -104,28 +132,37 @@ class Game:
         if death_by_boss:
             print(f"{self.character.name} wurde von einem Boss besiegt. Wiedergeburt wird eingeleitet.")
             self.character.rebirth()
-            save_game(self.character)
+            self.autosaver.save_now()
             # Reload the game screen with the reborn character
             self.show_game()
         else:
             print(f"{self.character.name} ist bei einer Quest gestorben. Spielstand wird gelöscht.")
-            save_file_path = os.path.join(SAVE_DIR, f"{self.character.name}.sav")
-            if os.path.exists(save_file_path):
-                os.remove(save_file_path)
-                print(f"Spielstand für {self.character.name} gelöscht.")
+            # Waits only for the last journal write, so the start menu no longer lists the save.
+            self.autosaver.stop(delete=True)
+            self.autosaver = None
+            print(f"Spielstand für {self.character.name} gelöscht.")
 
             self.character = None
             self.show_start_menu()
 
     def on_closing(self):
         """Handles the main window closing event."""
-        # If the game screen is active, save the character
-        if isinstance(self.current_frame, RpgGui) and not self.current_frame.game_over:
-            save_game(self.character)
+        # If the game screen is active, write a final save and wait for the autosave to finish
+        if self.autosaver:
+            game_over = isinstance(self.current_frame, RpgGui) and self.current_frame.game_over
+            self.autosaver.stop(save=not game_over)
+            self.autosaver = None
         self.quit_game()
 
     def quit_game(self):
         """Stops the main loop and closes the application."""
+        if self.prefetcher:
+            self.prefetcher.stop()
+        # Writers of earlier characters may still be writing their final save.
+        for autosaver in self.stopped_autosavers:
+            autosaver.join()
+        self.stopped_autosavers = []
+        flush_highscores()
         self.root.quit()
         self.root.destroy()
 
@@ -133,7 +170,45 @@ class Game:
         """Starts the main tkinter loop."""
         self.root.mainloop()
 
+def parse_args():
+    """Parses the command line arguments."""
+    parser = argparse.ArgumentParser(description="Chronicle of the Idle Hero")
+    parser.add_argument("--headless", action="store_true", help="run quests without a GUI and report quests/sec")
+    parser.add_argument("--character", help="name of the character to load or create (headless mode)")
+    parser.add_argument("--class", dest="klasse", choices=list(CLASSES.keys()), default="warrior",
+                        help="class for a newly created character (headless mode)")
+    parser.add_argument("--quests", type=int, default=100, help="number of quests to play (headless mode)")
+    parser.add_argument("--immortal", action="store_true", help="ignore quest damage (headless mode)")
+    parser.add_argument("--save", action="store_true", help="save the character after the run (headless mode)")
+    parser.add_argument("--farm", action="store_true", help="simulate many heroes in parallel and merge their highscores")
+    parser.add_argument("--heroes", type=int, default=100, help="number of heroes to simulate (farm mode)")
+    parser.add_argument("--bosses", type=int, default=3, help="boss attempts per hero (farm mode)")
+    parser.add_argument("--max-rebirths", type=int, default=0, help="spread heroes over 0..N rebirths (farm mode)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to all cores (farm mode)")
+    parser.add_argument("--seed", type=int, default=None, help="base random seed (farm mode)")
+    return parser.parse_args()
+
+def main_headless(args):
+    """Loads or creates a character and plays quests without a GUI."""
+    if not args.character:
+        print("Im Headless-Modus wird --character NAME benötigt.")
+        return
+    character = load_game(args.character) or Character(args.character, args.klasse)
+    if args.immortal:
+        character.is_immortal = True
+        character.cheat_activated = True
+    run_headless(character, args.quests)
+    if args.save:
+        save_game(character)
+
 if __name__ == "__main__":
-    main_root = tk.Tk()
-    app = Game(main_root)
-    app.run()
+    arguments = parse_args()
+    if arguments.farm:
+        run_farm_cli(arguments.heroes, arguments.quests, arguments.bosses, arguments.max_rebirths,
+                     workers=arguments.workers, seed=arguments.seed)
+    elif arguments.headless:
+        main_headless(arguments)
+    else:
+        main_root = tk.Tk()
+        app = Game(main_root)
+        app.run()
@@ -0,0 +1,164 @@
+# offline_progress.py
+"""
+Resolves the progress an auto-questing character made while the game was closed.
+"""
+import math
+import time
+
+from quest import Quest, ACTION_RESOURCES, ACTION_RESOURCE_COST
+from game_engine import LOW_HEALTH_THRESHOLD, QUEST_TICK_MS, QUEST_RESTART_DELAY_MS
+
+OFFLINE_MAX_SECONDS = 7 * 24 * 3600  # Progress is capped at one week.
+MAX_SAMPLED_QUESTS = 300  # Quests whose rewards are rolled individually; the rest use expected values.
+AVERAGE_QUEST_DAMAGE = 10  # Mean of the 5-15 damage taken on quest completion.
+
+
+def apply_offline_progress(character, now=None):
+    """
+    Applies the quests an auto-questing character would have completed since
+    its last save, in aggregate instead of tick by tick.
+
+    Progress is resolved one level at a time: expected copper and XP for the
+    quests until the next level-up, with a sample of the quests rolled through
+    Quest.generate_reward so item drops, auto-selling and auto-equipping behave
+    like in the game. Progress stops where auto-quest would have stopped: on
+    low health or a full inventory.
+
+    Args:
+        character (Character): The loaded character.
+        now (float): The current timestamp. Defaults to time.time().
+
+    Returns:
+        dict: A report with the keys 'seconds', 'quests', 'copper', 'xp', 'levels',
+              'items' and 'stopped' ('low_health', 'inventory_full' or None),
+              or None if no progress was made.
+    """
+    if not character.auto_questing or not character.last_saved_at:
+        return None
+    now = now if now is not None else time.time()
+    remaining_seconds = min(now - character.last_saved_at, OFFLINE_MAX_SECONDS)
+
+    start_level = character.level
+    report = {"seconds": remaining_seconds, "quests": 0, "copper": 0, "xp": 0,
+              "levels": 0, "items": [], "stopped": None}
+    quest = Quest("")
+    sampled_quests = 0
+    sold_values = []
+
+    while not report["stopped"]:
+        if len(character.inventory) >= character.max_inventory_size:
+            report["stopped"] = "inventory_full"
+            break
+
+        timing = _quest_timing(character, quest)
+        quest_count = _quests_in_time(timing, remaining_seconds)
+        if quest_count == 0:
+            break
+
+        luck = character.get_total_stats()['luck']
+        luck_bonus = 1 + (luck / 100)
+        expected_xp = (30 + quest.duration * 2) * luck_bonus
+        quest_count = min(quest_count, max(1, math.ceil((character.xp_to_next_level - character.xp) / expected_xp)))
+
+        if not character.is_immortal:
+            lp_floor = character.max_lp * LOW_HEALTH_THRESHOLD
+            quests_until_low = max(1, math.ceil((character.current_lp - lp_floor) / AVERAGE_QUEST_DAMAGE))
+            if quests_until_low <= quest_count:
+                quest_count = quests_until_low
+                report["stopped"] = "low_health"
+
+        # Roll a sample of the quests individually for their item drops.
+        copper, xp, rolled = 0, 0, 0
+        while rolled < quest_count and sampled_quests < MAX_SAMPLED_QUESTS:
+            quest_copper, quest_xp, item = quest.generate_reward(character)
+            status, received_item = character.add_loot(quest_copper, item)
+            copper += quest_copper
+            xp += quest_xp
+            rolled += 1
+            sampled_quests += 1
+            if status in ("added", "auto_equipped"):
+                report["items"].append(received_item)
+            elif status == "auto_sold":
+                copper += received_item.value
+                sold_values.append(received_item.value)
+            if len(character.inventory) >= character.max_inventory_size:
+                report["stopped"] = "inventory_full"
+                quest_count = rolled
+
+        # The remaining quests use expected rewards; drops beyond the sample
+        # count as auto-sold at the average sampled price.
+        unrolled = quest_count - rolled
+        if unrolled > 0:
+            expected_copper = (150 + quest.duration * 10) * luck_bonus
+            if sold_values:
+                item_chance = min(0.95, 0.7 + (luck / 200))
+                expected_copper += item_chance * (sum(sold_values) / len(sold_values))
+            extra_copper = int(expected_copper * unrolled)
+            character.copper += extra_copper
+            copper += extra_copper
+            xp += int(expected_xp * unrolled)
+
+        remaining_seconds -= _seconds_for_quests(timing, quest_count)
+        _consume_action_resource(character, timing, quest_count)
+        if not character.is_immortal:
+            character.current_lp = max(1, character.current_lp - AVERAGE_QUEST_DAMAGE * quest_count)
+        character.add_xp(xp)
+
+        report["quests"] += quest_count
+        report["copper"] += copper
+        report["xp"] += xp
+
+    report["levels"] = character.level - start_level
+    character.last_saved_at = now
+    if report["stopped"]:
+        character.auto_questing = False
+    return report if report["quests"] > 0 else None
+
+
+def _quest_timing(character, quest):
+    """
+    Estimates the wall-clock time of one auto-quest.
+
+    Returns:
+        tuple: Seconds per quest while the class resource lasts, seconds per
+               quest once it is used up, how many quests the current resource
+               pool still covers and the resource cost of one quest.
+    """
+    delay = QUEST_RESTART_DELAY_MS / 1000
+    ticks, action_ticks = quest.estimate_ticks(character, has_resource=True)
+    seconds_with_resource = ticks * QUEST_TICK_MS / 1000 + delay
+
+    if character.klasse not in ACTION_RESOURCES:
+        return seconds_with_resource, seconds_with_resource, math.inf, 0
+
+    empty_ticks, _ = quest.estimate_ticks(character, has_resource=False)
+    seconds_without_resource = empty_ticks * QUEST_TICK_MS / 1000 + delay
+    resource_attr = ACTION_RESOURCES[character.klasse][0]
+    cost = action_ticks * ACTION_RESOURCE_COST
+    if cost == 0:
+        # Strong enough heroes skip the 'Aktion' phase and never spend their resource.
+        return seconds_with_resource, seconds_without_resource, math.inf, 0
+    return seconds_with_resource, seconds_without_resource, getattr(character, resource_attr) // cost, cost
+
+
+def _quests_in_time(timing, seconds):
+    """Returns how many complete quests fit into the given number of seconds."""
+    with_resource, without_resource, covered_quests, _ = timing
+    if covered_quests * with_resource >= seconds:
+        return int(seconds // with_resource)
+    return int(covered_quests + (seconds - covered_quests * with_resource) // without_resource)
+
+
+def _seconds_for_quests(timing, quest_count):
+    """Returns how long the given number of quests takes."""
+    with_resource, without_resource, covered_quests, _ = timing
+    fast_quests = min(quest_count, covered_quests)
+    return fast_quests * with_resource + (quest_count - fast_quests) * without_resource
+
+
+def _consume_action_resource(character, timing, quest_count):
+    """Drains the class resource spent during the quests' 'Aktion' phases."""
+    if character.klasse not in ACTION_RESOURCES:
+        return
+    resource_attr = ACTION_RESOURCES[character.klasse][0]
+    setattr(character, resource_attr, max(0, getattr(character, resource_attr) - timing[3] * quest_count))
@@ -11,6 +11,15 @@ from game_data import (
     QUEST_LOCATIONS, QUEST_ACTIONS_PREFIX, QUEST_RETURNS
 )
 
+# Per class: the resource consumed during the 'Aktion' phase and the progress
+# multiplier that applies once it is used up.
+ACTION_RESOURCES = {
+    "mage": ("current_mp", 0.25),
+    "rogue": ("current_energie", 0.25),
+    "warrior": ("current_wut", 0.5),
+}
+ACTION_RESOURCE_COST = 2
+
 class Quest:
     """Represents a quest that automatically progresses and grants rewards."""
 
@@ -56,22 +65,13 @@ class Quest:
         progress_increase = 1 + (stat_value / 50.0)
 
         # Only consume resources during the 'Aktion' phase
-        if self.phase == "Aktion":
-            if character.klasse == "Magier":
-                if character.current_mp > 0:
-                    character.current_mp = max(0, character.current_mp - 2) # Higher cost for action
-                else:
-                    progress_increase *= 0.25
-            elif character.klasse == "Schurke":
-                if character.current_energie > 0:
-                    character.current_energie = max(0, character.current_energie - 2)
-                else:
-                    progress_increase *= 0.25
-            elif character.klasse == "Krieger":
-                if character.current_wut > 0:
-                    character.current_wut = max(0, character.current_wut - 2)
-                else:
-                    progress_increase *= 0.5
+        if self.phase == "Aktion" and character.klasse in ACTION_RESOURCES:
+            resource_attr, penalty = ACTION_RESOURCES[character.klasse]
+            current = getattr(character, resource_attr)
+            if current > 0:
+                setattr(character, resource_attr, max(0, current - ACTION_RESOURCE_COST)) # Higher cost for action
+            else:
+                progress_increase *= penalty
 
         self.progress += progress_increase
 
@@ -90,16 +90,45 @@ class Quest:
 
         # Generate a class-specific action message, but less frequently
         if self.phase == "Aktion" and random.random() < 0.2: # 20% chance per tick
-            if character.klasse == "Krieger":
+            if character.klasse == "warrior":
                 return random.choice(WARRIOR_EVENTS)
-            elif character.klasse == "Magier":
+            elif character.klasse == "mage":
                 return random.choice(MAGE_EVENTS)
-            elif character.klasse == "Schurke":
+            elif character.klasse == "rogue":
                 return random.choice(ROGUE_EVENTS)
 
         # Return None most of the time to keep the log clean
         return None
 
+    def estimate_ticks(self, character, has_resource=True):
+        """
+        Counts the ticks a fresh quest of this duration takes, without changing
+        the quest or the character.
+
+        Args:
+            character (Character): The character doing the quest.
+            has_resource (bool): Whether the class resource lasts through the 'Aktion' phase.
+
+        Returns:
+            tuple: The total number of ticks and the number of 'Aktion' ticks.
+        """
+        main_stat = CLASSES[character.klasse]["main_stat"]
+        base_increase = 1 + (character.get_total_stats().get(main_stat, 5) / 50.0)
+        penalty = 1.0
+        if not has_resource and character.klasse in ACTION_RESOURCES:
+            penalty = ACTION_RESOURCES[character.klasse][1]
+
+        phase_length = self.duration / 3
+        progress, ticks, action_ticks = 0, 0, 0
+        while progress < self.duration:
+            if phase_length <= progress < phase_length * 2:
+                progress += base_increase * penalty
+                action_ticks += 1
+            else:
+                progress += base_increase
+            ticks += 1
+        return ticks, action_ticks
+
     def generate_phase_texts(self):
         """Generates and stores the descriptive text for each quest phase."""
         location = random.choice(QUEST_LOCATIONS)
@@ -120,15 +149,15 @@ class Quest:
         Returns:
             tuple: A tuple containing gold, xp, and an Item object (or None).
         """
-        luck_bonus = 1 + (character.get_total_stats()['Glück'] / 100) # e.g., 10 luck = 10% bonus
+        luck_bonus = 1 + (character.get_total_stats()['luck'] / 100) # e.g., 10 luck = 10% bonus
 
         copper_reward = int((random.randint(50, 250) + self.duration * 10) * luck_bonus)
         xp_reward = int((random.randint(20, 40) + self.duration * 2) * luck_bonus)
 
         # Luck also slightly increases the chance of finding an item
-        item_chance = 0.7 + (character.get_total_stats()['Glück'] / 200) # 10 luck = +5% chance
+        item_chance = 0.7 + (character.get_total_stats()['luck'] / 200) # 10 luck = +5% chance
         if random.random() < min(0.95, item_chance): # Cap at 95%
-            item_reward = generate_item_for_level(character.level, character.get_total_stats()['Glück'])
+            item_reward = generate_item_for_level(character.level, character.get_total_stats()['luck'])
         else:
             item_reward = None
 
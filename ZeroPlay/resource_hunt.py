@@ -0,0 +1,148 @@
+# resource_hunt.py
+"""
+Defines the ResourceHunt, the spawn and expiry logic of the resource hunt
+minigame, independently of any GUI.
+
+Active orbs are kept in a heap ordered by expiry time, so expiring orbs
+never requires looking at all of them, and the time of the next spawn or
+expiry tells the GUI when it has to wake up next.
+"""
+import heapq
+import random
+
+# (resource, symbol, chance) of the orbs that can spawn.
+ORB_RESOURCES = (("iron_ore", "🪨", 0.8), ("jewel", "💎", 0.2))
+ORB_LIFESPAN = (2, 3)
+ORB_SPAWN_DELAY = (2, 5)
+ORB_FIRST_SPAWN_DELAY = (0.5, 1.5)
+# In high density mode, a few hundred orbs are on the canvas at once.
+HIGH_DENSITY_SPAWN_DELAY = (0.005, 0.02)
+# The distance of spawned orbs to the canvas border, in pixels.
+ORB_MARGIN = 10
+# Events this close together are handled in one wakeup, in seconds.
+TIMER_RESOLUTION = 0.02
+
+
+class Orb:
+    """A resource orb on the minigame canvas."""
+    __slots__ = ("orb_id", "resource", "symbol", "x", "y", "expires_at")
+
+    def __init__(self, orb_id, resource, symbol, x, y, expires_at):
+        self.orb_id = orb_id
+        self.resource = resource
+        self.symbol = symbol
+        self.x = x
+        self.y = y
+        self.expires_at = expires_at
+
+
+class ResourceHunt:
+    """Spawns and expires the orbs of the resource hunt."""
+
+    def __init__(self, high_density=False, rng=random):
+        """
+        Initializes a stopped hunt.
+
+        Args:
+            high_density (bool): Spawn orbs far more often.
+            rng: The random number generator, e.g. a seeded random.Random.
+        """
+        self.high_density = high_density
+        self.rng = rng
+        self.orbs = {}
+        self._expiry_heap = []
+        self._next_orb_id = 0
+        self.next_spawn_time = None
+
+    def start(self, now):
+        """Starts spawning orbs, the first one shortly after now."""
+        self.stop()
+        self.next_spawn_time = now + self.rng.uniform(*ORB_FIRST_SPAWN_DELAY)
+
+    def stop(self):
+        """
+        Stops spawning and removes all orbs.
+
+        Returns:
+            list: The removed orbs.
+        """
+        removed = list(self.orbs.values())
+        self.orbs.clear()
+        self._expiry_heap.clear()
+        self.next_spawn_time = None
+        return removed
+
+    def set_high_density(self, high_density, now):
+        """Switches the spawn rate; a running hunt spawns its next orb by the new rate."""
+        self.high_density = high_density
+        if self.next_spawn_time is not None:
+            self.next_spawn_time = min(self.next_spawn_time, now + self._spawn_delay())
+
+    def _spawn_delay(self):
+        return self.rng.uniform(*(HIGH_DENSITY_SPAWN_DELAY if self.high_density else ORB_SPAWN_DELAY))
+
+    def advance(self, now, width, height):
+        """
+        Expires and spawns all orbs that are due by now.
+
+        Args:
+            now (float): The current time in seconds.
+            width (int): The canvas width in pixels.
+            height (int): The canvas height in pixels.
+
+        Returns:
+            tuple: The list of expired orbs and the list of spawned orbs.
+        """
+        due = now + TIMER_RESOLUTION
+        expired = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= due:
+            _, orb_id = heapq.heappop(heap)
+            # Collected orbs stay in the heap until they would have expired.
+            orb = self.orbs.pop(orb_id, None)
+            if orb is not None:
+                expired.append(orb)
+
+        spawned = []
+        if self.next_spawn_time is not None and self.next_spawn_time <= due:
+            if width <= 2 * ORB_MARGIN or height <= 2 * ORB_MARGIN:
+                # The canvas isn't laid out yet (or too small for an orb); try again after the next delay.
+                self.next_spawn_time = now + self._spawn_delay()
+                return expired, spawned
+            while self.next_spawn_time <= due:
+                expires_at = self.next_spawn_time + self.rng.uniform(*ORB_LIFESPAN)
+                # After a long pause, orbs that would already be gone are skipped.
+                if expires_at > now:
+                    spawned.append(self._spawn(width, height, expires_at))
+                self.next_spawn_time += self._spawn_delay()
+        return expired, spawned
+
+    def _spawn(self, width, height, expires_at):
+        roll = self.rng.random()
+        for resource, symbol, chance in ORB_RESOURCES:
+            roll -= chance
+            if roll < 0:
+                break
+        orb = Orb(self._next_orb_id, resource, symbol,
+                  self.rng.randint(ORB_MARGIN, width - ORB_MARGIN), self.rng.randint(ORB_MARGIN, height - ORB_MARGIN),
+                  expires_at)
+        self._next_orb_id += 1
+        self.orbs[orb.orb_id] = orb
+        heapq.heappush(self._expiry_heap, (expires_at, orb.orb_id))
+        return orb
+
+    def collect(self, orb_id):
+        """
+        Collects an orb.
+
+        Returns:
+            Orb: The collected orb, or None if it already expired or was collected.
+        """
+        return self.orbs.pop(orb_id, None)
+
+    def next_wakeup(self):
+        """Returns the time of the next spawn or expiry, or None if nothing is due."""
+        times = [self.next_spawn_time] if self.next_spawn_time is not None else []
+        if self._expiry_heap:
+            times.append(self._expiry_heap[0][0])
+        return min(times) if times else None
@@ -4,49 +4,80 @@ Defines the main game GUI frame.
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 import time
-from PIL import Image, ImageTk
 
 from boss import Boss
-from quest import Quest
-from trader import Trader
+from game_engine import GameEngine, QUEST_TICK_MS, QUEST_RESTART_DELAY_MS
 from trader_gui import TraderWindow
 from blacksmith_gui import BlacksmithWindow
 from boss_arena_gui import BossArenaWindow
 from utils import format_currency, center_window
 from game_over_gui import GameOverWindow
 from game_data import BOSS_TIERS, CLASSES
-from translations import get_text
-
-AVAILABLE_QUESTS = [
-    {"name": "quest_slimes_name", "image": "assets/quests/kill_all_slimes.jpg"},
-    {"name": "quest_iron_ore_name", "image": "assets/quests/bring_5_iron_ore_to_the_blacksmith.jpg"},
-    {"name": "quest_princess_name", "image": "assets/quests/save_a_princess_from_another_castle.jpg"},
-]
+from highscore_manager import submit_highscore
+from resource_hunt import ResourceHunt
+from translations import get_text, get_translator
+from image_cache import (get_image_cache, ScaledImage, PORTRAIT_SIZE, QUEST_IMAGE_SIZE, TOMBSTONE_IMAGE,
+                         MINIGAME_BACKGROUND)
+
+# Inventories longer than this only render the rows around the visible window.
+INVENTORY_VIRTUALIZE_THRESHOLD = 100
+INVENTORY_RENDER_MARGIN = 20
+INVENTORY_PLACEHOLDER_TEXT = "…"
+
+# The parts of the main screen that are redrawn independently, in drawing order.
+RENDER_REGIONS = ("stats", "inventory", "bars", "resources", "buttons")
+
+# While the minigame canvas is being resized, a fast preview of the background
+# is drawn at most every BACKGROUND_PREVIEW_INTERVAL seconds; the final render
+# follows once no resize happened for BACKGROUND_RESIZE_DEBOUNCE_MS.
+BACKGROUND_PREVIEW_INTERVAL = 0.05
+BACKGROUND_RESIZE_DEBOUNCE_MS = 150
+
+ORB_FONT = ("", 14)
+ORB_PULSE_FONT_SIZE = 24
+ORB_PULSE_SECONDS = 0.3
 
 class RpgGui(ttk.Frame):
     """Manages the main game GUI frame."""
 
-    def __init__(self, parent, character, callbacks, initial_messages=None, language="de"):
+    def __init__(self, parent, character, callbacks, initial_messages=None, language="de", offline_report=None):
         super().__init__(parent)
         self.callbacks = callbacks
         self.language = language
+        self.translator = get_translator(language)
         self.player = character
         self.player.language = language
-        self.trader = Trader()
-        self.current_quest = None
+        self.engine = GameEngine(character)
+        self.trader = self.engine.trader
         self.is_auto_questing = False
         self.game_over = False
         self.quest_loop_id = None
         self.minigame_loop_id = None
-        self.minigame_orbs = {}
-        self.last_orb_spawn_time = 0
-        self.next_orb_spawn_delay = random.uniform(2, 5)
+        self.resource_hunt = ResourceHunt()
+        # Orb canvas items are recycled: hidden items wait in the pool until the next spawn.
+        self.orb_items = {}
+        self.item_orbs = {}
+        self.orb_item_pool = []
         self.minigame_running = False
+        self.high_density_var = tk.BooleanVar(value=False)
+        self.minigame_background = None
+        self.minigame_bg_img = None
+        self.minigame_bg_item = None
+        self.minigame_bg_size = None
+        self.minigame_bg_resize_id = None
+        self.minigame_bg_last_preview = 0
         self.typed_string = ""
         self.cheat_buffer = ""
         self.cheat_code = "ordilogicus"
+        # What the inventory listbox currently shows: the item per row and
+        # the (upgrade level, upgrade flag) it was rendered with, or None
+        # for placeholder rows.
+        self._inventory_rows = []
+        self._inventory_row_states = []
+        self._inventory_render_pending = False
+        self._dirty_regions = set()
+        self._render_id = None
 
         self.master.bind("<Key>", self.handle_keypress)
         self.master.bind("<Key>", self._handle_keypress, add="+")
@@ -58,9 +89,13 @@ class RpgGui(ttk.Frame):
         if initial_messages:
             for msg in initial_messages:
                 self.show_unlock_message(msg)
+        if offline_report:
+            self.show_offline_report(offline_report)
+        if self.player.auto_questing:
+            self.toggle_auto_quest()
 
     def _(self, key, **kwargs):
-        return get_text(self.language, key, **kwargs)
+        return self.translator(key, **kwargs)
 
     def show_unlock_message(self, message_key):
         if ":" in message_key:
@@ -72,13 +107,22 @@ class RpgGui(ttk.Frame):
         self.add_to_log(f"⭐ {message} ⭐")
         messagebox.showinfo(self._("milestone_unlocked"), message, parent=self)
 
+    def show_offline_report(self, report):
+        minutes = int(report["seconds"] // 60)
+        message = self._("offline_progress_msg", hours=minutes // 60, minutes=minutes % 60, quests=report["quests"],
+                         gold=format_currency(report["copper"]), xp=report["xp"], levels=report["levels"], items=len(report["items"]))
+        if report["stopped"]:
+            message += "\n\n" + self._(f"offline_stopped_{report['stopped']}")
+        self.add_to_log(message)
+        messagebox.showinfo(self._("offline_progress_title"), message, parent=self)
+
     def handle_keypress(self, event):
         self.typed_string += event.char.lower()
         self.typed_string = self.typed_string[-20:]
         if "showmethemoney" in self.typed_string:
             self.player.add_cheat_resources()
             self.set_loot_text(self._("cheat_resources_added"))
-            self.update_display()
+            self.mark_dirty("resources")
             self.typed_string = ""
 
     def _setup_string_vars(self):
@@ -160,7 +204,7 @@ class RpgGui(ttk.Frame):
 
         self.portrait_label = ttk.Label(char_frame)
         self.portrait_label.grid(row=0, column=2, rowspan=7, sticky="nsew", padx=(20, 0))
-        self.load_image(self.player.image_path, self.portrait_label, (220, 280))
+        self.load_image(self.player.image_path, self.portrait_label, PORTRAIT_SIZE)
 
     def _create_actions_frame(self, parent):
         actions_frame = ttk.LabelFrame(parent, text=self._("actions"), padding="10")
@@ -194,7 +238,12 @@ class RpgGui(ttk.Frame):
         self.minigame_canvas = tk.Canvas(minigame_frame, width=240, height=300, relief="sunken", borderwidth=1)
         self.minigame_canvas.pack(expand=True, fill=tk.BOTH)
         self.minigame_canvas.bind("<Configure>", self._resize_minigame_background)
-        self.load_image("assets/minigame_background.png", self.minigame_canvas, is_background=True)
+        # One binding for all orbs; the clicked item is looked up in item_orbs.
+        self.minigame_canvas.tag_bind("orb", "<Button-1>", self._on_orb_item_click)
+        self.load_image(MINIGAME_BACKGROUND, self.minigame_canvas, is_background=True)
+
+        ttk.Checkbutton(minigame_frame, text=self._("high_density"), variable=self.high_density_var,
+                        command=self.toggle_high_density).pack(anchor=tk.W, pady=(5, 0))
 
     def _create_log_frame(self, parent):
         log_labelframe = ttk.LabelFrame(parent, text=self._("log"), padding="10")
@@ -208,10 +257,32 @@ class RpgGui(ttk.Frame):
         scrollbar.grid(row=0, column=1, sticky="ns")
 
     def _resize_minigame_background(self, event):
-        if hasattr(self, 'minigame_bg_img_original_pil'):
-            resized_pil = self.minigame_bg_img_original_pil.resize((event.width, event.height))
-            self.minigame_bg_img = ImageTk.PhotoImage(resized_pil)
-            self.minigame_canvas.create_image(0, 0, image=self.minigame_bg_img, anchor='nw')
+        """Draws a fast preview of the background while the canvas is resized and schedules the final render."""
+        if event.width < 2 or event.height < 2:
+            return
+        self.minigame_bg_size = (event.width, event.height)
+        if self.minigame_background is None:
+            return
+        if self.minigame_bg_resize_id:
+            self.after_cancel(self.minigame_bg_resize_id)
+        self.minigame_bg_resize_id = self.after(BACKGROUND_RESIZE_DEBOUNCE_MS, self._render_minigame_background)
+        now = time.time()
+        if now - self.minigame_bg_last_preview >= BACKGROUND_PREVIEW_INTERVAL:
+            self.minigame_bg_last_preview = now
+            self._show_minigame_background(fast=True)
+
+    def _render_minigame_background(self):
+        self.minigame_bg_resize_id = None
+        self._show_minigame_background(fast=False)
+
+    def _show_minigame_background(self, fast):
+        """Shows the background at the canvas size, reusing one canvas image item below the orbs."""
+        self.minigame_bg_img = self.minigame_background.get_photo(self.minigame_bg_size, fast)
+        if self.minigame_bg_item is None:
+            self.minigame_bg_item = self.minigame_canvas.create_image(0, 0, image=self.minigame_bg_img, anchor='nw')
+            self.minigame_canvas.tag_lower(self.minigame_bg_item)
+        else:
+            self.minigame_canvas.itemconfig(self.minigame_bg_item, image=self.minigame_bg_img)
 
     def _create_equipment_frame(self, parent):
         parent.columnconfigure(1, weight=1)
@@ -232,9 +303,10 @@ class RpgGui(ttk.Frame):
         self.inv_frame.columnconfigure(0, weight=1)
         self.inventory_listbox = tk.Listbox(self.inv_frame, bg="#2B2B2B", fg="white", selectbackground="#0078D7")
         self.inventory_listbox.grid(row=0, column=0, sticky="nsew")
-        scrollbar = ttk.Scrollbar(self.inv_frame, orient=tk.VERTICAL, command=self.inventory_listbox.yview)
-        self.inventory_listbox.config(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.inventory_scrollbar = ttk.Scrollbar(self.inv_frame, orient=tk.VERTICAL, command=self.inventory_listbox.yview)
+        self.inventory_listbox.config(yscrollcommand=self._on_inventory_scroll)
+        self.inventory_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.inventory_listbox.bind('<Configure>', lambda e: self._schedule_inventory_render())
         self.inventory_listbox.bind('<<ListboxSelect>>', self.update_button_states)
         self.inventory_listbox.bind('<Double-1>', self.on_item_double_click)
         self.tooltip = Tooltip(self.inventory_listbox, self.get_tooltip_text)
@@ -247,14 +319,43 @@ class RpgGui(ttk.Frame):
             text = f"{item.get_name(self.language)}\n"
             text += self._("tooltip_type", item_type=item_type, slot=self._(item.slot)) + "\n"
             text += self._("tooltip_value", value=format_currency(item.value)) + "\n\n"
-            for stat, value in item.stats_boost.items():
+            for stat, value in item.get_boost_items():
                 text += f"{self._(stat)}: +{value}\n"
             return text.strip()
         except (IndexError, tk.TclError):
             return ""
 
     def update_display(self):
-        class_name = self._(CLASSES[self.player.klasse]['name_key'])
+        """Schedules a redraw of the whole screen."""
+        self.mark_dirty(*RENDER_REGIONS)
+
+    def mark_dirty(self, *regions):
+        """
+        Marks parts of the screen as out of date. All regions marked before
+        Tk becomes idle are redrawn together, once, in a single callback.
+
+        Args:
+            *regions (str): Names from RENDER_REGIONS. Marks everything if omitted.
+        """
+        self._dirty_regions.update(regions or RENDER_REGIONS)
+        if self._render_id is None:
+            self._render_id = self.after_idle(self._flush_render)
+
+    def _flush_render(self):
+        self._render_id = None
+        regions, self._dirty_regions = self._dirty_regions, set()
+        if not self.winfo_exists():
+            return
+        if "stats" in regions: self.update_stats_display()
+        if "inventory" in regions: self.update_inventory_display()
+        if "bars" in regions: self.update_progress_bars()
+        if "resources" in regions: self.update_resources_display()
+        # After a game over the buttons stay as handle_game_over left them.
+        if "buttons" in regions and not self.game_over: self.update_button_states()
+
+    def update_stats_display(self):
+        translator = self.translator
+        class_name = translator[CLASSES[self.player.klasse]['name_key']]
         self.char_name_var.set(f"{self.player.name} ({class_name})")
         self.char_level_var.set(self.player.level)
         self.item_level_var.set(self.player.get_item_level())
@@ -262,7 +363,7 @@ class RpgGui(ttk.Frame):
         total_stats = self.player.get_total_stats()
 
         for stat, label in self.stat_labels.items():
-            label.config(text=f"{self._(stat)}:")
+            label.config(text=f"{translator[stat]}:")
         for stat, var in self.stats_vars.items():
             base, total = self.player.attributes.get(stat, 0), total_stats.get(stat, 0)
             bonus = total - base
@@ -270,20 +371,89 @@ class RpgGui(ttk.Frame):
 
         for slot, var in self.equipment_vars.items():
             item = self.player.equipment.get(slot)
-            var.set(item.get_name(self.language) if item else self._("empty_slot"))
-            self.slot_labels[slot].config(text=f"{self._(slot)}:")
-
-        self.inv_frame.config(text=self._("inventory_count", current=len(self.player.inventory), max=self.player.max_inventory_size))
-        self.inventory_listbox.delete(0, tk.END)
-        for i, item in enumerate(self.player.inventory):
+            var.set(item.get_name(self.language) if item else translator["empty_slot"])
+            self.slot_labels[slot].config(text=f"{translator[slot]}:")
+
+    def update_inventory_display(self):
+        """
+        Brings the inventory listbox in line with the player's inventory.
+
+        Only the rows that changed since the last call are replaced: items
+        added or removed are found by comparing the common start and end of
+        the old and new item lists, and the rows in between are replaced by
+        placeholders. The placeholders and stale rows are then rendered for
+        the visible part of the list only. Scroll position and selection are
+        kept.
+        """
+        listbox = self.inventory_listbox
+        inventory = self.player.inventory
+        self.inv_frame.config(text=self._("inventory_count", current=len(inventory), max=self.player.max_inventory_size))
+
+        old_rows, new_rows = self._inventory_rows, list(inventory)
+        common = min(len(old_rows), len(new_rows))
+        prefix = 0
+        while prefix < common and old_rows[prefix] is new_rows[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < common - prefix and old_rows[-1 - suffix] is new_rows[-1 - suffix]:
+            suffix += 1
+
+        old_end, new_end = len(old_rows) - suffix, len(new_rows) - suffix
+        if old_end > prefix or new_end > prefix:
+            selected_item = self._get_selected_inventory_item()
+            top_item = old_rows[listbox.nearest(0)] if old_rows else None
+            if old_end > prefix:
+                listbox.delete(prefix, old_end - 1)
+            if new_end > prefix:
+                listbox.insert(prefix, *[INVENTORY_PLACEHOLDER_TEXT] * (new_end - prefix))
+            self._inventory_rows = new_rows
+            self._inventory_row_states[prefix:old_end] = [None] * (new_end - prefix)
+
+            if top_item is not None and top_item in new_rows:
+                listbox.yview(new_rows.index(top_item))
+            listbox.selection_clear(0, tk.END)
+            if selected_item is not None and selected_item in new_rows:
+                listbox.selection_set(new_rows.index(selected_item))
+
+        self._render_visible_inventory_rows()
+
+    def _get_selected_inventory_item(self):
+        selected = self.inventory_listbox.curselection()
+        return self._inventory_rows[selected[0]] if selected and selected[0] < len(self._inventory_rows) else None
+
+    def _on_inventory_scroll(self, first, last):
+        self.inventory_scrollbar.set(first, last)
+        self._schedule_inventory_render()
+
+    def _schedule_inventory_render(self):
+        if not self._inventory_render_pending:
+            self._inventory_render_pending = True
+            self.after_idle(self._render_visible_inventory_rows)
+
+    def _render_visible_inventory_rows(self):
+        """Renders the placeholder and stale rows in and around the visible part of the listbox."""
+        self._inventory_render_pending = False
+        listbox, rows, states = self.inventory_listbox, self._inventory_rows, self._inventory_row_states
+        if len(rows) > INVENTORY_VIRTUALIZE_THRESHOLD:
+            first = max(0, listbox.nearest(0) - INVENTORY_RENDER_MARGIN)
+            last = min(len(rows), listbox.nearest(listbox.winfo_height()) + INVENTORY_RENDER_MARGIN + 1)
+        else:
+            first, last = 0, len(rows)
+
+        upgrade_flags = self.player.get_upgrade_flags(first, last)
+        selected = set(listbox.curselection())
+        for index in range(first, last):
+            item = rows[index]
+            state = (item.upgrade_level, upgrade_flags[index - first])
+            if states[index] == state:
+                continue
             item_text = item.to_string(self.language)
-            self.inventory_listbox.insert(tk.END, f"⭐ {item_text}" if self.player.is_upgrade(item) else item_text)
-            self.inventory_listbox.itemconfig(i, {'fg': item.color})
-
-        self.update_progress_bars()
-        self.update_resources_display()
-        self.update_button_states()
-        self.update_idletasks()
+            listbox.delete(index)
+            listbox.insert(index, f"⭐ {item_text}" if state[1] else item_text)
+            listbox.itemconfig(index, {'fg': item.color})
+            if index in selected:
+                listbox.selection_set(index)
+            states[index] = state
 
     def update_progress_bars(self):
         lp_val = (self.player.current_lp / self.player.max_lp) * 100 if self.player.max_lp > 0 else 0
@@ -338,6 +508,7 @@ class RpgGui(ttk.Frame):
 
     def toggle_auto_quest(self):
         self.is_auto_questing = not self.is_auto_questing
+        self.player.auto_questing = self.is_auto_questing
         self.auto_quest_button.config(text=self._("stop_auto_quest" if self.is_auto_questing else "start_auto_quest"))
         self.set_loot_text(self._("auto_quest_active" if self.is_auto_questing else "auto_quest_stopped"))
         if self.is_auto_questing: self.start_quest()
@@ -346,84 +517,108 @@ class RpgGui(ttk.Frame):
         self.minigame_running = not self.minigame_running
         self.minigame_toggle_button.config(text=self._("stop_resource_hunt" if self.minigame_running else "start_resource_hunt"))
         if self.minigame_running:
-            self.last_orb_spawn_time, self.next_orb_spawn_delay = 0, random.uniform(0.5, 1.5)
+            self.resource_hunt.start(time.time())
             self.run_minigame_loop()
         else:
-            if self.minigame_loop_id: self.master.after_cancel(self.minigame_loop_id)
-            for orb_id in list(self.minigame_orbs.keys()): self.minigame_canvas.delete(orb_id)
-            self.minigame_orbs.clear()
+            if self.minigame_loop_id: self.master.after_cancel(self.minigame_loop_id); self.minigame_loop_id = None
+            for orb in self.resource_hunt.stop(): self._release_orb_item(orb.orb_id)
+
+    def toggle_high_density(self):
+        self.resource_hunt.set_high_density(self.high_density_var.get(), time.time())
+        if self.minigame_running:
+            self.run_minigame_loop()
 
     def run_minigame_loop(self):
+        """Updates the orbs and sleeps until the next spawn or expiry is due."""
+        if self.minigame_loop_id: self.master.after_cancel(self.minigame_loop_id)
+        self.minigame_loop_id = None
         self.update_minigame()
-        self.minigame_loop_id = self.master.after(150, self.run_minigame_loop)
+        wakeup = self.resource_hunt.next_wakeup()
+        if self.minigame_running and wakeup is not None:
+            delay_ms = max(1, int((wakeup - time.time()) * 1000) + 1)
+            self.minigame_loop_id = self.master.after(delay_ms, self.run_minigame_loop)
 
     def start_quest(self):
-        if self.current_quest:
+        if self.engine.current_quest:
             if not self.is_auto_questing: messagebox.showwarning(self._("quest_active"), self._("quest_active_msg"))
             return
-        if len(self.player.inventory) >= self.player.max_inventory_size:
+        if self.engine.is_inventory_full():
             self.set_loot_text(self._("inventory_full_auto_quest_stopped"))
             messagebox.showinfo(self._("inventory_full"), self._("inventory_full_msg"))
             if self.is_auto_questing: self.toggle_auto_quest()
             return
 
-        quest_data = random.choice(AVAILABLE_QUESTS)
-        self.load_image(quest_data["image"], self.quest_image_label, (300, 200))
-        self.current_quest = Quest(self._(quest_data["name"]))
+        quest_data = self.engine.start_quest()
+        self.load_image(quest_data["image"], self.quest_image_label, QUEST_IMAGE_SIZE)
         self.quest_log.config(state=tk.NORMAL); self.quest_log.delete("1.0", tk.END); self.quest_log.config(state=tk.DISABLED)
-        self.add_to_log(self.current_quest.travel_text)
+        self.add_to_log(self.engine.current_quest.travel_text)
         self.progress_bar['value'] = 0
-        self.update_display()
+        self.mark_dirty("bars", "buttons")
         self.advance_quest()
 
     def update_minigame(self):
         if not self.minigame_running: return
-        now = time.time()
-        for orb_id in [oid for oid, data in self.minigame_orbs.items() if now - data['spawn_time'] > data['lifespan']]:
-            self.minigame_canvas.delete(orb_id); del self.minigame_orbs[orb_id]
-
-        if now - self.last_orb_spawn_time > self.next_orb_spawn_delay and self.minigame_canvas.winfo_width() > 1:
-            x, y = random.randint(10, self.minigame_canvas.winfo_width() - 10), random.randint(10, self.minigame_canvas.winfo_height() - 10)
-            res_key, symbol = ("iron_ore", "🪨") if random.random() < 0.8 else ("jewel", "💎")
-            orb_id = self.minigame_canvas.create_text(x, y, text=symbol, font=("", 14))
-            self.minigame_canvas.tag_bind(orb_id, "<Button-1>", lambda e, o=orb_id: self.on_orb_click(o))
-            self.minigame_orbs[orb_id] = {'spawn_time': now, 'lifespan': random.uniform(2, 3), 'resource': res_key}
-            self.last_orb_spawn_time, self.next_orb_spawn_delay = now, random.uniform(2, 5)
+        expired, spawned = self.resource_hunt.advance(time.time(), self.minigame_canvas.winfo_width(),
+                                                      self.minigame_canvas.winfo_height())
+        for orb in expired:
+            self._release_orb_item(orb.orb_id)
+        for orb in spawned:
+            if self.orb_item_pool:
+                item = self.orb_item_pool.pop()
+                self.minigame_canvas.coords(item, orb.x, orb.y)
+                self.minigame_canvas.itemconfig(item, text=orb.symbol, font=ORB_FONT, state=tk.NORMAL)
+            else:
+                item = self.minigame_canvas.create_text(orb.x, orb.y, text=orb.symbol, font=ORB_FONT, tags=("orb",))
+            self.orb_items[orb.orb_id] = item
+            self.item_orbs[item] = orb.orb_id
+
+    def _release_orb_item(self, orb_id):
+        """Hides an orb's canvas item and returns it to the pool."""
+        item = self.orb_items.pop(orb_id, None)
+        if item is None: return
+        del self.item_orbs[item]
+        self.minigame_canvas.itemconfig(item, state=tk.HIDDEN)
+        self.orb_item_pool.append(item)
+
+    def _on_orb_item_click(self, event):
+        item = self.minigame_canvas.find_withtag(tk.CURRENT)
+        if item and item[0] in self.item_orbs:
+            self.on_orb_click(self.item_orbs[item[0]])
 
     def on_orb_click(self, orb_id):
-        if orb_id not in self.minigame_orbs: return
-        res_data = self.minigame_orbs.pop(orb_id)
-        self.player.add_resource(res_data['resource'], 1)
-        start_time, duration, i_size, m_size = time.time(), 0.3, 14, 24
+        orb = self.resource_hunt.collect(orb_id)
+        if orb is None: return
+        self.player.add_resource(orb.resource, 1)
+        # The item leaves item_orbs, so it can't be clicked again while it pulses.
+        item = self.orb_items.pop(orb_id)
+        del self.item_orbs[item]
+        start_time, i_size, m_size = time.time(), ORB_FONT[1], ORB_PULSE_FONT_SIZE
         def pulse():
-            elapsed, p = time.time() - start_time, min((time.time() - start_time) / duration, 1.0)
+            p = min((time.time() - start_time) / ORB_PULSE_SECONDS, 1.0)
             size = int(i_size + (m_size - i_size) * (p*2 if p<0.5 else (1-p)*2))
-            try: self.minigame_canvas.itemconfig(orb_id, font=("", size))
+            try: self.minigame_canvas.itemconfig(item, font=("", size))
             except tk.TclError: return
             if p < 1.0: self.after(15, pulse)
             else:
-                try: self.minigame_canvas.delete(orb_id)
-                except tk.TclError: pass
-                self.update_display()
+                self.minigame_canvas.itemconfig(item, state=tk.HIDDEN)
+                self.orb_item_pool.append(item)
+                self.mark_dirty("resources")
         pulse()
 
     def advance_quest(self):
-        if self.current_quest is None: return
-        old_phase = self.current_quest.phase
-        event_message = self.current_quest.advance(self.player)
-        if self.current_quest.phase != old_phase and getattr(self.current_quest, self.current_quest.phase.lower() + "_text", ""):
-            self.add_to_log(getattr(self.current_quest, self.current_quest.phase.lower() + "_text"))
-        if event_message: self.add_to_log(event_message)
-
-        if self.player.current_lp <= 0: self.handle_game_over(death_by_boss=False); return
-        if self.player.current_lp / self.player.max_lp < 0.1 and self.is_auto_questing:
+        quest = self.engine.current_quest
+        if quest is None: return
+        result = self.engine.advance()
+        if result["phase_text"]: self.add_to_log(result["phase_text"])
+        if result["event"]: self.add_to_log(result["event"])
+
+        if result["game_over"]: self.handle_game_over(death_by_boss=False); return
+        if result["low_health"] and self.is_auto_questing:
             self.toggle_auto_quest(); messagebox.showwarning(self._("low_health"), self._("low_health_msg"))
 
-        if self.current_quest.is_complete():
-            gold, xp, item = self.current_quest.generate_reward(self.player)
-            status, rec_item = self.player.add_loot(gold, item)
-            lvl_info = self.player.add_xp(xp)
-
+        loot = result["loot"]
+        if loot:
+            gold, xp, status, rec_item = loot["copper"], loot["xp"], loot["status"], loot["item"]
             loot_msg = f"{self._('loot')}: {format_currency(gold)}, {xp} XP"
             if rec_item:
                 rec_item_name = rec_item.get_name(self.language)
@@ -433,33 +628,33 @@ class RpgGui(ttk.Frame):
                 elif status == "auto_equipped": loot_msg += f" {self._('and')} '{rec_item_name}' ({self._('auto_equipped')})"
             self.set_loot_text(loot_msg)
 
-            if lvl_info:
+            if loot["level_ups"]:
                 self.pause_quest_loop()
                 CountdownDialog(self, title=self._("level_up_title"),
-                                message=self._("level_up_msg", level=self.player.level, bonuses="\n".join(lvl_info)),
+                                message=self._("level_up_msg", level=self.player.level, bonuses="\n".join(loot["level_ups"])),
                                 on_close_callback=self.resume_quest_loop, language=self.language)
 
-            self.current_quest = None
             self.progress_bar['value'] = 0
             self.load_image(None, self.quest_image_label) # Clear image
-            if self.is_auto_questing: self.master.after(1000, self.start_quest)
+            if self.is_auto_questing: self.master.after(QUEST_RESTART_DELAY_MS, self.start_quest)
+            self.mark_dirty("stats", "inventory", "bars", "buttons")
         else:
-            self.progress_bar['value'] = (self.current_quest.progress / self.current_quest.duration) * 100
-            self.quest_loop_id = self.master.after(150, self.advance_quest)
-        self.update_display()
+            self.progress_bar['value'] = (quest.progress / quest.duration) * 100
+            self.quest_loop_id = self.master.after(QUEST_TICK_MS, self.advance_quest)
+            self.mark_dirty("bars")
 
     def pause_quest_loop(self):
         if self.quest_loop_id: self.master.after_cancel(self.quest_loop_id); self.quest_loop_id = None
 
     def resume_quest_loop(self):
-        if self.current_quest and not self.quest_loop_id: self.advance_quest()
+        if self.engine.current_quest and not self.quest_loop_id: self.advance_quest()
 
     def _manage_item(self, action):
         selected = self.inventory_listbox.curselection()
         if not selected: return
         success, message = action(selected[0])
         if not success: messagebox.showwarning(self._("error"), message, parent=self)
-        self.update_display()
+        self.mark_dirty("stats", "inventory", "bars", "buttons")
 
     def equip_item(self): self._manage_item(lambda i: self.player.equip(i) or (True, ""))
     def use_item(self): self._manage_item(self.player.use_item)
@@ -471,7 +666,7 @@ class RpgGui(ttk.Frame):
         elif item.item_type == "consumable": self.use_item()
 
     def update_button_states(self, e=None):
-        is_questing = self.current_quest is not None
+        is_questing = self.engine.current_quest is not None
         selected = self.inventory_listbox.curselection()
         self.quest_button.config(state=tk.DISABLED if is_questing else tk.NORMAL)
         self.trader_button.config(state=tk.DISABLED if is_questing else tk.NORMAL)
@@ -526,12 +721,12 @@ class RpgGui(ttk.Frame):
     def on_boss_arena_close(self):
         self.update_display()
         if self.player.current_lp <= 0: self.handle_game_over(death_by_boss=True); return
-        self.resume_quest_loop(); self.update_button_states()
+        self.resume_quest_loop(); self.mark_dirty("buttons")
 
     def handle_game_over(self, death_by_boss=False):
         self.game_over = True
-        save_highscore(self.player)
-        self.load_image("assets/grabstein.png", self.portrait_label, (220, 280))
+        submit_highscore(self.player)
+        self.load_image(TOMBSTONE_IMAGE, self.portrait_label, PORTRAIT_SIZE)
         for btn in [self.quest_button, self.auto_quest_button, self.trader_button, self.equip_button, self.use_button]:
             btn.config(state=tk.DISABLED)
         GameOverWindow(self, self.player, on_close_callback=lambda: self.callbacks['game_over'](death_by_boss=death_by_boss),
@@ -551,14 +746,13 @@ class RpgGui(ttk.Frame):
                 if hasattr(widget, 'placeholder_image'): widget.config(image=widget.placeholder_image)
                 else: widget.config(image='')
                 return
-            img = Image.open(path)
-            if size: img.thumbnail(size)
-
             if is_background:
-                widget.minigame_bg_img_original_pil = img
-                self._resize_minigame_background(tk.Event()) # Initial draw
+                # The cached image is shared; ScaledImage only reads it.
+                self.minigame_background = ScaledImage(get_image_cache().get_pil(path, size))
+                if self.minigame_bg_size: # Initial draw, if the canvas was already laid out
+                    self._show_minigame_background(fast=False)
             else:
-                photo_img = ImageTk.PhotoImage(img)
+                photo_img = get_image_cache().get_photo(path, size)
                 widget.config(image=photo_img)
                 widget.image = photo_img
         except Exception as e:
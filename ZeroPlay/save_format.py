@@ -0,0 +1,284 @@
+# save_format.py
+"""
+Defines the compact, versioned binary save format.
+
+A save file consists of a fixed header, a section table and the sections:
+
+    magic (4s) | version (H) | section count (H)
+    section count x [ tag (4s) | flags (B) | offset (I) | length (I) ]
+    section payloads
+
+Every section can be decoded on its own, so tools can, for example, read
+only the header section to list characters without loading any items.
+
+    HEAD  JSON: name, class, level, rebirths, bosses, copper, attributes, last save time,
+          the schema version of the character data (see save_migrations) and the
+          sequence number of the last journal record the save includes
+    CORE  JSON: all remaining scalar character fields
+    EQUP  Item table of the equipped items, one row per equipment slot
+    INVT  Item table of the inventory
+    RSRC  JSON: the character's resources
+
+An item table starts with a JSON lookup table of the blueprints, rarities
+and consumable effects used in this section, followed by one fixed-size row
+per item: blueprint index, rarity index, the four stats, upgrade level,
+base value, boss flag and effect index.
+"""
+import json
+import struct
+import zlib
+
+from character import Character
+from item import Item, get_blueprint, RARITY_RECORDS
+from save_migrations import SCHEMA_VERSION
+from stat_block import StatBlock
+
+MAGIC = b"ZPSV"
+FORMAT_VERSION = 1
+
+HEADER_STRUCT = struct.Struct("<4sHH")
+SECTION_STRUCT = struct.Struct("<4sBII")
+# blueprint, rarity, 4 stats, upgrade level, base value, boss flag, effect (0 = none)
+ITEM_STRUCT = struct.Struct("<HB4iBIBH")
+TABLE_LENGTH_STRUCT = struct.Struct("<I")
+
+SECTION_COMPRESSED = 0x01
+EMPTY_SLOT = 0xFFFF
+
+HEADER_FIELDS = ("name", "klasse", "level", "rebirths", "bosses_defeated", "copper", "attributes", "last_saved_at")
+# Character fields that are stored in their own sections or not at all.
+NON_CORE_FIELDS = {"inventory", "equipment", "resources"}
+
+
+def build_core(character):
+    """
+    Returns all character fields that are not part of the header or stored
+    in their own sections, as JSON-compatible values.
+    """
+    return {
+        key: _to_json_value(value)
+        for key, value in character.__getstate__().items()
+        if key not in NON_CORE_FIELDS and key not in HEADER_FIELDS
+    }
+
+
+def item_to_record(item):
+    """Returns a JSON-compatible list describing an item, used by the save journal."""
+    blueprint = item.blueprint
+    stats = item.base_stats.values() if isinstance(item.base_stats, StatBlock) else dict(item.base_stats)
+    return [blueprint.name_key, blueprint.gender, blueprint.item_type, blueprint.slot, blueprint.armor_type,
+            item.rarity.key, stats, item.upgrade_level, item.base_value, item.is_boss_item_flag]
+
+
+def item_from_record(record):
+    """Rebuilds an item from item_to_record's output."""
+    name_key, gender, item_type, slot, armor_type, rarity_key, stats, upgrade_level, base_value, is_boss = record
+    base_stats = StatBlock(stats) if isinstance(stats, list) else stats
+    return Item.from_record(get_blueprint(name_key, gender, item_type, slot, armor_type), RARITY_RECORDS[rarity_key],
+                            base_stats, base_value, upgrade_level, is_boss)
+
+
+def build_header(character):
+    """
+    Builds the summary stored in the header section.
+
+    Returns:
+        dict: The character's HEADER_FIELDS as JSON-compatible values.
+    """
+    return {field: _to_json_value(getattr(character, field, None)) for field in HEADER_FIELDS}
+
+
+def _to_json_value(value):
+    return value.to_dict() if isinstance(value, StatBlock) else value
+
+
+def is_binary_save(data):
+    """Checks if the given bytes start like a save in this format."""
+    return data[:len(MAGIC)] == MAGIC
+
+
+# --- Encoding ---
+def encode_character(character, compress=True, journal_seq=0):
+    """
+    Serializes a character into the binary save format.
+
+    Args:
+        character (Character): The character to save.
+        compress (bool): Whether to zlib-compress the sections.
+        journal_seq (int): The sequence number of the last journal record included in this save.
+
+    Returns:
+        bytes: The complete save file.
+    """
+    header = build_header(character)
+    header["schema_version"] = SCHEMA_VERSION
+    header["journal_seq"] = journal_seq
+    core = build_core(character)
+    sections = [
+        (b"HEAD", _encode_json(header)),
+        (b"CORE", _encode_json(core)),
+        (b"EQUP", _encode_equipment(character.equipment)),
+        (b"INVT", _encode_items(list(character.inventory))),
+        (b"RSRC", _encode_json(character.resources)),
+    ]
+
+    offset = HEADER_STRUCT.size + SECTION_STRUCT.size * len(sections)
+    table, payloads = [], []
+    for tag, payload in sections:
+        flags = 0
+        # The header section is always stored raw so it can be read cheaply.
+        if compress and tag != b"HEAD":
+            payload = zlib.compress(payload)
+            flags |= SECTION_COMPRESSED
+        table.append(SECTION_STRUCT.pack(tag, flags, offset, len(payload)))
+        payloads.append(payload)
+        offset += len(payload)
+    return HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, len(sections)) + b"".join(table) + b"".join(payloads)
+
+
+def _encode_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _encode_equipment(equipment):
+    slots = list(equipment.keys())
+    return _encode_items([equipment[slot] for slot in slots], slots=slots)
+
+
+def _encode_items(items, slots=None):
+    """Encodes a list of items (None for empty equipment slots) as an item table."""
+    blueprints, rarities, effects = {}, {}, {}
+    rows = []
+    for item in items:
+        if item is None:
+            rows.append(ITEM_STRUCT.pack(EMPTY_SLOT, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+            continue
+        blueprint_id = blueprints.setdefault(item.blueprint, len(blueprints))
+        rarity_id = rarities.setdefault(item.rarity.key, len(rarities))
+        if isinstance(item.base_stats, StatBlock):
+            stats, effect_id = item.base_stats.values(), 0
+        else:
+            effect_key = json.dumps(item.base_stats, sort_keys=True)
+            stats, effect_id = (0, 0, 0, 0), effects.setdefault(effect_key, len(effects)) + 1
+        rows.append(ITEM_STRUCT.pack(blueprint_id, rarity_id, *stats, item.upgrade_level,
+                                     item.base_value, item.is_boss_item_flag, effect_id))
+
+    lookup = {
+        "blueprints": [list(blueprint[:5]) for blueprint in blueprints],
+        "rarities": list(rarities),
+        "effects": [json.loads(effect) for effect in effects],
+    }
+    if slots is not None:
+        lookup["slots"] = slots
+    table = _encode_json(lookup)
+    return TABLE_LENGTH_STRUCT.pack(len(table)) + table + b"".join(rows)
+
+
+# --- Decoding ---
+def read_section_table(data):
+    """
+    Reads the file header and section table.
+
+    Args:
+        data (bytes): At least the beginning of a save file.
+
+    Returns:
+        dict: The tag of every section (e.g. "INVT") mapped to its (flags, offset, length).
+
+    Raises:
+        ValueError: If the data is not a save in a supported version.
+    """
+    if not is_binary_save(data):
+        raise ValueError("Kein gültiger Spielstand.")
+    _, version, section_count = HEADER_STRUCT.unpack_from(data, 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Spielstand-Version {version} wird nicht unterstützt.")
+    sections = {}
+    for index in range(section_count):
+        tag, flags, offset, length = SECTION_STRUCT.unpack_from(data, HEADER_STRUCT.size + index * SECTION_STRUCT.size)
+        sections[tag.decode("ascii")] = (flags, offset, length)
+    return sections
+
+
+def read_section(data, tag, sections=None):
+    """Returns the raw, decompressed payload of a single section."""
+    sections = sections if sections is not None else read_section_table(data)
+    flags, offset, length = sections[tag]
+    payload = bytes(data[offset:offset + length])
+    return zlib.decompress(payload) if flags & SECTION_COMPRESSED else payload
+
+
+def read_header(path):
+    """
+    Reads only the header section of a save file, without loading any items.
+
+    Returns:
+        dict: The header fields (see HEADER_FIELDS).
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(HEADER_STRUCT.size)
+        section_count = HEADER_STRUCT.unpack_from(prefix, 0)[2] if is_binary_save(prefix) else 0
+        prefix += f.read(SECTION_STRUCT.size * section_count)
+        flags, offset, length = read_section_table(prefix)["HEAD"]
+        f.seek(offset)
+        payload = f.read(length)
+    return json.loads(zlib.decompress(payload) if flags & SECTION_COMPRESSED else payload)
+
+
+def decode_header(data):
+    """Decodes the header section of a complete save file, including its schema version and journal position."""
+    return json.loads(read_section(data, "HEAD"))
+
+
+def decode_items(payload):
+    """
+    Decodes an item table section.
+
+    Returns:
+        tuple: The list of items (None for empty slots) and the lookup table.
+    """
+    table_length = TABLE_LENGTH_STRUCT.unpack_from(payload, 0)[0]
+    table_end = TABLE_LENGTH_STRUCT.size + table_length
+    lookup = json.loads(payload[TABLE_LENGTH_STRUCT.size:table_end])
+    blueprints = [get_blueprint(*fields) for fields in lookup["blueprints"]]
+    rarities = [RARITY_RECORDS[key] for key in lookup["rarities"]]
+    effects = lookup["effects"]
+
+    items = []
+    for blueprint_id, rarity_id, s0, s1, s2, s3, upgrade_level, base_value, is_boss, effect_id in \
+            ITEM_STRUCT.iter_unpack(payload[table_end:]):
+        if blueprint_id == EMPTY_SLOT:
+            items.append(None)
+            continue
+        base_stats = dict(effects[effect_id - 1]) if effect_id else StatBlock((s0, s1, s2, s3))
+        items.append(Item.from_record(blueprints[blueprint_id], rarities[rarity_id], base_stats,
+                                      base_value, upgrade_level, bool(is_boss)))
+    return items, lookup
+
+
+def decode_character(data):
+    """
+    Rebuilds a character from a save in the binary format.
+
+    Args:
+        data (bytes): The complete save file.
+
+    Returns:
+        Character: The loaded character.
+    """
+    sections = read_section_table(data)
+    state = json.loads(read_section(data, "HEAD", sections))
+    state.pop("schema_version", None)
+    state.pop("journal_seq", None)
+    state.update(json.loads(read_section(data, "CORE", sections)))
+    for name in ("base_attributes", "attributes"):
+        state[name] = StatBlock.from_dict(state[name])
+
+    equipped_items, lookup = decode_items(read_section(data, "EQUP", sections))
+    state["equipment"] = dict(zip(lookup["slots"], equipped_items))
+    state["inventory"], _ = decode_items(read_section(data, "INVT", sections))
+    state["resources"] = json.loads(read_section(data, "RSRC", sections))
+
+    character = Character.__new__(Character)
+    character.__setstate__(state)
+    return character
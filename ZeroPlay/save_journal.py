@@ -0,0 +1,197 @@
+# save_journal.py
+"""
+Defines the save journal: an append-only file of changes made to a character
+since its last full save.
+
+Every line of a journal is one JSON record with a sequence number 'seq', the
+time it was written and a 'type':
+
+    core        {"fields": {...}}                changed scalar character fields
+    resources   {"resources": {...}}             the complete resources dictionary
+    equipment   {"slots": {slot: item or null}}  changed equipment slots
+    inventory   {"start": i, "delete": n, "insert": [items]}
+                                                 replaces n items at index i
+
+Items are stored as save_format.item_to_record lists. A full save records
+the sequence number of the last record it includes, so on load only the
+records after it are replayed.
+"""
+import json
+import os
+
+from save_format import build_core, build_header, item_to_record, item_from_record
+from stat_block import StatBlock
+
+# Core fields the journal does not track: the save time is taken from the records themselves.
+UNTRACKED_CORE_FIELDS = {"last_saved_at"}
+
+
+class ChangeTracker:
+    """
+    Remembers the state of a character and turns everything that changed
+    since into journal records. Runs on the thread that owns the character
+    and never touches the disk.
+    """
+
+    def __init__(self, character):
+        """
+        Initializes the tracker with the character's current state as the baseline.
+
+        Args:
+            character (Character): The character to watch.
+        """
+        self.character = character
+        self.reset()
+
+    def reset(self):
+        """Takes the character's current state as the new baseline."""
+        self._core = self._core_fields()
+        self._resources = dict(self.character.resources)
+        self._equipment = {slot: _item_version(item) for slot, item in self.character.equipment.items()}
+        self._inventory = [_item_version(item) for item in self.character.inventory]
+
+    def _core_fields(self):
+        # The header fields are part of the core state as far as the journal is concerned.
+        core = build_core(self.character)
+        core.update(build_header(self.character))
+        for field in UNTRACKED_CORE_FIELDS:
+            core.pop(field, None)
+        # Round-trip through JSON so no record shares a list or dict with the live character.
+        return json.loads(json.dumps(core))
+
+    def collect(self):
+        """
+        Returns the records for everything that changed since the last call
+        and takes the current state as the new baseline.
+
+        Returns:
+            list: Journal records without 'seq' and 'time'.
+        """
+        records = []
+        character = self.character
+
+        core = self._core_fields()
+        changed = {key: value for key, value in core.items() if self._core.get(key) != value}
+        if changed:
+            records.append({"type": "core", "fields": changed})
+        self._core = core
+
+        if character.resources != self._resources:
+            self._resources = dict(character.resources)
+            records.append({"type": "resources", "resources": self._resources})
+
+        equipment = {slot: _item_version(item) for slot, item in character.equipment.items()}
+        changed_slots = {
+            slot: item_to_record(character.equipment[slot]) if version else None
+            for slot, version in equipment.items()
+            if not _same_version(version, self._equipment.get(slot))
+        }
+        if changed_slots:
+            records.append({"type": "equipment", "slots": changed_slots})
+        self._equipment = equipment
+
+        inventory = [_item_version(item) for item in character.inventory]
+        old = self._inventory
+        common = min(len(old), len(inventory))
+        prefix = 0
+        while prefix < common and _same_version(old[prefix], inventory[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < common - prefix and _same_version(old[-1 - suffix], inventory[-1 - suffix]):
+            suffix += 1
+        old_end, new_end = len(old) - suffix, len(inventory) - suffix
+        if old_end > prefix or new_end > prefix:
+            records.append({
+                "type": "inventory", "start": prefix, "delete": old_end - prefix,
+                "insert": [item_to_record(item) for item in character.inventory[prefix:new_end]],
+            })
+        self._inventory = inventory
+        return records
+
+
+def _item_version(item):
+    """Identifies an item together with its upgrade level, the only part of an item that changes."""
+    return (item, item.upgrade_level) if item else None
+
+
+def _same_version(a, b):
+    if a is None or b is None:
+        return a is b
+    return a[0] is b[0] and a[1] == b[1]
+
+
+def apply_record(character, record):
+    """Applies a single journal record to a character."""
+    record_type = record["type"]
+    if record_type == "core":
+        for key, value in record["fields"].items():
+            if key in ("attributes", "base_attributes"):
+                value = StatBlock.from_dict(value)
+            setattr(character, key, value)
+    elif record_type == "resources":
+        character.resources = dict(record["resources"])
+    elif record_type == "equipment":
+        for slot, item in record["slots"].items():
+            character.equipment[slot] = item_from_record(item) if item else None
+    elif record_type == "inventory":
+        start = record["start"]
+        character.inventory[start:start + record["delete"]] = [item_from_record(item) for item in record["insert"]]
+    character.invalidate_stats_cache()
+
+
+def read_records(path, after_seq=0):
+    """
+    Reads the records of a journal file.
+
+    A torn last line, as left by a crash during a write, ends the journal.
+
+    Args:
+        path (str): The journal file.
+        after_seq (int): Only records with a higher sequence number are returned.
+
+    Returns:
+        list: The records in order.
+    """
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record.get("seq", 0) > after_seq:
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+
+def last_seq(path):
+    """Returns the sequence number of the last complete record in a journal, or 0."""
+    records = read_records(path)
+    return records[-1]["seq"] if records else 0
+
+
+def replay(character, path, after_seq=0):
+    """
+    Applies all journal records newer than after_seq to a character.
+
+    Returns:
+        int: The number of records applied.
+    """
+    records = read_records(path, after_seq)
+    for record in records:
+        apply_record(character, record)
+    if records:
+        character.last_saved_at = records[-1].get("time", character.last_saved_at)
+    return len(records)
+
+
+def append_records(path, records):
+    """Appends records to a journal and makes sure they reached the disk."""
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
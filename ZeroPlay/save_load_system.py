@@ -1,34 +1,169 @@
 # save_load_system.py
 """
-Handles saving and loading of game states using pickle.
+Handles saving and loading of game states. Games are saved in the binary
+format from save_format; older pickled saves can still be loaded. Saves of
+an older schema are migrated once and written back, and changes journaled
+by the autosave since the last save are replayed on load.
+
+By default every character is kept in its own .sav file. Setting the
+environment variable ZEROPLAY_SAVE_BACKEND=sqlite keeps all characters in
+one SQLite database instead (see character_store); all functions below work
+the same with either backend.
 """
+import json
 import os
 import pickle
-from game_data import CLASSES
+import threading
+import time
+import save_journal
+from character_store import CharacterStore
+from save_format import encode_character, decode_character, decode_header, is_binary_save, build_header, read_header
+from save_migrations import migrate, PICKLE_SCHEMA_VERSION, UNVERSIONED_SCHEMA_VERSION
 
 SAVE_DIR = "saves"
+INDEX_FILE = os.path.join(SAVE_DIR, "index.json")
+INDEX_VERSION = 1
+# "files" keeps one .sav file per character, "sqlite" keeps all characters in SAVE_DATABASE.
+SAVE_BACKEND = os.environ.get("ZEROPLAY_SAVE_BACKEND", "files")
+SAVE_DATABASE = os.path.join(SAVE_DIR, "characters.db")
+
+# The last index read from disk, with the mtimes of SAVE_DIR and INDEX_FILE it was read at.
+_index_cache = {"key": None, "saves": {}}
+# Saves are also written by the autosave thread.
+_index_lock = threading.RLock()
+_store = None
+_store_lock = threading.Lock()
 
-def save_game(character):
+def _get_store():
     """
-    Saves the character object to a file.
+    Returns the CharacterStore if the SQLite backend is active, otherwise None.
+    When the database is created, all existing save files are imported into it.
+    """
+    global _store
+    if SAVE_BACKEND != "sqlite":
+        return None
+    with _store_lock:
+        if _store is None:
+            if not os.path.exists(SAVE_DIR):
+                os.makedirs(SAVE_DIR)
+            is_new = not os.path.exists(SAVE_DATABASE)
+            _store = CharacterStore(SAVE_DATABASE)
+            if is_new:
+                _import_save_files(_store)
+        return _store
+
+def _import_save_files(store):
+    """Copies every save file into the store. The files themselves are kept."""
+    if not os.path.exists(SAVE_DIR):
+        return
+    for entry in os.scandir(SAVE_DIR):
+        if not entry.name.endswith(".sav") or not entry.is_file():
+            continue
+        name = entry.name[:-len(".sav")]
+        try:
+            with open(entry.path, 'rb') as f:
+                character, journal_seq, _ = _read_character(f.read())
+            save_journal.replay(character, get_journal_path(name), journal_seq)
+            journal_seq = max(journal_seq, save_journal.last_seq(get_journal_path(name)))
+            store.save(name, _build_summary(character, journal_seq),
+                       encode_character(character, journal_seq=journal_seq))
+        except Exception as e:
+            print(f"Fehler beim Übernehmen von {name} in die Datenbank: {e}")
+
+def get_save_path(character_name):
+    """Returns the path of a character's save file."""
+    return os.path.join(SAVE_DIR, f"{character_name}.sav")
+
+def get_journal_path(character_name):
+    """Returns the path of a character's autosave journal."""
+    return os.path.join(SAVE_DIR, f"{character_name}.journal")
+
+def save_game(character, journal_seq=None, quiet=False):
+    """
+    Saves the character object to a file or, with the SQLite backend, to the database.
+
+    The save is written to a temporary file and renamed over the old one, or
+    written in a single transaction, so a crash never leaves a half-written
+    save behind. The journal is removed afterwards, since the save now
+    contains all of its changes.
 
     Args:
         character (Character): The character object to save.
+        journal_seq (int): The sequence number of the last journal record the save includes.
+                           Defaults to the last record written so far.
+        quiet (bool): Whether to skip the confirmation message, e.g. for autosaves.
     """
     if not os.path.exists(SAVE_DIR):
         os.makedirs(SAVE_DIR)
 
-    filename = os.path.join(SAVE_DIR, f"{character.name}.sav")
+    filename = get_save_path(character.name)
+    journal_file = get_journal_path(character.name)
+    character.last_saved_at = time.time()
     try:
-        with open(filename, 'wb') as f:
-            pickle.dump(character, f)
-        print(f"Spielstand für {character.name} gespeichert.")
+        if journal_seq is None:
+            journal_seq = get_last_journal_seq(character.name)
+        data = encode_character(character, journal_seq=journal_seq)
+        store = _get_store()
+        if store:
+            store.save(character.name, _build_summary(character, journal_seq), data)
+        else:
+            _write_atomic(filename, data)
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+        if not store:
+            _update_index_entry(character.name, filename, build_header(character))
+        if not quiet:
+            print(f"Spielstand für {character.name} gespeichert.")
     except Exception as e:
         print(f"Fehler beim Speichern von {character.name}: {e}")
 
+def _build_summary(character, journal_seq):
+    """Returns the summary the SQLite backend stores next to a save: its header section."""
+    summary = build_header(character)
+    summary["journal_seq"] = journal_seq
+    return summary
+
+def _write_atomic(filename, data):
+    """Writes data to a temporary file, flushes it to disk and renames it to filename."""
+    temp_file = filename + ".tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, filename)
+
+def get_last_journal_seq(character_name):
+    """
+    Returns the sequence number of the newest journal record of a character,
+    whether it is still in the journal or already part of the save.
+    """
+    seq = save_journal.last_seq(get_journal_path(character_name))
+    store = _get_store()
+    try:
+        header = store.get_summary(character_name) if store else read_header(get_save_path(character_name))
+        seq = max(seq, (header or {}).get("journal_seq", 0))
+    except (OSError, ValueError):
+        pass
+    return seq
+
+def delete_save(character_name):
+    """Deletes a character's save and journal."""
+    for path in (get_save_path(character_name), get_journal_path(character_name)):
+        if os.path.exists(path):
+            os.remove(path)
+    store = _get_store()
+    if store:
+        store.delete(character_name)
+        return
+    with _index_lock:
+        saves = get_save_index()
+        if saves.pop(character_name, None) is not None:
+            _write_index_file(saves)
+        _index_cache.update(key=_index_key(), saves=saves)
+
 def load_game(character_name):
     """
-    Loads a character object from a file.
+    Loads a character object from a file or, with the SQLite backend, from the database.
 
     Args:
         character_name (str): The name of the character to load.
@@ -36,27 +171,57 @@ def load_game(character_name):
     Returns:
         Character: The loaded character object, or None if not found.
     """
-    filename = os.path.join(SAVE_DIR, f"{character_name}.sav")
-    if os.path.exists(filename):
+    data = _read_save_data(character_name)
+    if data is not None:
         try:
-            with open(filename, 'rb') as f:
-                character = pickle.load(f)
-                # Compatibility check for old saves
-                # Compatibility check for old saves
-                if not hasattr(character, 'resources'):
-                    character.resources = {}
-                if not hasattr(character, 'main_stat'):
-                    character.main_stat = CLASSES.get(character.klasse, {}).get("main_stat")
-                if not hasattr(character, 'is_immortal'):
-                    character.is_immortal = False
-                if not hasattr(character, 'bosses_defeated'):
-                    character.bosses_defeated = 0
-                return character
+            character, journal_seq, migrated = _read_character(data)
+            replayed = save_journal.replay(character, get_journal_path(character_name), journal_seq)
+            if replayed:
+                print(f"{replayed} Änderungen aus dem Journal von {character_name} wiederhergestellt.")
+            if migrated:
+                # Write the upgraded character back, so the migration never runs again.
+                save_game(character, quiet=True)
+                print(f"Spielstand von {character_name} auf das aktuelle Format aktualisiert.")
+            return character
         except Exception as e:
             print(f"Fehler beim Laden von {character_name}: {e}")
             return None
     return None
 
+def _read_save_data(character_name):
+    """Returns the raw save of a character from the active backend, or None if there is none."""
+    store = _get_store()
+    if store:
+        return store.load(character_name)
+    filename = get_save_path(character_name)
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'rb') as f:
+        return f.read()
+
+def _read_character(data):
+    """
+    Reads a character from a save and migrates it to the current schema.
+
+    Args:
+        data (bytes): The complete save, in the binary format or pickled.
+
+    Returns:
+        tuple: The character, the sequence number of the last journal record
+               the save includes and the number of migration steps applied.
+    """
+    if is_binary_save(data):
+        character = decode_character(data)
+        header = decode_header(data)
+        journal_seq = header.get("journal_seq", 0)
+        version = header.get("schema_version", UNVERSIONED_SCHEMA_VERSION)
+    else:
+        # Legacy save: a pickled Character object.
+        character = pickle.loads(data)
+        journal_seq = 0
+        version = PICKLE_SCHEMA_VERSION
+    return character, journal_seq, migrate(character, version)
+
 def get_save_files():
     """
     Gets a list of all available save file character names.
@@ -64,8 +229,150 @@ def get_save_files():
     Returns:
         list: A list of strings with character names.
     """
+    store = _get_store()
+    if store:
+        return store.get_names()
+    return sorted(get_save_index())
+
+def get_save_summary(character_name):
+    """
+    Returns the summary of a save without loading it.
+
+    Returns:
+        dict: The header fields of save_format.HEADER_FIELDS, or None if there is no such save.
+    """
+    store = _get_store()
+    if store:
+        return store.get_summary(character_name)
+    return get_save_index().get(character_name)
+
+def get_top_saves(order_by="level", limit=10, klasse=None):
+    """
+    Returns the summaries of the best saved characters.
+
+    Args:
+        order_by (str): The summary field to rank by, one of character_store.RANKING_COLUMNS.
+        limit (int): The maximum number of characters.
+        klasse (str): Only rank characters of this class if given.
+
+    Returns:
+        list: The summaries of the best characters, best first.
+    """
+    store = _get_store()
+    if store:
+        return store.get_top(order_by, limit, klasse)
+    summaries = [summary for summary in get_save_index().values() if not klasse or summary.get("klasse") == klasse]
+    summaries.sort(key=lambda summary: summary.get(order_by) or 0, reverse=True)
+    return summaries[:limit]
+
+def get_save_index():
+    """
+    Returns a summary of every save, keyed by character name.
+
+    The summaries are kept in INDEX_FILE. The save directory is only scanned
+    again when the directory or the index file changed since the last call,
+    and only saves whose mtime or size no longer match their index entry are
+    read again. With the SQLite backend the summaries come from the database.
+
+    Returns:
+        dict: The character name of every save mapped to its summary.
+    """
+    store = _get_store()
+    if store:
+        return store.get_summaries()
+    with _index_lock:
+        return _get_save_index()
+
+def _get_save_index():
+    key = _index_key()
+    if key == _index_cache["key"]:
+        return _index_cache["saves"]
     if not os.path.exists(SAVE_DIR):
-        return []
+        _index_cache.update(key=key, saves={})
+        return {}
+
+    saves = _read_index_file()
+    changed = False
+    found = set()
+    with os.scandir(SAVE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".sav") or not entry.is_file():
+                continue
+            name = entry.name[:-len(".sav")]
+            found.add(name)
+            stat = entry.stat()
+            record = saves.get(name)
+            if record and record.get("mtime") == stat.st_mtime and record.get("size") == stat.st_size:
+                continue
+            summary = _read_save_summary(name, entry.path)
+            if summary is None:
+                saves.pop(name, None)
+            else:
+                saves[name] = dict(summary, mtime=stat.st_mtime, size=stat.st_size)
+            changed = True
+    for name in set(saves) - found:
+        del saves[name]
+        changed = True
+
+    if changed:
+        _write_index_file(saves)
+    _index_cache.update(key=_index_key(), saves=saves)
+    return saves
+
+def _index_key():
+    """Returns the mtimes that tell whether the cached index is still current."""
+    key = []
+    for path in (SAVE_DIR, INDEX_FILE):
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+def _read_index_file():
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index.get("saves", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+def _write_index_file(saves):
+    """Writes the index to a temporary file first, so a crash never leaves a broken index."""
+    temp_file = INDEX_FILE + ".tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "saves": saves}, f, ensure_ascii=False)
+        os.replace(temp_file, INDEX_FILE)
+    except OSError as e:
+        print(f"Fehler beim Schreiben des Spielstand-Index: {e}")
+
+def _read_save_summary(character_name, path):
+    """Reads the summary of a single save; old pickled saves have to be loaded completely."""
+    try:
+        with open(path, 'rb') as f:
+            is_binary = is_binary_save(f.read(16))
+        if is_binary:
+            return read_header(path)
+    except (OSError, ValueError) as e:
+        print(f"Fehler beim Lesen von {character_name}: {e}")
+        return None
+    # Migrated in memory only; the save itself is upgraded when it is loaded.
+    try:
+        with open(path, 'rb') as f:
+            character, _, _ = _read_character(f.read())
+    except Exception as e:
+        print(f"Fehler beim Lesen von {character_name}: {e}")
+        return None
+    return build_header(character)
 
-    save_files = [f.replace(".sav", "") for f in os.listdir(SAVE_DIR) if f.endswith(".sav")]
-    return save_files
+def _update_index_entry(character_name, path, summary):
+    """Stores the summary of a just written save in the index."""
+    with _index_lock:
+        saves = get_save_index()
+        stat = os.stat(path)
+        saves[character_name] = dict(summary, mtime=stat.st_mtime, size=stat.st_size)
+        _write_index_file(saves)
+        _index_cache.update(key=_index_key(), saves=saves)
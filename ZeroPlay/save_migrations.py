@@ -0,0 +1,104 @@
+# save_migrations.py
+"""
+Upgrades characters from older saves to the current save schema.
+
+Every binary save records the schema version it was written with. When an
+older save is loaded, the migration steps for all newer versions run once,
+in order, and load_game writes the upgraded character back. Saves in the
+current version are loaded without touching this module.
+"""
+from game_data import CLASSES
+from inventory import Inventory
+from item import Item, get_blueprint
+from stat_block import StatBlock, LEGACY_STAT_KEYS
+
+SCHEMA_VERSION = 2
+# Pickled saves are older than any schema version; binary saves written
+# before schema versions were introduced are version 1.
+PICKLE_SCHEMA_VERSION = 0
+UNVERSIONED_SCHEMA_VERSION = 1
+
+# German keys used by old saves, mapped to the current keys (for stats see stat_block.LEGACY_STAT_KEYS).
+LEGACY_CLASSES = {"Krieger": "warrior", "Magier": "mage", "Schurke": "rogue"}
+LEGACY_SLOTS = {"Kopf": "head", "Brust": "chest", "Waffe": "weapon"}
+LEGACY_ITEM_TYPES = {"Ausrüstung": "equipment", "Verbrauchsgut": "consumable"}
+LEGACY_RESOURCES = {"Eisenerz": "iron_ore", "Juwel": "jewel"}
+
+
+def _add_missing_fields(character):
+    """Version 1: adds the fields that were introduced after the first saves."""
+    state = character.__dict__
+    state.setdefault("resources", {})
+    if state.get("main_stat") is None:
+        klasse = LEGACY_CLASSES.get(character.klasse, character.klasse)
+        state["main_stat"] = CLASSES.get(klasse, {}).get("main_stat")
+    state.setdefault("is_immortal", False)
+    state.setdefault("bosses_defeated", 0)
+    if "auto_questing" not in state:
+        character.auto_questing = False
+        character.last_saved_at = None
+
+
+def _translate_german_keys(character):
+    """Version 2: renames German class, stat, slot, item type and resource keys and stores attributes as StatBlocks."""
+    # The class comes first: the main stat and the allowed armor below depend on it.
+    character.klasse = LEGACY_CLASSES.get(character.klasse, character.klasse)
+    main_stat = getattr(character, "main_stat", None)
+    character.main_stat = LEGACY_STAT_KEYS.get(main_stat, main_stat) or CLASSES.get(character.klasse, {}).get("main_stat")
+    for name in ("base_attributes", "attributes"):
+        stats = getattr(character, name)
+        if isinstance(stats, dict):
+            setattr(character, name, StatBlock.from_dict(_translate_keys(stats, LEGACY_STAT_KEYS)))
+    character.equipment = {
+        LEGACY_SLOTS.get(slot, slot): _migrate_item(item) if item else None
+        for slot, item in character.equipment.items()
+    }
+    character.resources = _translate_keys(character.resources, LEGACY_RESOURCES)
+    allowed_armor = CLASSES.get(character.klasse, {}).get("allowed_armor", [])
+    character.inventory = Inventory([_migrate_item(item) for item in character.inventory], allowed_armor)
+
+
+# Ordered migration steps: each one upgrades a character to its version.
+MIGRATIONS = (
+    (1, _add_missing_fields),
+    (2, _translate_german_keys),
+)
+
+
+def migrate(character, version):
+    """
+    Runs all migration steps newer than the given schema version on a character.
+
+    Args:
+        character (Character): The character read from the save.
+        version (int): The schema version the save was written with.
+
+    Returns:
+        int: The number of steps that were applied.
+    """
+    steps = 0
+    for step_version, step in MIGRATIONS:
+        if step_version > version:
+            step(character)
+            steps += 1
+    if steps:
+        character.invalidate_stats_cache()
+    return steps
+
+
+def _translate_keys(values, legacy_keys):
+    return {legacy_keys.get(key, key): value for key, value in values.items()}
+
+
+def _migrate_item(item):
+    """Returns the item with German type, slot and stat keys replaced, or the item itself if it has none."""
+    blueprint = item.blueprint
+    item_type = LEGACY_ITEM_TYPES.get(blueprint.item_type, blueprint.item_type)
+    slot = LEGACY_SLOTS.get(blueprint.slot, blueprint.slot)
+    base_stats = item.base_stats
+    if item_type == "equipment" and not isinstance(base_stats, StatBlock):
+        base_stats = StatBlock.from_dict(_translate_keys(base_stats or {}, LEGACY_STAT_KEYS))
+    if item_type == blueprint.item_type and slot == blueprint.slot and base_stats is item.base_stats:
+        return item
+    return Item.from_record(get_blueprint(blueprint.name_key, blueprint.gender, item_type, slot, blueprint.armor_type),
+                            item.rarity, base_stats, item.base_value, item.upgrade_level, item.is_boss_item_flag)
@@ -0,0 +1,111 @@
+# score_sketch.py
+"""
+Defines the ScoreSketch, a small, mergeable summary of many score values
+that answers percentile queries without keeping the values themselves.
+
+It is a DDSketch: values are counted in buckets whose bounds grow
+geometrically, so every percentile is estimated within a fixed relative
+error of the true value, and two sketches are merged by adding up their
+bucket counts.
+"""
+import math
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class ScoreSketch:
+    """Counts non-negative score values in logarithmic buckets."""
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            relative_accuracy (float): The maximum relative error of quantile estimates.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        # Values of 0 (or less) can't be bucketed logarithmically; they are counted on their own.
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value, count=1):
+        """Adds a value to the sketch, count times."""
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        """
+        Adds all values of another sketch, e.g. one built by another process.
+
+        Raises:
+            ValueError: If the sketches use different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches mit unterschiedlicher Genauigkeit können nicht zusammengeführt werden.")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def rank(self, value):
+        """
+        Estimates the share of values below the given value. Values in the
+        same bucket count as half below, half above.
+
+        Returns:
+            float: The percentile rank between 0.0 and 1.0, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        if value <= 0:
+            return self.zero_count / 2 / self.count
+        key = self._key(value)
+        below = self.zero_count + sum(count for bin_key, count in self.bins.items() if bin_key < key)
+        return (below + self.bins.get(key, 0) / 2) / self.count
+
+    def quantile(self, q):
+        """
+        Estimates the value at quantile q.
+
+        Args:
+            q (float): The quantile between 0.0 and 1.0, e.g. 0.5 for the median.
+
+        Returns:
+            float: The estimated value, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        target = q * (self.count - 1)
+        seen = self.zero_count
+        if target < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > target:
+                # The bucket's midpoint, which is within the relative accuracy of every value in it.
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self):
+        """Returns the sketch as a JSON-compatible dictionary."""
+        return {"relative_accuracy": self.relative_accuracy, "zero_count": self.zero_count,
+                "bins": {str(key): count for key, count in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a sketch from to_dict's output."""
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
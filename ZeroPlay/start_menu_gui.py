@@ -4,10 +4,12 @@ Defines the GUI Frame for the main start menu.
 """
 import tkinter as tk
 from tkinter import ttk
-from save_load_system import get_save_files
 from utils import format_currency
-from translations import get_text
-from save_load_system import get_save_files, load_game
+from translations import get_translator
+from game_data import CLASSES
+from save_load_system import get_save_index
+
+PREVIEW_STATS = ('strength', 'intelligence', 'luck')
 
 class StartMenu(ttk.Frame):
     """Manages the start menu frame."""
@@ -17,23 +19,20 @@ class StartMenu(ttk.Frame):
         self.callbacks = callbacks
         self.language = language
         self.selected_save = None
+        self.save_index = {}
         self._setup_vars()
         self.create_widgets()
 
     def _(self, key):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key)
 
     def _setup_vars(self):
         """Sets up StringVars for the preview display."""
         self.preview_name_var = tk.StringVar(value=f"{self._('name')}: -")
         self.preview_level_var = tk.StringVar(value=f"{self._('level')}: -")
         self.preview_gold_var = tk.StringVar(value=f"{self._('gold')}: -")
-        self.preview_stats_vars = {
-            'Stärke': tk.StringVar(value=f"{self._('strength')}: -"),
-            'Intelligenz': tk.StringVar(value=f"{self._('intelligence')}: -"),
-            'Glück': tk.StringVar(value=f"{self._('luck')}: -"),
-        }
+        self.preview_stats_vars = {stat: tk.StringVar(value=f"{self._(stat)}: -") for stat in PREVIEW_STATS}
 
     def create_widgets(self):
         self.master.title(self._('start_menu_title'))
@@ -64,7 +63,7 @@ class StartMenu(ttk.Frame):
         ttk.Label(preview_frame, textvariable=self.preview_name_var).pack(anchor=tk.W)
         ttk.Label(preview_frame, textvariable=self.preview_level_var).pack(anchor=tk.W)
         ttk.Label(preview_frame, textvariable=self.preview_gold_var).pack(anchor=tk.W, pady=(0, 10))
-        for stat_key in ['Stärke', 'Intelligenz', 'Glück']:
+        for stat_key in PREVIEW_STATS:
             ttk.Label(preview_frame, textvariable=self.preview_stats_vars[stat_key]).pack(anchor=tk.W)
 
         button_frame = ttk.Frame(right_column_frame, padding=(0, 10, 0, 0))
@@ -84,9 +83,9 @@ class StartMenu(ttk.Frame):
         intro_label.grid(row=2, column=0, columnspan=2, pady=(20, 0))
 
     def populate_save_list(self):
+        self.save_index = get_save_index()
         self.save_listbox.delete(0, tk.END)
-        for save_name in get_save_files():
-            self.save_listbox.insert(tk.END, save_name)
+        self.save_listbox.insert(tk.END, *sorted(self.save_index))
 
     def on_select(self, event=None):
         if not self.save_listbox.curselection():
@@ -96,14 +95,16 @@ class StartMenu(ttk.Frame):
             return
         self.load_button.config(state=tk.NORMAL)
         self.selected_save = self.save_listbox.get(self.save_listbox.curselection())
-        char = load_game(self.selected_save)
-        if char:
-            self.preview_name_var.set(f"{self._('name')}: {char.name} ({char.klasse})")
-            self.preview_level_var.set(f"{self._('level')}: {char.level}")
-            self.preview_gold_var.set(f"{self._('gold')}: {format_currency(char.copper)}")
-            self.preview_stats_vars['Stärke'].set(f"{self._('strength')}: {char.attributes.get('Stärke', 0)}")
-            self.preview_stats_vars['Intelligenz'].set(f"{self._('intelligence')}: {char.attributes.get('Intelligenz', 0)}")
-            self.preview_stats_vars['Glück'].set(f"{self._('luck')}: {char.attributes.get('Glück', 0)}")
+        summary = self.save_index.get(self.selected_save)
+        if summary:
+            class_data = CLASSES.get(summary.get("klasse"), {})
+            class_name = self._(class_data["name_key"]) if class_data else summary.get("klasse")
+            attributes = summary.get("attributes") or {}
+            self.preview_name_var.set(f"{self._('name')}: {summary.get('name')} ({class_name})")
+            self.preview_level_var.set(f"{self._('level')}: {summary.get('level')}")
+            self.preview_gold_var.set(f"{self._('gold')}: {format_currency(summary.get('copper') or 0)}")
+            for stat, var in self.preview_stats_vars.items():
+                var.set(f"{self._(stat)}: {attributes.get(stat, 0)}")
         else:
             self.clear_preview()
 
@@ -111,9 +112,8 @@ class StartMenu(ttk.Frame):
         self.preview_name_var.set(f"{self._('name')}: -")
         self.preview_level_var.set(f"{self._('level')}: -")
         self.preview_gold_var.set(f"{self._('gold')}: -")
-        self.preview_stats_vars['Stärke'].set(f"{self._('strength')}: -")
-        self.preview_stats_vars['Intelligenz'].set(f"{self._('intelligence')}: -")
-        self.preview_stats_vars['Glück'].set(f"{self._('luck')}: -")
+        for stat, var in self.preview_stats_vars.items():
+            var.set(f"{self._(stat)}: -")
 
     def load_game(self):
         if self.selected_save and self.callbacks['load']:
@@ -0,0 +1,143 @@
+# stat_block.py
+"""
+Defines the StatBlock, a fixed-layout container for the four character stats.
+"""
+
+STAT_KEYS = ("strength", "agility", "intelligence", "luck")
+STAT_INDEX = {stat: index for index, stat in enumerate(STAT_KEYS)}
+# German stat keys used by old saves, mapped to the current keys.
+LEGACY_STAT_KEYS = {"Stärke": "strength", "Agilität": "agility", "Intelligenz": "intelligence", "Glück": "luck"}
+
+_WEIGHTS = {}
+
+
+def main_stat_weights(main_stat, main_stat_weight=1.5):
+    """
+    Returns the weight vector used to score items for a class.
+
+    Args:
+        main_stat (str): The class's main stat. Any other value weights all stats equally.
+        main_stat_weight (float): The weight of the main stat; all others count once.
+
+    Returns:
+        tuple: One weight per stat, in STAT_KEYS order.
+    """
+    key = (main_stat, main_stat_weight)
+    weights = _WEIGHTS.get(key)
+    if weights is None:
+        weights = _WEIGHTS[key] = tuple(main_stat_weight if stat == main_stat else 1 for stat in STAT_KEYS)
+    return weights
+
+
+class StatBlock:
+    """
+    Holds one value per stat in a fixed 4-slot list (in STAT_KEYS order).
+
+    Behaves like a dictionary keyed by stat name, so existing code can keep
+    reading stats by name, while sums and weighted scores work on the list
+    directly without hashing any keys.
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self, values=None):
+        """
+        Initializes the block.
+
+        Args:
+            values (iterable): Four stat values in STAT_KEYS order. All stats are 0 if omitted.
+        """
+        self._stats = [int(value) for value in values] if values is not None else [0, 0, 0, 0]
+
+    @classmethod
+    def from_dict(cls, stats):
+        """Builds a block from a {stat: value} dictionary; unknown keys are ignored."""
+        return cls([stats.get(stat, 0) for stat in STAT_KEYS])
+
+    def to_dict(self):
+        """Returns all stats as a {stat: value} dictionary."""
+        return dict(zip(STAT_KEYS, self._stats))
+
+    def copy(self):
+        """Returns an independent copy of the block."""
+        return _from_list(self._stats[:])
+
+    # --- Mapping interface ---
+    def __getitem__(self, stat):
+        return self._stats[STAT_INDEX[stat]]
+
+    def __setitem__(self, stat, value):
+        self._stats[STAT_INDEX[stat]] = value
+
+    def __contains__(self, stat):
+        return stat in STAT_INDEX
+
+    def __iter__(self):
+        return iter(STAT_KEYS)
+
+    def __len__(self):
+        return len(STAT_KEYS)
+
+    def __bool__(self):
+        """A block is truthy if any stat is non-zero, like a non-empty stats dictionary."""
+        return any(self._stats)
+
+    def __eq__(self, other):
+        if isinstance(other, StatBlock):
+            return self._stats == other._stats
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"StatBlock({self.to_dict()})"
+
+    def get(self, stat, default=None):
+        """Returns the value of a stat, or default if it is not a known stat."""
+        index = STAT_INDEX.get(stat)
+        return self._stats[index] if index is not None else default
+
+    def keys(self):
+        return list(STAT_KEYS)
+
+    def values(self):
+        """Returns the stat values in STAT_KEYS order."""
+        return list(self._stats)
+
+    def items(self):
+        return list(zip(STAT_KEYS, self._stats))
+
+    def nonzero_items(self):
+        """Returns (stat, value) pairs for all stats that are set, for display."""
+        return [(stat, value) for stat, value in zip(STAT_KEYS, self._stats) if value]
+
+    # --- Vector operations ---
+    def __add__(self, other):
+        a, b = self._stats, other._stats
+        return _from_list([a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3]])
+
+    def __iadd__(self, other):
+        a, b = self._stats, other._stats
+        a[0] += b[0]; a[1] += b[1]; a[2] += b[2]; a[3] += b[3]
+        return self
+
+    def total(self):
+        """Returns the sum of all stats."""
+        a = self._stats
+        return a[0] + a[1] + a[2] + a[3]
+
+    def dot(self, weights):
+        """Returns the weighted sum of all stats, with one weight per stat in STAT_KEYS order."""
+        a = self._stats
+        return a[0] * weights[0] + a[1] * weights[1] + a[2] * weights[2] + a[3] * weights[3]
+
+    def raised(self, amount):
+        """Returns a new block with amount added to every stat that is set."""
+        return _from_list([value + amount if value else 0 for value in self._stats])
+
+
+def _from_list(stats):
+    """Wraps a list of four ints in a StatBlock without copying or converting it."""
+    block = StatBlock.__new__(StatBlock)
+    block._stats = stats
+    return block
@@ -89,21 +89,19 @@ class Trader:
         Returns:
             tuple: A tuple containing the number of items sold and the total gold gained.
         """
-        items_to_sell = [
-            item for item in character.inventory
-            if item.item_type == "Ausrüstung" and not character.is_upgrade(item)
-        ]
-
-        items_sold_count = len(items_to_sell)
-        copper_gained = 0
-
-        if not items_to_sell:
+        items_to_keep = []
+        items_sold_count, copper_gained = 0, 0
+        for item, is_upgrade in zip(character.inventory, character.get_upgrade_flags()):
+            if item.item_type == "equipment" and not is_upgrade:
+                items_sold_count += 1
+                copper_gained += item.value
+            else:
+                items_to_keep.append(item)
+
+        if not items_sold_count:
             return 0, 0
 
-        for item in items_to_sell:
-            copper_gained += item.value
-            character.inventory.remove(item)
-
+        character.inventory[:] = items_to_keep
         character.copper += copper_gained
         return items_sold_count, copper_gained
 
@@ -5,7 +5,7 @@ Defines the GUI for the Trader window.
 import tkinter as tk
 from tkinter import ttk, messagebox
 from utils import format_currency, center_window
-from translations import get_text
+from translations import get_translator
 
 class TraderWindow:
     """Manages the trader GUI window."""
@@ -46,7 +46,7 @@ class TraderWindow:
 
     def _(self, key):
         """Alias for get_text for shorter calls."""
-        return get_text(self.language, key)
+        return get_translator(self.language)(key)
 
     def _setup_vars(self):
         """Sets up tkinter StringVars for the trader window."""
@@ -1,612 +1,188 @@
 # translations.py
 """
-Centralized dictionary for all UI text translations.
+Loads the UI text catalogs and translates keys into the player's language.
+
+Every language has its own catalog in locales/<lang>.json. A catalog is
+only read when its language is first used, and its compiled form is cached
+in locales/__cache__, keyed by the CRC-32 hash of the catalog file, so
+later starts neither parse the JSON nor the text templates again.
 """
+import marshal
+import os
+import zlib
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+CACHE_DIR = os.path.join(LOCALE_DIR, "__cache__")
+# Increase when the layout of the cached catalogs changes.
+CACHE_FORMAT = 1
+
+# The catalog every other language falls back to for missing keys.
+FALLBACK_LANGUAGE = "en"
+
+
+class Template:
+    """
+    A catalog text with placeholders, parsed once into its literal parts and
+    field names so formatting it is a single join.
+    """
+
+    __slots__ = ("key", "parts", "fields")
+
+    def __init__(self, key, text):
+        """
+        Parses a text.
+
+        Raises:
+            ValueError: If the text has unbalanced braces or placeholders that
+                        are not plain names (e.g. '{}', '{0}' or '{value:>3}').
+        """
+        # Templates are only parsed when a catalog is compiled, so string (and re) stay out of the normal start.
+        import string
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise ValueError(f"Ungültiger Text '{key}': {e}") from e
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise ValueError(f"Ungültiger Platzhalter '{{{field}}}' im Text '{key}'.")
+        self._set_parts(key, tuple((literal, field) for literal, field, _, _ in parsed))
+
+    @classmethod
+    def from_parts(cls, key, parts):
+        """Rebuilds a template from the parts of an already parsed one, e.g. from the catalog cache."""
+        template = cls.__new__(cls)
+        template._set_parts(key, parts)
+        return template
+
+    def _set_parts(self, key, parts):
+        self.key = key
+        self.parts = parts
+        self.fields = frozenset(field for _, field in parts if field is not None)
+
+    def format(self, values):
+        """Fills in the placeholders; raises KeyError for a missing value."""
+        return "".join(literal + (str(values[field]) if field is not None else "") for literal, field in self.parts)
+
+
+def available_languages():
+    """Returns the codes of all languages with a catalog, e.g. ['de', 'en']."""
+    return sorted(name[:-len(".json")] for name in os.listdir(LOCALE_DIR) if name.endswith(".json"))
+
+def load_catalog(lang):
+    """
+    Loads the compiled catalog of a language, from the cache if it matches the catalog file.
+
+    Args:
+        lang (str): The language code.
+
+    Returns:
+        tuple: The texts of the catalog by key, and the template parts of every text with placeholders.
 
-TEXTS = {
-    "de": {
-        # General
-        "game_title": "Chronicle of the Idle Hero",
-        "warning": "Warnung",
-        "error": "Fehler",
-        "ok": "OK",
-        "close": "Schließen",
-        "name": "Name",
-        "level": "Level",
-        "gold": "Gold",
-        "strength": "Stärke",
-        "intelligence": "Intelligenz",
-        "luck": "Glück",
-        "agility": "Agilität",
-        "cost": "Kosten",
-        "cheat_activated": "Cheat aktiviert",
-        "type": "Typ",
-        "value": "Wert",
-        "damage": "Schaden",
-        "and": "und",
-        "resource_iron_ore": "Eisenerz",
-        "resource_jewel": "Juwel",
-        "item_type_equipment": "Ausrüstung",
-        "item_type_consumable": "Verbrauchsgut",
-        "armor_type_chain": "Kette",
-        "armor_type_plate": "Platte",
-        "armor_type_cloth": "Stoff",
-        "armor_type_leather": "Leder",
-
-
-        # Splash Screen
-        "language_german": "Deutsch",
-        "language_english": "English",
-        "splash_title": "Willkommen bei Chronicle of the Idle Hero!",
-        "splash_objective_title": "Ziel des Spiels:",
-        "splash_objective_text": "Werde stärker, besiege immer mächtigere Bosse und erklimme die Spitze der Highscore-Liste. Der Tod durch einen Boss ist nicht das Ende, sondern eine Wiedergeburt, die dich stärker macht. Aber sei gewarnt: Ein Scheitern bei einer normalen Quest führt zur endgültigen Löschung deines Helden!",
-        "splash_controls_title": "Steuerung:",
-        "splash_controls_text": "Das Spiel wird hauptsächlich mit der Maus bedient. Beginne Quests, besuche Händler und rüste Gegenstände aus, um dein Abenteuer voranzutreiben.",
-        "continue": "Weiter",
-        "language": "Sprache / Language",
-
-        # Start Menu
-        "start_menu_title": "Chronicle of the Idle Hero - Hauptmenü",
-        "load_save": "Spielstand laden",
-        "preview": "Vorschau",
-        "load": "Laden",
-        "new_game": "Neues Spiel",
-        "highscores": "Highscores",
-        "quit": "Beenden",
-        "start_menu_intro": "Wähle einen Spielstand oder erstelle einen neuen Helden.\nAchtung: Tod bei einer Quest löscht den Spielstand!",
-
-        # Class Selection
-        "class_selection_title": "Charaktererstellung",
-        "enter_name": "Gib deinen Namen ein:",
-        "select_class": "Wähle deine Klasse:",
-        "confirm": "Bestätigen",
-        "back": "Zurück",
-        "class_warrior_name": "Krieger",
-        "class_mage_name": "Magier",
-        "class_rogue_name": "Schurke",
-        "class_warrior_desc": "Ein Meister des Nahkampfs, verlässt sich auf Stärke und Zähigkeit.",
-        "class_mage_desc": "Ein Gelehrter der arkanen Künste, dessen Macht von seiner Intelligenz abhängt.",
-        "class_rogue_desc": "Ein geschickter Halunke, der Agilität nutzt, um seine Feinde auszutricksen.",
-
-        # RPG GUI (Main Game)
-        "char_status": "Charakterstatus",
-        "item_level": "Item Level",
-        "attributes": "Attribute",
-        "resources": "Ressourcen",
-        "no_resources": "Noch keine Ressourcen gesammelt.",
-        "life_points": "Lebenspunkte",
-        "mana_points": "Manapunkte",
-        "energy": "Energie",
-        "rage": "Wut",
-        "experience": "Erfahrung",
-        "actions": "Aktionen",
-        "start_quest": "Neue Quest beginnen",
-        "start_auto_quest": "Auto-Quest starten",
-        "stop_auto_quest": "Auto-Quest stoppen",
-        "visit_trader": "Händler besuchen",
-        "visit_blacksmith": "Schmied besuchen",
-        "boss_arena": "Boss Arena",
-        "equip_item": "Gegenstand ausrüsten",
-        "use_item": "Gegenstand benutzen",
-        "log": "Log",
-        "equipment": "Ausrüstung",
-        "equipped_gear": "Angelegte Ausrüstung",
-        "inventory": "Inventar",
-        "backpack": "Rucksack",
-        "inventory_count": "Inventar ({current}/{max})",
-        "head": "Kopf",
-        "chest": "Brust",
-        "weapon": "Waffe",
-        "empty_slot": "Leer",
-        "quest_active": "Quest aktiv",
-        "quest_active_msg": "Bitte schließe erst die aktuelle Quest ab.",
-        "inventory_full": "Inventar voll",
-        "inventory_full_msg": "Dein Inventar ist voll. Besuche den Händler!",
-        "inventory_full_auto_quest_stopped": "Inventar voll! Auto-Quest gestoppt.",
-        "low_health": "Niedrige Lebenspunkte!",
-        "low_health_msg": "Deine Lebenspunkte sind kritisch niedrig! Auto-Quest pausiert. Heile dich!",
-        "level_up_title": "Level Aufstieg!",
-        "level_up_msg": "Level Up! Du bist jetzt Level {level}!\n\nAttribut-Boni:\n{bonuses}",
-        "milestone_unlocked": "Meilenstein freigeschaltet!",
-        "milestone_inventory_unlocked": "Deine Inventargröße wird bei zukünftigen Wiedergeburten nicht mehr zurückgesetzt.",
-        "milestone_auto_equip_unlocked": "Bessere Ausrüstung wird jetzt automatisch angelegt.",
-        "auto_equip_notification": "Auto-Ausrüstung: '{item_name}' angelegt.",
-        "resource_hunt": "Ressourcenjagd",
-        "start_resource_hunt": "Ressourcenjagd starten",
-        "stop_resource_hunt": "Ressourcenjagd beenden",
-        "auto_quest_active": "Auto-Quest Modus aktiv...",
-        "auto_quest_stopped": "Auto-Quest Modus gestoppt.",
-        "loot": "Loot",
-        "did_not_fit": "passte nicht ins Inventar!",
-        "auto_sold_for": "automatisch verkauft für",
-        "auto_equipped": "automatisch ausgerüstet",
-        "cannot_use_item": "Dieser Gegenstand kann nicht benutzt werden.",
-        "congratulations": "Glückwunsch!",
-        "all_bosses_defeated": "Du hast bereits alle verfügbaren Bosse besiegt!",
-        "boss_stats": "Werte des Bosses",
-        "your_stats": "Deine Werte",
-        "boss_fight_warning": "Du bist dabei, {boss_name} (Stufe {player_ilvl}) herauszufordern.\n\n--- Werte des Bosses ---\nLebenspunkte: {boss_hp}\nSchaden: {boss_dmg_min} - {boss_dmg_max}\n\n--- Deine Werte ---\nLebenspunkte: {player_hp} / {player_max_hp}\nSchaden: {player_dmg_min} - {player_dmg_max}\n\nDer Kampf kann nicht abgebrochen werden und die Gefahr des Todes ist sehr hoch.\n\nMöchtest du fortfahren?",
-        "image_not_found": "Bild nicht\ngefunden:\n{path}",
-        "image_load_error": "Fehler beim\nLaden des Bildes:\n{e}",
-        "game_over_tombstone_error": "Game Over\n(Grabstein nicht gefunden)",
-        "cheat_immortality_on": "CHEAT AKTIVIERT: Unsterblichkeit!",
-        "cheat_immortality_off": "CHEAT DEAKTIVIERT: Sterblichkeit wiederhergestellt.",
-        "cheat_resources_added": "Cheat: +100 Eisenerz, +100 Juwel",
-        "tooltip_type": "Typ: {item_type} ({slot})",
-        "tooltip_value": "Wert: {value}",
-        "countdown_closing_in": "Schließt in {seconds} Sekunden...",
-        "item_used_success": "{item_name} benutzt.",
-        "error_invalid_item": "Ungültiger Gegenstand.",
-        "error_class_cannot_wear": "Deine Klasse ({char_class}) kann '{armor_type}' nicht tragen.",
-        "consumable_effect": "Stellt {value} {effect} wieder her",
-
-        # Item Rarities
-        "rarity_poor": "Schlecht",
-        "rarity_common": "Gewöhnlich",
-        "rarity_uncommon": "Ungewöhnlich",
-        "rarity_rare": "Selten",
-        "rarity_epic": "Episch",
-        "rarity_legendary": "Legendär",
-        "rarity_mythic": "Mythisch",
-
-        # Item Names
-        "item_sword": "Schwert",
-        "item_staff": "Stab",
-        "item_dagger": "Dolch",
-        "item_chain_hood": "Kettenhaube",
-        "item_cloth_hat": "Stoffhut",
-        "item_leather_cowl": "Lederkapuze",
-        "item_plate_armor": "Plattenpanzer",
-        "item_cloth_robe": "Stoffrobe",
-        "item_leather_jerkin": "Lederwams",
-
-        # Potions
-        "potion_small_healing": "Kleiner Heiltrank",
-        "potion_healing": "Heiltrank",
-        "potion_large_healing": "Großer Heiltrank",
-        "potion_superior_healing": "Überragender Heiltrank",
-        "potion_small_mana": "Kleiner Manatrank",
-        "potion_mana": "Manatrank",
-        "potion_large_mana": "Großer Manatrank",
-        "potion_superior_mana": "Überragender Manatrank",
-        "potion_small_energy": "Kleiner Energietrank",
-        "potion_energy": "Energietrank",
-        "potion_small_rage": "Kleiner Wuttrank",
-        "potion_rage": "Wuttrank",
-
-
-        # Quests
-        "quest_slimes_name": "Töte alle Schleime",
-        "quest_iron_ore_name": "Bringe dem Schmied 5 Eisenerz",
-        "quest_princess_name": "Rette eine Prinzessin aus einem anderen Schloss",
-        "quest_bottles_name": "Sammle 10 leere Flaschen für den Alchemisten",
-        "quest_armor_polish_name": "Poliere die Rüstung des Königs (ohne Bezahlung)",
-        "quest_headphones_name": "Entwirre die Kopfhörer des Barden",
-        "quest_youth_recipe_name": "Finde das Rezept für ewige Jugend (und verliere es wieder)",
-        "quest_parrot_name": "Bringe dem königlichen Papagei das Fluchen bei",
-        "quest_sand_name": "Zähle alle Sandkörner am Strand",
-        "quest_library_name": "Sortiere die Bibliothek nach der Farbe der Buchrücken",
-        "quest_dragon_name": "Überzeuge einen Drachen, dass er nur ein überdimensionierter Wellensittich ist",
-        "quest_goblins_name": "Finde heraus, warum Goblins immer so schlechte Laune haben",
-        "quest_turtle_name": "Eskortiere eine sehr langsame Schildkröte über eine sehr breite Straße",
-        "quest_ceremony_name": "Störe eine wichtige Zeremonie durch lautes Kauen",
-        # Procedural Quests
-        "quest_location_1": "in den düsteren Wäldern",
-        "quest_location_2": "zu den vergessenen Ruinen",
-        "quest_location_3": "durch die sengende Wüste",
-        "quest_location_4": "über die eisigen Gipfel",
-        "quest_location_5": "tief in die Goblin-Minen",
-        "quest_action_prefix_1": "Dort angekommen, musst du",
-        "quest_action_prefix_2": "Deine Aufgabe ist es,",
-        "quest_action_prefix_3": "Im Zielgebiet angekommen, gilt es,",
-        "quest_return_1": "Nach getaner Arbeit machst du dich auf den Rückweg.",
-        "quest_return_2": "Die Aufgabe ist erfüllt und du trittst die Heimreise an.",
-        "quest_return_3": "Erschöpft, aber erfolgreich, beginnst du den Rückmarsch.",
-
-        # Class Events
-        "warrior_event_1": "Du schmetterst deinen Schild in einen Gegner.",
-        "warrior_event_2": "Mit einem mächtigen Hieb spaltest du einen Helm.",
-        "warrior_event_3": "Du parierst einen Angriff und konterst.",
-        "warrior_event_4": "Ein lauter Schlachtruf lässt deine Feinde erzittern.",
-        "warrior_event_5": "Du trittst eine Kiste auf und findest eine Münze.",
-        "warrior_event_6": "Dein Schwert trifft zielsicher.",
-        "mage_event_1": "Ein Feuerball schlägt zischend in die Gegnerreihen ein.",
-        "mage_event_2": "Du wirkst einen Schutzzauber, der einen Hieb abwehrt.",
-        "mage_event_3": "Eissplitter frieren einen Angreifer an Ort und Stelle fest.",
-        "mage_event_4": "Ein Kettenblitz springt von einem Feind zum nächsten.",
-        "mage_event_5": "Du murmelst eine arkane Formel und stärkst deine Waffe.",
-        "mage_event_6": "Du findest eine alte Schriftrolle.",
-        "rogue_event_1": "Du springst aus den Schatten und landest einen kritischen Treffer.",
-        "rogue_event_2": "Mit einem schnellen Schnitt entwaffnest du einen Gegner.",
-        "rogue_event_3": "Du wirfst einen Dolch präzise auf ein entferntes Ziel.",
-        "rogue_event_4": "Eine Rauchbombe sorgt für Verwirrung.",
-        "rogue_event_5": "Du knackst eine kleine Schatulle und findest Gold.",
-        "rogue_event_6": "Du weichst einer Falle geschickt aus.",
-
-
-        # Trader
-        "upgrade_inventory": "Inventar erweitern",
-        "sell_inventory": "Dein Inventar (Verkaufen)",
-        "buy_offer": "Händler-Angebot (Kaufen)",
-        "sell": "Verkaufen",
-        "sell_junk": "Schrott verkaufen",
-        "buy": "Kaufen",
-        "trader_sell_prompt": "Bitte wähle einen Gegenstand zum Verkaufen aus.",
-        "trader_buy_prompt": "Bitte wähle einen Gegenstand zum Kaufen aus.",
-        "all_sold_msg": "{items_sold} Gegenstand/Gegenstände für insgesamt {copper_gained} verkauft.",
-        "nothing_to_sell": "Nichts zu verkaufen",
-        "nothing_to_sell_msg": "Du hast keine Gegenstände, die kein Upgrade sind.",
-        "upgrade_success": "Upgrade erfolgreich!",
-        "upgrade_success_msg": "Inventar für {cost} erweitert!",
-        "not_enough_gold": "Nicht genug Gold",
-        "not_enough_gold_msg": "Du kannst dir das nicht leisten.",
-        "buy_failed": "Kauf fehlgeschlagen",
-        "feature_unlocked": "Feature freigeschaltet!",
-        "autosell_unlocked_msg": "Du hast 50+ Inventarplätze!\n\nGegenstände, die kein Upgrade für dich sind, werden ab jetzt beim Aufheben automatisch verkauft.",
-
-        # Blacksmith
-        "blacksmith_title": "Schmiede",
-        "blacksmith_upgrade": "Verbesserung",
-        "select_item_prompt": "Wähle einen Gegenstand",
-        "current_stats": "Aktuelle Werte:",
-        "next_level": "Nächste Stufe:",
-        "upgrade_button": "Verbessern",
-        "your_resources": "Deine Ressourcen:",
-        "max_level_reached": "Maximale Stufe erreicht",
-        "upgrade_success_title": "Erfolg!",
-        "max_stat_indicator": "(Max)",
-
-        # Bosses
-        "boss_goblin_king": "Goblin König",
-        "boss_stone_golem": "Steingolem",
-        "boss_chimera_matriarch": "Chimären-Matriarchin",
-        "boss_necromancer_lord": "Nekromanten-Lord",
-        "boss_ice_giant_chief": "Eisriesen-Häuptling",
-        "boss_ancient_dragon": "Alter Drache",
-
-        # Boss Arena
-        "player": "Spieler",
-        "boss": "Boss",
-        "combat_log": "Kampflog",
-        "attack": "Angreifen",
-        "defend": "Verteidigen",
-        "defense_legend": "Verteidigungs-Legende",
-        "counter_attack": "Konter-Angriff",
-        "empowered_attack": "Verstärkter nächster Angriff",
-        "light_heal": "Leichte Heilung",
-        "weaken_boss": "Boss schwächen",
-        "victory": "Sieg!",
-        "defeat": "Niederlage",
-        "victory_msg": "Du hast gewonnen!\n\nBelohnungen:\n- {gold}\n- {xp} XP{item}",
-        "defeat_msg": "Du hast den Kampf verloren!",
-        "boss_appears": "Ein wilder {boss_name} erscheint!",
-        "you_have_been_defeated": "Du wurdest besiegt...",
-        "image_error_display": "Bildfehler:\n{e}",
-        "log_defense_result": "Verteidigungsergebnis: {symbol}",
-        "log_counter_attack": "Konterangriff! Du fügst dem Boss {damage} Schaden zu.",
-        "log_empowered_attack": "Dein nächster Angriff wird verstärkt!",
-        "log_light_heal": "Leichte Heilung! Du regenerierst {healing} Lebenspunkte.",
-        "log_boss_weakened": "{boss_name} ist für eine Runde geschwächt!",
-        "log_player_attack": "Du greifst an und verursachst {damage} Schaden bei {boss_name}!",
-        "log_boss_attack": "{boss_name} greift an und fügt dir {damage} Schaden zu!",
-        "log_defense_halves_damage": "Deine Verteidigung halbiert den Schaden auf {damage}!",
-        "log_boss_defeated": "Du hast {boss_name} besiegt!",
-        "critical_error_title": "Kritischer Fehler",
-        "critical_error_main_stat_message": "Konnte das Hauptattribut des Charakters nicht bestimmen. Kampf wird abgebrochen.",
-
-        # Game Over
-        "game_over_title": "Game Over",
-        "rebirth_title": "Wiedergeburt!",
-        "game_over_quest_text": "Ruhe in Frieden, {name}.\n\nDu bist bei einer Quest gestorben und dein Charakter wurde gelöscht.",
-        "game_over_rebirth_text": "{name} wurde von einem Boss besiegt!\n\nDurch die Niederlage bist du stärker geworden.\nDu wirst auf Level 1 zurückgesetzt, aber deine Basisattribute wurden permanent verbessert!",
-        "tombstone_not_found_placeholder": "[Grabstein-Bild nicht gefunden]",
-        "rebirth_image_not_found_placeholder": "[Wiedergeburts-Bild nicht gefunden]",
-
-        # Highscores
-        "rebirths": "Wiedergeburten",
-        "bosses_defeated": "Besiegte Bosse",
-    },
-    "en": {
-        # General
-        "game_title": "Chronicle of the Idle Hero",
-        "warning": "Warning",
-        "error": "Error",
-        "ok": "OK",
-        "close": "Close",
-        "name": "Name",
-        "level": "Level",
-        "gold": "Gold",
-        "strength": "Strength",
-        "intelligence": "Intelligence",
-        "luck": "Luck",
-        "agility": "Agility",
-        "cost": "Cost",
-        "cheat_activated": "Cheat Activated",
-        "type": "Type",
-        "value": "Value",
-        "damage": "Damage",
-        "and": "and",
-        "resource_iron_ore": "Iron Ore",
-        "resource_jewel": "Jewel",
-        "item_type_equipment": "Equipment",
-        "item_type_consumable": "Consumable",
-        "armor_type_chain": "Chain",
-        "armor_type_plate": "Plate",
-        "armor_type_cloth": "Cloth",
-        "armor_type_leather": "Leather",
-
-        # Splash Screen
-        "language_german": "Deutsch",
-        "language_english": "English",
-        "splash_title": "Welcome to Chronicle of the Idle Hero!",
-        "splash_objective_title": "Objective:",
-        "splash_objective_text": "Grow stronger, defeat increasingly powerful bosses, and climb to the top of the highscore list. Death by a boss is not the end, but a rebirth that makes you stronger. But be warned: Failing a normal quest will lead to the permanent deletion of your hero!",
-        "splash_controls_title": "Controls:",
-        "splash_controls_text": "The game is primarily controlled with the mouse. Start quests, visit merchants, and equip items to advance your adventure.",
-        "continue": "Continue",
-        "language": "Sprache / Language",
-
-        # Start Menu
-        "start_menu_title": "Chronicle of the Idle Hero - Main Menu",
-        "load_save": "Load Save File",
-        "preview": "Preview",
-        "load": "Load",
-        "new_game": "New Game",
-        "highscores": "Highscores",
-        "quit": "Quit",
-        "start_menu_intro": "Choose a save file or create a new hero.\nWarning: Death on a quest deletes the save file!",
-
-        # Class Selection
-        "class_selection_title": "Character Creation",
-        "enter_name": "Enter your name:",
-        "select_class": "Select your class:",
-        "confirm": "Confirm",
-        "back": "Back",
-        "class_warrior_name": "Warrior",
-        "class_mage_name": "Mage",
-        "class_rogue_name": "Rogue",
-        "class_warrior_desc": "A master of melee combat, relying on strength and toughness.",
-        "class_mage_desc": "A scholar of the arcane arts, whose power depends on their intelligence.",
-        "class_rogue_desc": "A skillful scoundrel who uses agility to outmaneuver their foes.",
-
-
-        # RPG GUI (Main Game)
-        "char_status": "Character Status",
-        "item_level": "Item Level",
-        "attributes": "Attributes",
-        "resources": "Resources",
-        "no_resources": "No resources gathered yet.",
-        "life_points": "Life Points",
-        "mana_points": "Mana Points",
-        "energy": "Energy",
-        "rage": "Rage",
-        "experience": "Experience",
-        "actions": "Actions",
-        "start_quest": "Start New Quest",
-        "start_auto_quest": "Start Auto-Quest",
-        "stop_auto_quest": "Stop Auto-Quest",
-        "visit_trader": "Visit Trader",
-        "visit_blacksmith": "Visit Blacksmith",
-        "boss_arena": "Boss Arena",
-        "equip_item": "Equip Item",
-        "use_item": "Use Item",
-        "log": "Log",
-        "equipment": "Equipment",
-        "equipped_gear": "Equipped Gear",
-        "inventory": "Inventory",
-        "backpack": "Backpack",
-        "inventory_count": "Inventory ({current}/{max})",
-        "head": "Head",
-        "chest": "Chest",
-        "weapon": "Weapon",
-        "empty_slot": "Empty",
-        "quest_active": "Quest Active",
-        "quest_active_msg": "Please complete your current quest first.",
-        "inventory_full": "Inventory Full",
-        "inventory_full_msg": "Your inventory is full. Visit the trader!",
-        "inventory_full_auto_quest_stopped": "Inventory full! Auto-Quest stopped.",
-        "low_health": "Low Health!",
-        "low_health_msg": "Your health is critically low! Auto-Quest paused. Heal up!",
-        "level_up_title": "Level Up!",
-        "level_up_msg": "Level Up! You are now level {level}!\n\nAttribute Bonuses:\n{bonuses}",
-        "milestone_unlocked": "Milestone Unlocked!",
-        "milestone_inventory_unlocked": "Your inventory size will no longer be reset on future rebirths.",
-        "milestone_auto_equip_unlocked": "Better gear will now be equipped automatically.",
-        "auto_equip_notification": "Auto-Equip: '{item_name}' equipped.",
-        "resource_hunt": "Resource Hunt",
-        "start_resource_hunt": "Start Resource Hunt",
-        "stop_resource_hunt": "Stop Resource Hunt",
-        "auto_quest_active": "Auto-Quest mode active...",
-        "auto_quest_stopped": "Auto-Quest mode stopped.",
-        "loot": "Loot",
-        "did_not_fit": "did not fit in inventory!",
-        "auto_sold_for": "auto-sold for",
-        "auto_equipped": "auto-equipped",
-        "cannot_use_item": "This item cannot be used.",
-        "congratulations": "Congratulations!",
-        "all_bosses_defeated": "You have already defeated all available bosses!",
-        "boss_stats": "Boss Stats",
-        "your_stats": "Your Stats",
-        "boss_fight_warning": "You are about to challenge {boss_name} (Level {player_ilvl}).\n\n--- Boss Stats ---\nHit Points: {boss_hp}\nDamage: {boss_dmg_min} - {boss_dmg_max}\n\n--- Your Stats ---\nHit Points: {player_hp} / {player_max_hp}\nDamage: {player_dmg_min} - {player_dmg_max}\n\nThe fight cannot be cancelled and the risk of death is very high.\n\nDo you wish to proceed?",
-        "image_not_found": "Image not\nfound:\n{path}",
-        "image_load_error": "Error loading\nimage:\n{e}",
-        "game_over_tombstone_error": "Game Over\n(Tombstone not found)",
-        "cheat_immortality_on": "CHEAT ACTIVATED: Immortality!",
-        "cheat_immortality_off": "CHEAT DEACTIVATED: Mortality restored.",
-        "cheat_resources_added": "Cheat: +100 Iron Ore, +100 Jewel",
-        "tooltip_type": "Type: {item_type} ({slot})",
-        "tooltip_value": "Value: {value}",
-        "countdown_closing_in": "Closes in {seconds} seconds...",
-        "item_used_success": "Used {item_name}.",
-        "error_invalid_item": "Invalid item.",
-        "error_class_cannot_wear": "Your class ({char_class}) cannot wear '{armor_type}'.",
-        "consumable_effect": "Restores {value} {effect}",
-
-        # Item Rarities
-        "rarity_poor": "Poor",
-        "rarity_common": "Common",
-        "rarity_uncommon": "Uncommon",
-        "rarity_rare": "Rare",
-        "rarity_epic": "Epic",
-        "rarity_legendary": "Legendary",
-        "rarity_mythic": "Mythic",
-
-        # Item Names
-        "item_sword": "Sword",
-        "item_staff": "Staff",
-        "item_dagger": "Dagger",
-        "item_chain_hood": "Chain Hood",
-        "item_cloth_hat": "Cloth Hat",
-        "item_leather_cowl": "Leather Cowl",
-        "item_plate_armor": "Plate Armor",
-        "item_cloth_robe": "Cloth Robe",
-        "item_leather_jerkin": "Leather Jerkin",
-
-        # Potions
-        "potion_small_healing": "Small Healing Potion",
-        "potion_healing": "Healing Potion",
-        "potion_large_healing": "Large Healing Potion",
-        "potion_superior_healing": "Superior Healing Potion",
-        "potion_small_mana": "Small Mana Potion",
-        "potion_mana": "Mana Potion",
-        "potion_large_mana": "Large Mana Potion",
-        "potion_superior_mana": "Superior Mana Potion",
-        "potion_small_energy": "Small Energy Potion",
-        "potion_energy": "Energy Potion",
-        "potion_small_rage": "Small Rage Potion",
-        "potion_rage": "Rage Potion",
-
-        # Quests
-        "quest_slimes_name": "Kill all slimes",
-        "quest_iron_ore_name": "Bring the blacksmith 5 iron ore",
-        "quest_princess_name": "Save a princess from another castle",
-        "quest_bottles_name": "Collect 10 empty bottles for the alchemist",
-        "quest_armor_polish_name": "Polish the king's armor (unpaid)",
-        "quest_headphones_name": "Untangle the bard's headphones",
-        "quest_youth_recipe_name": "Find the recipe for eternal youth (and lose it again)",
-        "quest_parrot_name": "Teach the royal parrot to curse",
-        "quest_sand_name": "Count all the grains of sand on the beach",
-        "quest_library_name": "Sort the library by the color of the book spines",
-        "quest_dragon_name": "Convince a dragon he's just an oversized budgie",
-        "quest_goblins_name": "Find out why goblins are always in a bad mood",
-        "quest_turtle_name": "Escort a very slow turtle across a very wide road",
-        "quest_ceremony_name": "Disrupt an important ceremony by chewing loudly",
-        # Procedural Quests
-        "quest_location_1": "in the gloomy forests",
-        "quest_location_2": "to the forgotten ruins",
-        "quest_location_3": "through the scorching desert",
-        "quest_location_4": "across the icy peaks",
-        "quest_location_5": "deep into the goblin mines",
-        "quest_action_prefix_1": "Once there, you must",
-        "quest_action_prefix_2": "Your task is to",
-        "quest_action_prefix_3": "Arriving at the destination, you have to",
-        "quest_return_1": "With the work done, you start your journey back.",
-        "quest_return_2": "The task is complete, and you begin the journey home.",
-        "quest_return_3": "Exhausted but successful, you start the march back.",
-
-        # Class Events
-        "warrior_event_1": "You smash your shield into an opponent.",
-        "warrior_event_2": "With a mighty blow, you split a helmet.",
-        "warrior_event_3": "You parry an attack and counter.",
-        "warrior_event_4": "A loud battle cry makes your enemies tremble.",
-        "warrior_event_5": "You kick open a chest and find a coin.",
-        "warrior_event_6": "Your sword hits its mark.",
-        "mage_event_1": "A fireball hisses into the enemy ranks.",
-        "mage_event_2": "You cast a protective spell that deflects a blow.",
-        "mage_event_3": "Ice shards freeze an attacker in place.",
-        "mage_event_4": "A chain lightning jumps from one enemy to the next.",
-        "mage_event_5": "You murmur an arcane formula and strengthen your weapon.",
-        "mage_event_6": "You find an ancient scroll.",
-        "rogue_event_1": "You leap from the shadows and land a critical hit.",
-        "rogue_event_2": "With a swift cut, you disarm an opponent.",
-        "rogue_event_3": "You throw a dagger with precision at a distant target.",
-        "rogue_event_4": "A smoke bomb causes confusion.",
-        "rogue_event_5": "You pick a small lockbox and find gold.",
-        "rogue_event_6": "You skillfully evade a trap.",
-
-        # Trader
-        "upgrade_inventory": "Upgrade Inventory",
-        "sell_inventory": "Your Inventory (Sell)",
-        "buy_offer": "Trader's Offer (Buy)",
-        "sell": "Sell",
-        "sell_junk": "Sell Junk",
-        "buy": "Buy",
-        "trader_sell_prompt": "Please select an item to sell.",
-        "trader_buy_prompt": "Please select an item to buy.",
-        "all_sold_msg": "Sold {items_sold} item(s) for a total of {copper_gained}.",
-        "nothing_to_sell": "Nothing to Sell",
-        "nothing_to_sell_msg": "You have no items that are not upgrades.",
-        "upgrade_success": "Upgrade Successful!",
-        "upgrade_success_msg": "Inventory expanded for {cost}!",
-        "not_enough_gold": "Not Enough Gold",
-        "not_enough_gold_msg": "You cannot afford this.",
-        "buy_failed": "Purchase Failed",
-        "feature_unlocked": "Feature Unlocked!",
-        "autosell_unlocked_msg": "You have 50+ inventory slots!\n\nItems that are not an upgrade for you will now be sold automatically upon pickup.",
-
-        # Blacksmith
-        "blacksmith_title": "Blacksmith",
-        "blacksmith_upgrade": "Upgrade",
-        "select_item_prompt": "Select an item",
-        "current_stats": "Current Stats:",
-        "next_level": "Next Level:",
-        "upgrade_button": "Upgrade",
-        "your_resources": "Your Resources:",
-        "max_level_reached": "Max level reached",
-        "upgrade_success_title": "Success!",
-        "max_stat_indicator": "(Max)",
-
-        # Bosses
-        "boss_goblin_king": "Goblin King",
-        "boss_stone_golem": "Stone Golem",
-        "boss_chimera_matriarch": "Chimera Matriarch",
-        "boss_necromancer_lord": "Necromancer Lord",
-        "boss_ice_giant_chief": "Ice Giant Chief",
-        "boss_ancient_dragon": "Ancient Dragon",
-
-        # Boss Arena
-        "player": "Player",
-        "boss": "Boss",
-        "combat_log": "Combat Log",
-        "attack": "Attack",
-        "defend": "Defend",
-        "defense_legend": "Defense Legend",
-        "counter_attack": "Counter-Attack",
-        "empowered_attack": "Empowered Next Attack",
-        "light_heal": "Light Heal",
-        "weaken_boss": "Weaken Boss",
-        "victory": "Victory!",
-        "defeat": "Defeat",
-        "victory_msg": "You have won!\n\nRewards:\n- {gold}\n- {xp} XP{item}",
-        "defeat_msg": "You have lost the fight!",
-        "boss_appears": "A wild {boss_name} appears!",
-        "you_have_been_defeated": "You have been defeated...",
-        "image_error_display": "Image Error:\n{e}",
-        "log_defense_result": "Defense result: {symbol}",
-        "log_counter_attack": "Counter-attack! You deal {damage} damage to the boss.",
-        "log_empowered_attack": "Your next attack will be empowered!",
-        "log_light_heal": "Light heal! You regenerate {healing} hit points.",
-        "log_boss_weakened": "{boss_name} is weakened for one turn!",
-        "log_player_attack": "You attack, dealing {damage} damage to {boss_name}!",
-        "log_boss_attack": "{boss_name} attacks, dealing {damage} damage to you!",
-        "log_defense_halves_damage": "Your defense halves the damage to {damage}!",
-        "log_boss_defeated": "You have defeated {boss_name}!",
-        "critical_error_title": "Critical Error",
-        "critical_error_main_stat_message": "Could not determine the character's main attribute. Aborting fight.",
-
-        # Game Over
-        "game_over_title": "Game Over",
-        "rebirth_title": "Rebirth!",
-        "game_over_quest_text": "Rest in peace, {name}.\n\nYou died on a quest and your character has been deleted.",
-        "game_over_rebirth_text": "{name} was defeated by a boss!\n\nThrough defeat, you have grown stronger.\nYou are reset to level 1, but your base attributes have been permanently increased!",
-        "tombstone_not_found_placeholder": "[Tombstone image not found]",
-        "rebirth_image_not_found_placeholder": "[Rebirth image not found]",
-
-        # Highscores
-        "rebirths": "Rebirths",
-        "bosses_defeated": "Bosses Defeated",
-    }
-}
+    Raises:
+        OSError: If there is no catalog for the language.
+        ValueError: If a text of the catalog is malformed.
+    """
+    with open(os.path.join(LOCALE_DIR, f"{lang}.json"), 'rb') as f:
+        raw = f.read()
+    digest = f"{len(raw)}:{zlib.crc32(raw):08x}"
+    cache_file = os.path.join(CACHE_DIR, f"{lang}.marshal")
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = marshal.load(f)
+        if cached["format"] == CACHE_FORMAT and cached["hash"] == digest:
+            return cached["texts"], cached["templates"]
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+
+    # Like string in Template, json is only needed when the cache is stale.
+    import json
+    texts = json.loads(raw.decode("utf-8"))
+    templates = {key: Template(key, text).parts for key, text in texts.items() if "{" in text or "}" in text}
+    _write_cache(cache_file, {"format": CACHE_FORMAT, "hash": digest, "texts": texts, "templates": templates})
+    return texts, templates
+
+def _write_cache(cache_file, data):
+    """Writes a compiled catalog; without write access the catalog is simply compiled on every start."""
+    temp_file = cache_file + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass
+
+_catalogs = {}
+
+def _get_catalog(lang):
+    catalog = _catalogs.get(lang)
+    if catalog is None:
+        catalog = _catalogs[lang] = load_catalog(lang)
+    return catalog
+
+
+class Translator:
+    """
+    Gives direct access to one language's texts. The catalog is merged with
+    the fallback language once and every text with placeholders is turned
+    into a Template.
+    """
+
+    def __init__(self, lang):
+        """
+        Loads the catalog of a language.
+
+        Args:
+            lang (str): The language code, e.g. "de". Unknown languages use the fallback language.
+
+        Raises:
+            ValueError: If a text is malformed or uses other placeholders than the fallback language.
+        """
+        fallback_texts, fallback_templates = _get_catalog(FALLBACK_LANGUAGE)
+        try:
+            texts, templates = _get_catalog(lang)
+            self.lang = lang
+        except OSError:
+            texts, templates = fallback_texts, fallback_templates
+            self.lang = FALLBACK_LANGUAGE
+
+        self.texts = dict(fallback_texts)
+        self.texts.update(texts)
+        self.templates = {}
+        for key in self.texts:
+            parts = templates.get(key) if key in texts else fallback_templates.get(key)
+            if parts is None:
+                continue
+            template = self.templates[key] = Template.from_parts(key, parts)
+            if key in texts and key in fallback_texts and \
+                    template.fields != Template.from_parts(key, fallback_templates.get(key, ())).fields:
+                raise ValueError(f"Die Platzhalter von '{key}' in '{self.lang}' passen nicht zur Vorlage.")
+
+    def __getitem__(self, key):
+        """Returns the plain text of a key, or the key itself if it is unknown."""
+        return self.texts.get(key, key)
+
+    def __call__(self, key, **kwargs):
+        """Returns the text of a key with its placeholders filled in from kwargs, like get_text."""
+        if kwargs:
+            template = self.templates.get(key)
+            if template is not None:
+                try:
+                    return template.format(kwargs)
+                except KeyError as e:
+                    print(f"Translation format error for key '{key}' in lang '{self.lang}': {e}")
+                    return f"FMT_ERR:{key}"
+        return self.texts.get(key, key)
+
+
+_translators = {}
+
+def get_translator(lang):
+    """Returns the shared Translator of a language, compiling its catalog on first use."""
+    translator = _translators.get(lang)
+    if translator is None:
+        translator = _translators[lang] = Translator(lang)
+    return translator
 
 def get_text(lang, key, **kwargs):
     """
@@ -614,12 +190,4 @@ def get_text(lang, key, **kwargs):
     Falls back to English if the key is not found in the selected language.
     Supports simple string formatting.
     """
-    # Fallback to English if the language or key is missing
-    text = TEXTS.get(lang, TEXTS["en"]).get(key, key)
-    if kwargs:
-        try:
-            return text.format(**kwargs)
-        except (KeyError, ValueError) as e:
-            print(f"Translation format error for key '{key}' in lang '{lang}': {e}")
-            return f"FMT_ERR:{key}"
-    return text
+    return get_translator(lang)(key, **kwargs)